@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+This is a standalone benchmark script that measures the decompression step of
+the download tasks on a synthetic FASTA file of the given size. The file is
+written both as a regular gzip file and as a BGZF file. It outputs the wall time
+and throughput of gunzip and pigz, if installed, on the gzip file, and of the in
+process BGZF inflater on the BGZF file with one thread and with the given
+number of threads, and of the decompress utility function the download tasks
+use. Every decompressed output is checked against the original.
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+
+
+
+
+
+
+
+BLOCK_SIZE = 0xff00
+
+
+
+
+def bgzfBlock(
+    data
+    ):
+    """
+    Getter function.
+
+    Parameters
+    ----------
+    data : bytes
+           The uncompressed data of a block, at most 65280 bytes.
+
+    Returns
+    -------
+    ret0 : bytes
+           The BGZF block compressing the given data.
+    """
+    c = zlib.compressobj(6,zlib.DEFLATED,-15)
+    cdata = c.compress(data)+c.flush()
+    header = struct.pack("<4BI2BH2BHH",31,139,8,4,0,0,255,6,66,67,2,len(cdata)+25)
+    return header+cdata+struct.pack("<2I",zlib.crc32(data),len(data))
+
+
+
+
+def decompress(
+    cmd
+    ,path
+    ,outPath
+    ,size
+    ,digest
+    ):
+    """
+    Runs the given decompression and reports its wall time and throughput.
+
+    Parameters
+    ----------
+    cmd : object
+          A command line list that decompresses the given path in place, or a
+          function called with no arguments that does.
+    path : string
+           The compressed file, which is restored after decompression.
+    outPath : string
+              The decompressed file.
+    size : int
+           The size in bytes of the decompressed file.
+    digest : string
+             The expected SHA1 digest of the decompressed file.
+
+    Returns
+    -------
+    ret0 : float
+           The wall time in seconds.
+    """
+    backup = path+".bak"
+    shutil.copyfile(path,backup)
+    start = time.perf_counter()
+    if callable(cmd):
+        cmd()
+    else:
+        assert(subprocess.run(cmd).returncode==0)
+    ret = time.perf_counter()-start
+    h = hashlib.sha1()
+    with open(outPath,"rb") as ifile:
+        for chunk in iter(lambda: ifile.read(1<<22),b""):
+            h.update(chunk)
+    assert(h.hexdigest()==digest)
+    os.remove(outPath)
+    os.replace(backup,path)
+    return ret
+
+
+
+
+def main():
+    """
+    Starts execution of this benchmark script.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb",dest="sizeMb",type=int,default=2048)
+    parser.add_argument("-p",dest="threads",type=int,default=os.cpu_count())
+    parser.add_argument("-d",dest="directory",default=None)
+    args = parser.parse_args()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0,root)
+    from pynome import utility
+    from pynome.sequence import BgzfInflater
+    rng = random.Random(0)
+    line = 60
+    with tempfile.TemporaryDirectory(dir=args.directory) as d:
+        fastaPath = os.path.join(d,"genome.fa")
+        size = args.sizeMb<<20
+        h = hashlib.sha1()
+        with open(fastaPath,"wb") as ofile:
+            written = 0
+            n = 0
+            while written < size:
+                seq = "".join(rng.choice("ACGTN" if n%50 else "ACGT") for i in range(1<<16))
+                record = (">chr"+str(n)+"\n").encode()
+                record += b"".join(
+                    seq[i:i+line].encode()+b"\n" for i in range(0,len(seq),line)
+                )*16
+                ofile.write(record)
+                h.update(record)
+                written += len(record)
+                n += 1
+        size = written
+        digest = h.hexdigest()
+        print("fasta\t%.0fMB synthetic FASTA"%(size/2**20,))
+        gzPath = fastaPath+".gz"
+        with open(gzPath,"wb") as ofile:
+            assert(subprocess.run(["gzip","-c","-6",fastaPath],stdout=ofile).returncode==0)
+        bgzfPath = os.path.join(d,"bgzf.fa.gz")
+        with open(fastaPath,"rb") as ifile, open(bgzfPath,"wb") as ofile:
+            with concurrent.futures.ThreadPoolExecutor(args.threads) as pool:
+                chunks = iter(lambda: ifile.read(BLOCK_SIZE),b"")
+                for block in pool.map(bgzfBlock,chunks):
+                    ofile.write(block)
+                ofile.write(bgzfBlock(b""))
+        os.remove(fastaPath)
+        runs = [("gunzip",["gunzip","-f",gzPath],gzPath,fastaPath)]
+        if shutil.which("pigz"):
+            runs.append(
+                ("pigz -p %d"%(args.threads,),["pigz","-d","-f","-p",str(args.threads),gzPath],gzPath,fastaPath)
+            )
+        bgzfOut = bgzfPath[:-3]
+        for threads in sorted({1,args.threads}):
+            def inflate(threads=threads):
+                BgzfInflater(threads).inflate(bgzfPath,bgzfOut)
+                os.remove(bgzfPath)
+            runs.append(("bgzf -p %d"%(threads,),inflate,bgzfPath,bgzfOut))
+        def decompress_():
+            utility.decompress(bgzfPath)
+        runs.append(("decompress",decompress_,bgzfPath,bgzfOut))
+        for (name,cmd,path,outPath) in runs:
+            wall = decompress(cmd,path,outPath,size,digest)
+            print("%s\t%.2fs\t%.0fMB/s"%(name,wall,size/2**20/wall))
+
+
+
+
+
+
+
+
+if __name__ == "__main__":
+    main()
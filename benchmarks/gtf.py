@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+This is a standalone benchmark script that compares the pynome GTF converter
+with "gffread -T" on the GFF3 files given as arguments, such as the human and
+maize annotations. For each file it outputs the wall time and peak memory of
+both converters along with the number of transcripts, exons, and CDS lines they
+wrote.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+
+
+def count(
+    path
+    ):
+    """
+    Getter function.
+
+    Parameters
+    ----------
+    path : string
+           The full path of a GTF file.
+
+    Returns
+    -------
+    ret0 : dictionary
+           The number of lines of each feature type in the given GTF file.
+    """
+    ret = {}
+    with open(path,"r") as ifile:
+        for line in ifile:
+            parts = line.split("\t")
+            if len(parts) == 9:
+                ret[parts[2]] = ret.get(parts[2],0)+1
+    return ret
+
+
+
+
+def run(
+    cmd
+    ):
+    """
+    Getter function.
+
+    Parameters
+    ----------
+    cmd : list
+          The command that is run and measured.
+
+    Returns
+    -------
+    ret0 : float
+           The wall time in seconds of the given command.
+    ret1 : int
+           The peak resident memory in megabytes of the given command.
+    """
+    start = time.time()
+    process = subprocess.Popen(cmd)
+    (pid,status,usage) = os.wait4(process.pid,0)
+    elapsed = time.time()-start
+    assert(os.waitstatus_to_exitcode(status)==0)
+    return (elapsed,usage.ru_maxrss//1024)
+
+
+
+
+def main():
+    """
+    Starts execution of this benchmark script.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as d:
+        for gffPath in sys.argv[1:]:
+            print(os.path.basename(gffPath))
+            out = os.path.join(d,"pynome.gtf")
+            code = (
+                "import sys; sys.path.insert(0,"+repr(root)+");"
+                "from pynome import annotation;"
+                "annotation.GtfConverter().convert("+repr(gffPath)+","+repr(out)+")"
+            )
+            (elapsed,rss) = run([sys.executable,"-c",code])
+            print("\tpynome\t%.1fs\t%dMB\t%s"%(elapsed,rss,count(out)))
+            out = os.path.join(d,"gffread.gtf")
+            try:
+                (elapsed,rss) = run(["gffread","-T",gffPath,"-o",out])
+            except FileNotFoundError:
+                print("\tgffread\tnot installed")
+                continue
+            print("\tgffread\t%.1fs\t%dMB\t%s"%(elapsed,rss,count(out)))
+
+
+
+
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+This is a standalone benchmark script that measures the startup overhead of a
+"pynome job" invocation, the command launched once per assembly by every
+parallel index sweep. A job file for an assembly that does not exist is run
+against an empty root directory, so only startup is measured. The first job
+persists the discovered entry points that later jobs reuse, so the scan of
+installed distributions is not measured. It outputs the median wall time of the
+given number of runs, the cumulative import time of pynome, and the slowest
+imported modules as reported by "python -X importtime". It is the startup
+regression test of jobs. It exits with a non-zero status if a module that a job
+must not import was imported, if the median wall time exceeds that of an empty
+interpreter by more than the given overhead limit, or if it exceeds the given
+absolute limit.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+
+
+
+
+
+
+FORBIDDEN = (
+    "ftplib"
+    ,"importlib.metadata"
+    ,"inspect"
+    ,"pynome._ensembl2crawler"
+    ,"pynome._ensemblcrawler"
+    ,"pynome._journal"
+    ,"pynome._ncbicrawler"
+    ,"pynome._scheduler"
+    ,"pynome.sequence"
+)
+
+
+
+
+def importTimes(
+    cmd
+    ,env
+    ):
+    """
+    Getter function.
+
+    Parameters
+    ----------
+    cmd : list
+          The python command that is run with import timing enabled.
+    env : dictionary
+          The environment of the run command.
+
+    Returns
+    -------
+    ret0 : dictionary
+           The self and cumulative import times in microseconds and the nesting
+           depth of every module imported by the given command, keyed by module
+           name.
+    """
+    output = subprocess.run(
+        [cmd[0],"-X","importtime"]+cmd[1:]
+        ,env=env
+        ,stdout=subprocess.DEVNULL
+        ,stderr=subprocess.PIPE
+    ).stderr.decode()
+    ret = {}
+    for line in output.split("\n"):
+        if not line.startswith("import time:"):
+            continue
+        parts = line[12:].split("|")
+        if len(parts) == 3 and parts[0].strip().isdigit():
+            name = parts[2].rstrip()
+            depth = (len(name)-len(name.lstrip())-1)//2
+            ret[name.strip()] = (int(parts[0]),int(parts[1]),depth)
+    return ret
+
+
+
+
+def main():
+    """
+    Starts execution of this benchmark script.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-r",dest="runs",type=int,default=20)
+    parser.add_argument("--max-ms",dest="maxMs",type=float,default=0)
+    parser.add_argument("--max-overhead-ms",dest="maxOverheadMs",type=float,default=50)
+    args = parser.parse_args()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = root+os.pathsep+env.get("PYTHONPATH","")
+    ok = True
+    with tempfile.TemporaryDirectory() as d:
+        jobPath = os.path.join(d,"pynome_work_00000.txt")
+        with open(jobPath,"w") as ofile:
+            ofile.write("0\nnone\n")
+        cmd = [sys.executable,"-m","pynome","-q","-d",d,"--no-tool-cache","job",jobPath]
+        base = [sys.executable,"-c","pass"]
+        walls = []
+        bases = []
+        for i in range(args.runs):
+            for (c,times) in ((cmd,walls),(base,bases)):
+                start = time.perf_counter()
+                assert(subprocess.run(c,env=env).returncode==0)
+                times.append((time.perf_counter()-start)*1000)
+        wall = statistics.median(walls)
+        overhead = wall-statistics.median(bases)
+        print("job\t%.1fms median wall time over %d runs"%(wall,args.runs))
+        print("python\t%.1fms median wall time of an empty interpreter"%(statistics.median(bases),))
+        times = importTimes(cmd,env)
+    total = sum(c for (n,(o,c,depth)) in times.items() if not depth and n.startswith("pynome"))
+    print("import\t%.1fms cumulative import time of pynome"%(total/1000,))
+    for (name,(own,cumulative,depth)) in sorted(times.items(),key=lambda x: -x[1][0])[:10]:
+        print("\t%.1fms\t%s"%(own/1000,name))
+    for name in FORBIDDEN:
+        if name in times:
+            print("error: a job imported "+name)
+            ok = False
+    if args.maxMs and wall > args.maxMs:
+        print("error: median wall time exceeds %.1fms"%(args.maxMs,))
+        ok = False
+    if args.maxOverheadMs and overhead > args.maxOverheadMs:
+        print("error: median overhead over an empty interpreter exceeds %.1fms"%(args.maxOverheadMs,))
+        ok = False
+    sys.exit(0 if ok else 1)
+
+
+
+
+
+
+
+
+if __name__ == "__main__":
+    main()
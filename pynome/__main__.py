@@ -4,10 +4,37 @@ contains functions that execute a specific operation.
 """
 import argparse
 from . import core
-from . import crawlers
-from . import processes
+import json
 from . import settings
-from . import tasks
+import time
+
+
+
+
+def failures(
+    clear=False
+    ):
+    """
+    Reports every failed task in the failure ledgers of all assemblies, with
+    its number of attempts, retry time, error, and last line of standard error.
+
+    Parameters
+    ----------
+    clear : bool
+            True to clear all failure ledgers after reporting them, so their
+            failed tasks are attempted again by the next run.
+    """
+    records = core.assembly.failures()
+    for (dataDir,taskName,record) in records:
+        stderr = record.get("stderr","").strip().split("\n")[-1]
+        core.log.send(
+            dataDir+" "+taskName+": "+str(record["attempts"])+" attempts, retry after "
+            +time.strftime("%D %H:%M:%S",time.localtime(record["retry"]))+", "+record["error"]
+            +(" ("+stderr+")" if stderr else "")
+        )
+    core.log.send(str(len(records))+" failed tasks")
+    if clear:
+        core.assembly.clearFailures()
 
 
 
@@ -35,17 +62,132 @@ def index(
 
 
 
-def listAll():
+def listAll(
+    limit=0
+    ,dryRun=False
+    ):
     """
     Generates a list of new pynome job files, each one representing one assembly
     whose indexes need to be updated. The file output is the taxonomy ID and
     assembly name separated by a new line.
+
+    Parameters
+    ----------
+    limit : int
+            The maximum number of job files generated or 0 for no limit. This
+            allows builds for a new tool version to be rolled out gradually
+            while the retained older versions keep serving readers.
+    dryRun : bool
+             True to only report the assemblies that need work along with a
+             summary of estimated CPU hours per task and the peak threads and
+             memory of their tasks' resource hints, which size the array job's
+             resource requests, instead of generating job files or false to
+             generate them.
     """
     i = 0
+    hours = {}
     for (taxId,assemblyName) in core.assembly.listAllWork():
-        with open(settings.JOB_NAME%(i,),"w") as ofile:
-            ofile.write(taxId+"\n"+assemblyName+"\n")
+        if limit and i >= limit:
+            break
+        if dryRun:
+            estimate = core.assembly.estimateWork(taxId,assemblyName)
+            peak = core.assembly.resources(taxId,assemblyName)
+            core.log.send(
+                taxId+"/"+assemblyName+": "
+                +", ".join(tn+" (%.1fh)"%(h,) for (tn,h) in estimate.items())
+                +"; peak %d threads, %.1fGB"%(peak["threads"],peak["memory"])
+            )
+            for (tn,h) in estimate.items():
+                (count,total) = hours.get(tn,(0,0.0))
+                hours[tn] = (count+1,total+h)
+        else:
+            with open(settings.JOB_NAME%(i,),"w") as ofile:
+                ofile.write(taxId+"\n"+assemblyName+"\n")
         i += 1
+    if dryRun:
+        for (tn,(count,total)) in sorted(hours.items()):
+            core.log.send(tn+": "+str(count)+" assemblies, %.1f estimated CPU hours"%(total,))
+        core.log.send(
+            str(i)+" assemblies, %.1f estimated CPU hours"%(sum(h for (c,h) in hours.values()),)
+        )
+
+
+
+
+def mirror(
+    species
+    ,sinceLastCrawl=False
+    ):
+    """
+    Mirrors the local assemblies of the given species.
+
+    Parameters
+    ----------
+    species : string
+              The name of the mirrored species or an empty string to mirror all
+              species.
+    sinceLastCrawl : bool
+                     True to only mirror assemblies whose remote data changed in
+                     a crawl since they were last mirrored or false to verify
+                     every local assembly with the remote servers.
+    """
+    if sinceLastCrawl:
+        core.assembly.mirrorChanges(species)
+    else:
+        core.assembly.mirror(species)
+
+
+
+
+def priority(
+    value
+    ):
+    """
+    Getter function.
+
+    Parameters
+    ----------
+    value : string
+            A priority command line argument of the form KEY=N.
+
+    Returns
+    -------
+    ret0 : tuple
+           The stripped key and integer priority of the given argument.
+    """
+    (key,sep,number) = value.rpartition("=")
+    if not sep or not key.strip():
+        raise argparse.ArgumentTypeError("expected KEY=N, got '"+value+"'")
+    try:
+        return (key.strip(),int(number))
+    except ValueError:
+        raise argparse.ArgumentTypeError("priority of '"+key.strip()+"' is not an integer")
+
+
+
+
+def run(
+    species
+    ,sinceLastCrawl=False
+    ):
+    """
+    Crawls the remote databases and then mirrors and indexes the local
+    assemblies of the given species as a pipeline, where each assembly is
+    indexed as soon as its downloads complete. The threads of every index task
+    are divided evenly between the CPU jobs setting's concurrent assemblies.
+
+    Parameters
+    ----------
+    species : string
+              The name of the species or an empty string for all species.
+    sinceLastCrawl : bool
+                     True to only mirror assemblies whose remote data changed in
+                     a crawl since they were last mirrored or false to verify
+                     every local assembly with the remote servers.
+    """
+    settings.cpuCount = max(1,settings.cpuCount//max(1,settings.cpuJobs))
+    core.assembly.crawl(species)
+    core.assembly.pipeline(species,sinceLastCrawl)
 
 
 
@@ -54,7 +196,7 @@ def main():
     """
     Starts execution of this application.
     """
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(prog="pynome")
     parser.add_argument("-c",dest="crawl",action="store_true")
     parser.add_argument("-m",dest="mirror",action="store_true")
     parser.add_argument("-i",dest="index",action="store_true")
@@ -64,33 +206,124 @@ def main():
     parser.add_argument("-d",dest="rootPath",default=None)
     parser.add_argument("-q",dest="notEcho",action="store_true")
     parser.add_argument("-n",dest="cpuCount",type=int,default=0)
+    parser.add_argument("-g",dest="collect",action="store_true")
+    parser.add_argument("-p",dest="pipeline",action="store_true")
+    parser.add_argument("--dry-run",dest="dryRun",action="store_true")
+    parser.add_argument("--retain",dest="retain",type=int,default=0)
+    parser.add_argument("--limit",dest="limit",type=int,default=0)
+    parser.add_argument("--no-tool-cache",dest="noToolCache",action="store_true")
+    parser.add_argument("--memory",dest="memory",type=float,default=0)
+    parser.add_argument("--salmon-decoys",dest="salmonDecoys",action="store_true")
+    parser.add_argument("--keep-gz",dest="keepGzip",action="store_true")
+    parser.add_argument("--decompress-threads",dest="decompressThreads",type=int,default=0)
+    parser.add_argument("--since-last-crawl",dest="sinceLastCrawl",action="store_true")
+    parser.add_argument("--archive",dest="archive",default=None)
+    parser.add_argument("--net-jobs",dest="networkJobs",type=int,default=0)
+    parser.add_argument("--cpu-jobs",dest="cpuJobs",type=int,default=0)
+    parser.add_argument("--priorities",dest="priorityFile",default=None)
+    parser.add_argument("--priority",dest="priorities",type=priority,action="append",default=[])
+    parser.add_argument(
+        "--log-level"
+        ,dest="logLevel"
+        ,choices=list(core.Log.LEVEL_NAMES.values())
+        ,default="info"
+    )
+    parser.add_argument("--log-json",dest="logJson",default=None)
+    parser.add_argument("--metrics",dest="metricsPath",default=None)
+    parser.add_argument("--metrics-interval",dest="metricsInterval",type=float,default=0)
+    parser.add_argument("--timeout-scale",dest="timeoutScale",type=float,default=None)
+    commands = parser.add_subparsers(dest="command",metavar="command")
+    p = commands.add_parser("crawl",help="crawl remote databases for assemblies")
+    p.add_argument("species",nargs="?",default="")
+    p = commands.add_parser("mirror",help="download new data files of local assemblies")
+    p.add_argument("species",nargs="?",default="")
+    p.add_argument(
+        "--since-last-crawl"
+        ,dest="sinceLastCrawl"
+        ,action="store_true"
+        ,default=argparse.SUPPRESS
+    )
+    p = commands.add_parser("run",help="crawl, then mirror and index local assemblies as a pipeline")
+    p.add_argument("species",nargs="?",default="")
+    p.add_argument(
+        "--since-last-crawl"
+        ,dest="sinceLastCrawl"
+        ,action="store_true"
+        ,default=argparse.SUPPRESS
+    )
+    p = commands.add_parser("index",help="index local assemblies of a species")
+    p.add_argument("species",nargs="?",default="")
+    p = commands.add_parser("job",help="index the assembly of a job file")
+    p.add_argument("indexFile")
+    p = commands.add_parser("list",help="generate job files for assemblies needing work")
+    p.add_argument("--dry-run",dest="dryRun",action="store_true",default=argparse.SUPPRESS)
+    p.add_argument("--limit",dest="limit",type=int,default=argparse.SUPPRESS)
+    p = commands.add_parser("failures",help="report failed tasks and their retry times")
+    p.add_argument("--clear",dest="clear",action="store_true")
+    p = commands.add_parser("gc",help="garbage collect retired assemblies and old index versions")
+    p.add_argument("--dry-run",dest="dryRun",action="store_true",default=argparse.SUPPRESS)
+    p.add_argument("--retain",dest="retain",type=int,default=argparse.SUPPRESS)
+    p.add_argument("--archive",dest="archive",default=argparse.SUPPRESS)
     args = parser.parse_args()
+    if args.memory > 0:
+        settings.memoryBudget = args.memory
+    if args.salmonDecoys:
+        settings.salmonDecoys = True
+    if args.keepGzip:
+        settings.keepGzip = True
+    if args.decompressThreads > 0:
+        settings.decompressThreads = args.decompressThreads
+    if args.archive:
+        settings.retireArchive = args.archive
+    if args.noToolCache:
+        settings.toolCache = False
+    if args.retain > 0:
+        settings.indexRetain = args.retain
+    if args.networkJobs > 0:
+        settings.networkJobs = args.networkJobs
+    if args.cpuJobs > 0:
+        settings.cpuJobs = args.cpuJobs
     if args.cpuCount > 0:
         settings.cpuCount = args.cpuCount
+    if args.priorityFile:
+        with open(args.priorityFile,"r") as ifile:
+            settings.priorities.update(json.loads(ifile.read()))
+    for (key,value) in args.priorities:
+        settings.priorities[key] = value
     if args.rootPath:
         settings.rootPath = args.rootPath
     core.log.setEcho(not args.notEcho)
-    core.assembly.registerCrawler(crawlers.EnsemblCrawler())
-    core.assembly.registerCrawler(crawlers.Ensembl2Crawler())
-    core.assembly.registerCrawler(crawlers.NCBICrawler())
-    core.assembly.registerProcess(processes.EnsemblProcess())
-    core.assembly.registerProcess(processes.NCBIProcess())
-    core.assembly.registerTask(tasks.DownloadCDNATask)
-    core.assembly.registerTask(tasks.DownloadFastaTask)
-    core.assembly.registerTask(tasks.DownloadGffTask)
-    core.assembly.registerTask(tasks.DownloadGtfTask)
-    core.assembly.registerTask(tasks.IndexHisatTask)
-    core.assembly.registerTask(tasks.IndexKallistoTask)
-    core.assembly.registerTask(tasks.IndexSalmonTask)
-    core.assembly.registerTask(tasks.WriteCDNATask)
-    core.assembly.registerTask(tasks.WriteGtfTask)
-    core.assembly.registerTask(tasks.WriteSpliceSitesTask)
-    if args.listAll:
-        listAll()
+    core.log.setLevel({v: k for (k,v) in core.Log.LEVEL_NAMES.items()}[args.logLevel])
+    if args.logJson:
+        core.log.setJsonPath(args.logJson)
+    if args.metricsPath:
+        settings.metricsPath = args.metricsPath
+    if args.metricsInterval > 0:
+        settings.metricsInterval = args.metricsInterval
+    if args.timeoutScale is not None:
+        settings.timeoutScale = args.timeoutScale
+    core.assembly.discover(args.command == "job")
+    if args.command == "crawl":
+        core.assembly.crawl(args.species)
+    elif args.command == "mirror":
+        mirror(args.species,args.sinceLastCrawl)
+    elif args.command == "run" or args.pipeline:
+        run(args.species,args.sinceLastCrawl)
+    elif args.command == "index":
+        core.assembly.indexSpecies(args.species)
+    elif args.command == "job":
+        index(args.indexFile)
+    elif args.command == "list" or args.listAll:
+        listAll(args.limit,args.dryRun)
+    elif args.command == "failures":
+        failures(args.clear)
+    elif args.command == "gc" or args.collect:
+        core.assembly.collectAssemblies(args.dryRun)
+        core.assembly.collectIndexes(args.dryRun)
     else:
         if not args.crawl and not args.mirror and not args.index:
             core.assembly.crawl(args.species)
-            core.assembly.mirror(args.species)
+            mirror(args.species,args.sinceLastCrawl)
             if args.indexFile is not None:
                 index(args.indexFile)
             else:
@@ -99,7 +332,7 @@ def main():
             if args.crawl:
                 core.assembly.crawl(args.species)
             if args.mirror:
-                core.assembly.mirror(args.species)
+                mirror(args.species,args.sinceLastCrawl)
             if args.index:
                 if args.indexFile is not None:
                     index(args.indexFile)
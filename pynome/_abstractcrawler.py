@@ -20,6 +20,7 @@ class AbstractCrawler(abc.ABC):
     This is the abstract crawler class. An interface is provided that crawls its
     source and adds entries to be added to the local file structure.
     """
+    LOCAL_KEYS = ("alias_of","builds","checksum","failures","processed")
 
 
     def __init__(
@@ -34,29 +35,85 @@ class AbstractCrawler(abc.ABC):
 
     def assemble(
         self
+        ,complete=True
         ):
         """
         Updates the directory structure and metadata JSON files of the local
         database with all entries added to this crawler, creating directories
-        and files that do not exist and overwriting ones that do. If a metadata
-        JSON file already exists for a written assembly, the processed data is
-        preserved in the new JSON file. This also clears all entries added from
-        this crawler's crawl method.
+        and files that do not exist. If a metadata JSON file already exists for
+        an assembly, all local keys such as the processed data and build records
+        are preserved and the file is only rewritten if its crawled data
+        changed. Recorded task failures are cleared if its process data
+        changed, so they are retried at once. Files are written to a temporary
+        path first and then moved into place, so readers never see a partial
+        file. This also clears all entries added from this crawler's crawl
+        method.
+
+        Parameters
+        ----------
+        complete : bool
+                   True if the crawl covered every species of this crawler's
+                   source, so local assemblies of this crawler it did not find
+                   are reported as removed, or false otherwise.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The crawl delta, holding sorted lists of the data directories of
+               all "new", "changed", and "removed" assemblies of this crawler.
+               Its "urls" key maps the data directory of every new or changed
+               assembly to the new or changed URLs of its process data.
         """
+        ret = {"new": [], "changed": [], "removed": [], "urls": {}}
         for key in self.__entries:
             d = os.path.join(settings.rootPath,key)
-            os.makedirs(d,exist_ok=True)
             path = os.path.join(d,"metadata.json")
-            processed = {}
+            oldmeta = None
             if os.path.isfile(path):
-                with open(path,"r") as ifile:
-                    oldmeta = json.loads(ifile.read())
-                    processed = oldmeta["processed"]
+                try:
+                    with open(path,"r") as ifile:
+                        oldmeta = json.loads(ifile.read())
+                except ValueError:
+                    pass
             meta = self.__entries[key]
-            meta["processed"] = processed
-            with open(os.path.join(d,"metadata.json"),"w") as ofile:
+            meta["processed"] = {}
+            for k in self.LOCAL_KEYS:
+                if oldmeta and k in oldmeta:
+                    meta[k] = oldmeta[k]
+            if oldmeta and oldmeta.get("process_data") != meta["process_data"]:
+                meta.pop("failures",None)
+            if meta == oldmeta:
+                continue
+            ret["changed" if oldmeta is not None else "new"].append(key)
+            oldData = oldmeta.get("process_data",{}) if oldmeta else {}
+            ret["urls"][key] = {
+                k: v for (k,v) in meta["process_data"].items()
+                if v and isinstance(v,str) and oldData.get(k) != v
+            }
+            os.makedirs(d,exist_ok=True)
+            with open(path+".tmp","w") as ofile:
                 ofile.write(json.dumps(meta,indent=4) + "\n")
+            os.replace(path+".tmp",path)
+        if complete and not self.__entries:
+            self._log_("Crawl found no assemblies, not reporting any as removed")
+        elif complete:
+            suffix = "-"+self.name()
+            for taxId in os.listdir(settings.rootPath):
+                path = os.path.join(settings.rootPath,taxId)
+                if not taxId.isdecimal() or not os.path.isdir(path):
+                    continue
+                for assemblyName in os.listdir(path):
+                    key = os.path.join(taxId,assemblyName)
+                    if assemblyName.endswith(suffix) and key not in self.__entries:
+                        ret["removed"].append(key)
+        for k in ("new","changed","removed"):
+            ret[k].sort()
+        self._log_(
+            "%d new, %d changed, %d removed assemblies"
+            %(len(ret["new"]),len(ret["changed"]),len(ret["removed"]))
+        )
         self.__entries = {}
+        return ret
 
 
     @abc.abstractmethod
@@ -105,6 +162,7 @@ class AbstractCrawler(abc.ABC):
         ,taxonomyId
         ,processType
         ,processData
+        ,accession=""
         ):
         """
         Adds a database entry for this crawler to be used in assembling the
@@ -129,6 +187,11 @@ class AbstractCrawler(abc.ABC):
                       The JSON compatible data the process type requires for
                       downloading and indexing this entries data from its remote
                       source.
+        accession : string
+                    The versioned GenBank accession of the entry's assembly,
+                    such as "GCA_000001405.28", or an empty string if unknown.
+                    It is used to match entries of the same assembly crawled
+                    from different sources.
         """
         assert(taxonomyId.isdigit())
         key = os.path.join(taxonomyId,re.sub("[\s\\\\/]","_",assemblyId+"-"+self.name()))
@@ -137,6 +200,7 @@ class AbstractCrawler(abc.ABC):
             ,"species": species
             ,"intraspecific_name": intraspecificName
             ,"assembly_id": assemblyId
+            ,"accession": accession
             ,"taxonomy": {
                 "name": " ".join((p for p in (genus,species,intraspecificName) if p))
                 ,"id": taxonomyId
@@ -175,4 +239,4 @@ class AbstractCrawler(abc.ABC):
         message : string
                   Message that is sent to the logging system.
         """
-        core.log.send("("+self.name()+") "+message)
+        core.log.send("("+self.name()+") "+message,phase="crawl")
@@ -2,6 +2,7 @@
 Contains the AbstractProcess class.
 """
 import abc
+from . import core
 import os
 
 
@@ -42,12 +43,88 @@ class AbstractProcess(abc.ABC):
                 meta[tn] = False
 
 
+    def buildRecord(
+        self
+        ,workDir
+        ,rootName
+        ,taskName
+        ,data=None
+        ,options=None
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        workDir : string
+                  The full path working directory for the given assembly.
+        rootName : string
+                   The root name used for all data files of the given assembly.
+        taskName : string
+                   The name of a task that has just been executed.
+        data : dictionary
+               The process data of the given assembly's metadata or None if it
+               is not known.
+        options : dictionary
+                  The options the given task actually executed with, recorded
+                  in place of its task options of the same name, or None to
+                  record its task options.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The build record of the given task, holding the version of the
+               tool it used, the fingerprint of its input files, and the
+               options it was executed with. It is saved
+               in the assembly's metadata so staleness can later be detected.
+        """
+        tool = self.taskTool(taskName)
+        recorded = dict(self.taskOptions(taskName))
+        recorded.update(options or {})
+        return {
+            "tool": tool
+            ,"version": core.tools.version(tool) if tool else None
+            ,"inputs": self.__fingerprint_(workDir,rootName,taskName,data)
+            ,"options": recorded
+        }
+
+
+    def dataInputs(
+        self
+        ,taskName
+        ,data
+        ):
+        """
+        This getter method can be overridden by implementations whose tasks
+        read different input files depending on the process data of an
+        assembly.
+
+        Parameters
+        ----------
+        taskName : string
+                   The task name whose input file requirements are returned.
+        data : dictionary
+               The process data of an assembly's metadata or None if it is not
+               known.
+
+        Returns
+        -------
+        ret0 : list
+               Extensions of files, using the root name as its base, that are
+               required for the given task of an assembly with the given
+               process data to be executed.
+        """
+        return self.taskInputs(taskName)
+
+
     def hasWork(
         self
         ,workDir
         ,rootName
         ,meta
         ,taskName=None
+        ,builds=None
+        ,data=None
         ):
         """
         Getter method.
@@ -64,6 +141,17 @@ class AbstractProcess(abc.ABC):
                    None to check all tasks of this process of the given assembly
                    or a task name to only check that specific task while
                    ignoring all others.
+        builds : dictionary
+                 The builds dictionary part of the given assembly's metadata or
+                 None to ignore build records. If given then a processed task
+                 also has work if its recorded tool version differs from the
+                 installed one or its input files changed since it was built.
+                 A processed task without a build record, built before they
+                 were recorded, has work if none of its published index
+                 directories matches the installed tool version.
+        data : dictionary
+               The process data of the given assembly's metadata or None if it
+               is not known.
 
         Returns
         -------
@@ -71,13 +159,23 @@ class AbstractProcess(abc.ABC):
                True the given assembly has work or false otherwise. If a task
                name is given then only that task is checked for it needing to be
                executed again and all other tasks for this process is ignored.
+               A task whose tool is not installed, or any of whose input files
+               exists neither plain nor gzip compressed, never has work.
         """
         def taskHasWork(tn):
-            files = [os.path.join(workDir,rootName+ext) for ext in self.taskInputs(tn)]
-            for f in files:
-                if not os.path.isfile(f):
+            for ext in self.dataInputs(tn,data):
+                if self.inputPath(workDir,rootName,ext) is None:
                     return False
-            return not meta.get(tn,False)
+            tool = self.taskTool(tn)
+            if tool and core.tools.version(tool) is None:
+                return False
+            if not meta.get(tn,False):
+                return True
+            if builds is None:
+                return False
+            if tn not in builds:
+                return self.__isOutdated_(workDir,tn)
+            return self.isStale(workDir,rootName,tn,builds[tn],data)
         if not taskName is None:
             return taskHasWork(taskName)
         else:
@@ -87,6 +185,86 @@ class AbstractProcess(abc.ABC):
             return False
 
 
+    def inputPath(
+        self
+        ,workDir
+        ,rootName
+        ,ext
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        workDir : string
+                  The full path working directory for the given assembly.
+        rootName : string
+                   The root name used for all data files of the given assembly.
+        ext : string
+              The extension of an input file of the given assembly.
+
+        Returns
+        -------
+        ret0 : string
+               The full path of the given input file, or of its gzip compressed
+               form with the ".gz" extension appended if only that exists, or
+               None if neither exists.
+        """
+        path = os.path.join(workDir,rootName+ext)
+        for p in (path,path+".gz"):
+            if os.path.isfile(p):
+                return p
+        return None
+
+
+    def isStale(
+        self
+        ,workDir
+        ,rootName
+        ,taskName
+        ,record
+        ,data=None
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        workDir : string
+                  The full path working directory for the given assembly.
+        rootName : string
+                   The root name used for all data files of the given assembly.
+        taskName : string
+                   The name of a processed task of the given assembly.
+        record : dictionary
+                 The build record saved when the given task was last executed.
+        data : dictionary
+               The process data of the given assembly's metadata or None if it
+               is not known.
+
+        Returns
+        -------
+        ret0 : bool
+               True if the installed version of the given task's tool differs
+               from the recorded one, its input files changed since it was last
+               executed, or any of its options differs from the recorded one, or
+               false otherwise. A tool that is not installed never makes a task
+               stale. An option missing from the record counts as false.
+        """
+        tool = self.taskTool(taskName)
+        if tool:
+            version = core.tools.version(tool)
+            if version is not None and version != record.get("version"):
+                return True
+        recorded = record.get("options",{})
+        for (key,value) in self.taskOptions(taskName).items():
+            if recorded.get(key,False) != value:
+                return True
+        if "inputs" in record:
+            return record["inputs"] != self.__fingerprint_(workDir,rootName,taskName,data)
+        return False
+
+
     @abc.abstractmethod
     def indexTasks(
         self
@@ -137,6 +315,32 @@ class AbstractProcess(abc.ABC):
         pass
 
 
+    def taskIndex(
+        self
+        ,taskName
+        ):
+        """
+        This getter method can be overridden by implementations whose index
+        tasks publish their indexes under a prefix other than their name
+        without the "index_" part.
+
+        Parameters
+        ----------
+        taskName : string
+                   The task name whose index prefix is returned.
+
+        Returns
+        -------
+        ret0 : string
+               The prefix of the "<prefix>-<version>" index directories
+               published by the given task or None if it publishes none. Only
+               index tasks using an external tool publish index directories.
+        """
+        if taskName.startswith("index_") and self.taskTool(taskName):
+            return taskName[len("index_"):]
+        return None
+
+
     @abc.abstractmethod
     def taskInputs(
         self
@@ -159,6 +363,51 @@ class AbstractProcess(abc.ABC):
         pass
 
 
+    def taskOptions(
+        self
+        ,taskName
+        ):
+        """
+        This getter method can be overridden by implementations whose tasks
+        build different outputs depending on settings.
+
+        Parameters
+        ----------
+        taskName : string
+                   The task name whose options are returned.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The current values of all settings that change the output of the
+               given task, keyed by option name. They are saved in its build
+               record, and a change of any of them makes the task stale.
+        """
+        return {}
+
+
+    def taskTool(
+        self
+        ,taskName
+        ):
+        """
+        This getter method can be overridden by implementations whose tasks
+        use external tools registered with the tools singleton.
+
+        Parameters
+        ----------
+        taskName : string
+                   The task name whose tool is returned.
+
+        Returns
+        -------
+        ret0 : string
+               The name of the external tool used by the given task or None if
+               it uses none.
+        """
+        return None
+
+
     @abc.abstractmethod
     def taskSources(
         self
@@ -179,3 +428,70 @@ class AbstractProcess(abc.ABC):
                again if any of them are executed.
         """
         pass
+
+
+    def __fingerprint_(
+        self
+        ,workDir
+        ,rootName
+        ,taskName
+        ,data
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        workDir : string
+                  The full path working directory for the given assembly.
+        rootName : string
+                   The root name used for all data files of the given assembly.
+        taskName : string
+                   The task name whose input files are fingerprinted.
+        data : dictionary
+               The process data of the given assembly's metadata or None if it
+               is not known.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The size and modification time of every existing input file of
+               the given task, plain or gzip compressed, keyed by its extension.
+        """
+        ret = {}
+        for ext in self.dataInputs(taskName,data):
+            path = self.inputPath(workDir,rootName,ext)
+            if path is not None:
+                st = os.stat(path)
+                ret[ext] = [st.st_size,st.st_mtime_ns]
+        return ret
+
+
+    def __isOutdated_(
+        self
+        ,workDir
+        ,taskName
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        workDir : string
+                  The full path working directory for the given assembly.
+        taskName : string
+                   The name of a processed task of the given assembly without a
+                   build record.
+
+        Returns
+        -------
+        ret0 : bool
+               True if the given task published index directories and none of
+               them is of the installed version of its tool, or false otherwise.
+        """
+        prefix = self.taskIndex(taskName)
+        if prefix is None:
+            return False
+        version = core.tools.version(self.taskTool(taskName))
+        versions = core.IndexDir(workDir,prefix).versions()
+        return version is not None and bool(versions) and version not in versions
@@ -5,6 +5,8 @@ import abc
 from . import core
 import os
 from . import settings
+import time
+from . import utility
 
 
 
@@ -45,6 +47,7 @@ class AbstractTask(abc.ABC):
         self.__dataDir = dataDir
         self.__rootName = rootName
         self.__meta = meta
+        self.__deadline = None
 
 
     @abc.abstractmethod
@@ -80,21 +83,161 @@ class AbstractTask(abc.ABC):
         pass
 
 
+    def options(
+        self
+        ):
+        """
+        This getter method can be overridden by implementations whose output
+        depends on options they resolve while executing, such as the features
+        of the installed tool.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The options this task actually executed with, keyed by option
+               name. They are saved in its build record in place of the
+               process's task options of the same name. By default this is
+               empty.
+        """
+        return {}
+
+
+    def provides(
+        self
+        ):
+        """
+        This getter method can be overridden by implementations that produce
+        the outputs of several tasks at once.
+
+        Returns
+        -------
+        ret0 : list
+               Names of all tasks whose outputs this task produces when it
+               successfully executes, all of which are marked as processed. By
+               default this is only the name of this task.
+        """
+        return [self.name()]
+
+
+    def resources(
+        self
+        ):
+        """
+        This getter method can be overridden by implementations that use more
+        than one thread or a significant amount of memory.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The number of "threads" this task uses and the rough estimate in
+               gigabytes of the "memory" it needs, used to schedule tasks
+               alongside each other. By default this is one thread and one
+               gigabyte.
+        """
+        return {"threads": 1, "memory": 1.0}
+
+
+    def setTimeout(
+        self
+        ,seconds
+        ):
+        """
+        Sets the timeout of this task, starting now, after which any external
+        command it runs is killed. This is set before the task is executed.
+
+        Parameters
+        ----------
+        seconds : float
+                  The number of seconds this task may run or None for no limit.
+        """
+        self.__deadline = None if seconds is None else time.monotonic()+seconds
+
+
+    def _fileSize_(
+        self
+        ,ext
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        ext : string
+              The extension of a data file of this task's assembly, appended to
+              its root name.
+
+        Returns
+        -------
+        ret0 : int
+               The size in bytes of the given data file or 0 if it does not
+               exist. If only its gzip compressed form exists then this is its
+               uncompressed size taken from the gzip trailer.
+        """
+        path = self._inputPath_(ext)
+        if path is None:
+            return 0
+        ret = os.path.getsize(path)
+        if path.endswith(".gz") and ret >= 4:
+            with open(path,"rb") as ifile:
+                ifile.seek(-4,os.SEEK_END)
+                size = int.from_bytes(ifile.read(4),"little")
+            while size < ret:
+                size += 1<<32
+            ret = size
+        return ret
+
+
+    def _inputPath_(
+        self
+        ,ext
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        ext : string
+              The extension of a data file of this task's assembly, appended to
+              its root name.
+
+        Returns
+        -------
+        ret0 : string
+               The full path of the given data file, or of its gzip compressed
+               form with the ".gz" extension appended if only that exists, or
+               None if neither exists.
+        """
+        path = os.path.join(self._workDir_(),self.__rootName+ext)
+        for p in (path,path+".gz"):
+            if os.path.isfile(p):
+                return p
+        return None
+
+
     def _log_(
         self
         ,message
+        ,level=None
+        ,**fields
         ):
         """
         Adds the given message to the logging system. A parenthesis enclosed tag
         is included at the beginning of the message to show the user what
-        assembly this task is running on.
+        assembly this task is running on, and the assembly and task name are
+        added to its structured fields.
 
         Parameters
         ----------
         message : string
                   Message that is sent to the logging system.
+        level : int
+                The level of the message or None for the info level.
+        fields : dictionary
+                 Additional structured fields of the message.
         """
-        core.log.send("("+self.__dataDir+") "+message)
+        if level is None:
+            level = core.Log.INFO
+        core.log.send(message,level,assembly=self.__dataDir,task=self.name(),**fields)
 
 
     def _meta_(
@@ -127,6 +270,51 @@ class AbstractTask(abc.ABC):
         return self.__rootName
 
 
+    def _run_(
+        self
+        ,cmd
+        ,**kwargs
+        ):
+        """
+        Runs the given external command in its own process group, discarding
+        its standard output unless redirected by the given keyword arguments.
+        If the command exits with a non-zero status, or is still running when
+        this task's timeout expires and is killed with its process group, then
+        a task error is raised holding its exit code and the end of its standard
+        error output.
+
+        Parameters
+        ----------
+        cmd : list
+              The command line that is run.
+        kwargs : dictionary
+                 Additional keyword arguments passed to subprocess.Popen.
+
+        Returns
+        -------
+        ret0 : object
+               The completed process of the command.
+        """
+        return utility.run(cmd,self._timeout_(),**kwargs)
+
+
+    def _timeout_(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : float
+               The number of seconds left until this task's timeout expires or
+               None if it has no timeout.
+        """
+        if self.__deadline is None:
+            return None
+        return self.__deadline-time.monotonic()
+
+
     def _workDir_(
         self
         ,fullPath=True
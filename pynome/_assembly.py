@@ -1,8 +1,10 @@
 """
 Contains the Assembly class.
 """
+import contextlib
 from . import core
-import inspect
+import hashlib
+import importlib
 from . import interfaces
 from . import exceptions
 import json
@@ -10,7 +12,10 @@ import os
 import re
 from . import settings
 import subprocess
-import traceback
+import sys
+import threading
+import time
+from . import utility
 
 
 
@@ -27,7 +32,45 @@ class Assembly():
     crawlers, mirroring all local assemblies, and indexing them. Indexing
     methods are provided for splitting up the work for each assembly that needs
     work into separate jobs.
+
+    Implementations are normally discovered through the "pynome.crawlers",
+    "pynome.processes", and "pynome.tasks" entry point groups, falling back to
+    the builtin table if package metadata is unavailable. Discovered
+    implementations are only imported when first used, so a job that only
+    indexes one process type never imports any other crawler, process, or
+    task module. Discovered entry points are persisted to a special hidden JSON
+    file in the root path so jobs can skip scanning installed distributions.
     """
+    BUILTINS = {
+        "pynome.crawlers": {
+            "ensembl": "pynome._ensemblcrawler:EnsemblCrawler"
+            ,"ensembl2": "pynome._ensembl2crawler:Ensembl2Crawler"
+            ,"ncbi": "pynome._ncbicrawler:NCBICrawler"
+        }
+        ,"pynome.processes": {
+            "ensembl": "pynome._ensemblprocess:EnsemblProcess"
+            ,"ncbi": "pynome._ncbiprocess:NCBIProcess"
+        }
+        ,"pynome.tasks": {
+            "download_cdna": "pynome._downloadcdnatask:DownloadCDNATask"
+            ,"download_fasta": "pynome._downloadfastatask:DownloadFastaTask"
+            ,"download_gff": "pynome._downloadgfftask:DownloadGffTask"
+            ,"download_gtf": "pynome._downloadgtftask:DownloadGtfTask"
+            ,"index_bowtie2": "pynome._indexbowtie2task:IndexBowtie2Task"
+            ,"index_bwamem2": "pynome._indexbwamem2task:IndexBwaMem2Task"
+            ,"index_faidx": "pynome._indexfaidxtask:IndexFaidxTask"
+            ,"index_hisat": "pynome._indexhisattask:IndexHisatTask"
+            ,"index_kallisto": "pynome._indexkallistotask:IndexKallistoTask"
+            ,"index_minimap2": "pynome._indexminimap2task:IndexMinimap2Task"
+            ,"index_salmon": "pynome._indexsalmontask:IndexSalmonTask"
+            ,"index_star": "pynome._indexstartask:IndexStarTask"
+            ,"write_annotation": "pynome._writeannotationtask:WriteAnnotationTask"
+            ,"write_cdna": "pynome._writecdnatask:WriteCDNATask"
+            ,"write_gtf": "pynome._writegtftask:WriteGtfTask"
+            ,"write_splice_sites": "pynome._writesplicesitestask:WriteSpliceSitesTask"
+        }
+    }
+    PLUGIN_CACHE_NAME = ".plugins.json"
 
 
     def __init__(
@@ -39,17 +82,305 @@ class Assembly():
         self.__crawlers = {}
         self.__processes = {}
         self.__tasks = {}
+        self.__entries = {group: {} for group in self.BUILTINS}
+        self.__lock = threading.Lock()
+
+
+    def clearFailures(
+        self
+        ,species=""
+        ):
+        """
+        Clears the failure ledger of all assemblies with the given species name,
+        so their failed tasks are attempted again by the next run.
+
+        Parameters
+        ----------
+        species : string
+                  The species name matched with assemblies whose failures are
+                  cleared. If this string is blank then all are cleared.
+        """
+        for (taxId,name) in self.__assemblies_():
+            dataDir = os.path.join(taxId,name)
+            workDir = os.path.join(settings.rootPath,dataDir)
+            if not os.path.isfile(os.path.join(workDir,"metadata.json")):
+                continue
+            meta = self.__loadMeta_(workDir)
+            if meta.get("failures") and self.__matches_(dataDir,species):
+                del meta["failures"]
+                self.__saveMeta_(workDir,meta)
+                core.log.send("Cleared failures of "+dataDir)
+
+
+    def collectAssemblies(
+        self
+        ,dryRun=False
+        ):
+        """
+        Garbage collects all local assemblies that have been retired, because
+        they no longer exist upstream, for longer than the retire grace period.
+        Each one is moved to the archive directory setting if it is set or
+        otherwise removed. Assemblies with any index referenced by a reader
+        manifest are kept. Assemblies are deduplicated again after any is
+        collected, so aliases of a collected primary are pointed to a remaining
+        match or become primaries themselves instead of keeping a dangling
+        "primary" link.
+
+        Parameters
+        ----------
+        dryRun : bool
+                 True to only report what would be archived or removed or false
+                 to do it.
+
+        Returns
+        -------
+        ret0 : int
+               The number of bytes that were, or would be, reclaimed.
+        """
+        core.readers.reload()
+        ret = 0
+        collected = []
+        for (taxId,assemblyName) in list(self.__assemblies_()):
+            dataDir = os.path.join(taxId,assemblyName)
+            workDir = os.path.join(settings.rootPath,dataDir)
+            meta = self.__loadMeta_(workDir)
+            if not meta.get("retired") or meta["retired"]+settings.retireGrace > time.time():
+                continue
+            if any(core.readers.references(os.path.join(workDir,p)) for p in os.listdir(workDir)):
+                core.log.send("Keeping "+dataDir+" referenced by a reader")
+                continue
+            action = "archive" if settings.retireArchive else "remove"
+            core.log.send(("Would "+action+" " if dryRun else action.capitalize()+"d ")+dataDir)
+            ret += utility.diskUsage(workDir)
+            if dryRun:
+                continue
+            if settings.retireArchive:
+                dst = os.path.join(settings.retireArchive,dataDir)
+                os.makedirs(os.path.dirname(dst),exist_ok=True)
+                cmd = ["mv",workDir,dst]
+            else:
+                cmd = ["rm","-fr",workDir]
+            assert(subprocess.run(cmd).returncode==0)
+            collected.append(dataDir)
+            taxDir = os.path.join(settings.rootPath,taxId)
+            if not os.listdir(taxDir):
+                os.rmdir(taxDir)
+        core.journal.discard(collected)
+        if collected:
+            self.deduplicate()
+        core.log.send(
+            ("Would reclaim " if dryRun else "Reclaimed ")+str(ret)+" bytes of retired assemblies"
+        )
+        return ret
+
+
+    def collectIndexes(
+        self
+        ,dryRun=False
+        ):
+        """
+        Garbage collects old index versions of all local assemblies. Published
+        versions beyond the retention count that no reader manifest references
+        are retired, and retired builds past their grace period are removed.
+
+        Parameters
+        ----------
+        dryRun : bool
+                 True to only report what would be retired and removed or false
+                 to do it.
+
+        Returns
+        -------
+        ret0 : int
+               The number of bytes that were, or would be, reclaimed by removing
+               retired builds past their grace period.
+        """
+        core.readers.reload()
+        (retired,removed) = (0,0)
+        for (taxId,assemblyName) in self.__assemblies_():
+            workDir = os.path.join(settings.rootPath,taxId,assemblyName)
+            for prefix in self.__indexPrefixes_(workDir):
+                indexDir = core.IndexDir(workDir,prefix)
+                for (path,size) in indexDir.retain(settings.indexRetain,dryRun):
+                    core.log.send(("Would retire " if dryRun else "Retired ")+path)
+                    retired += size
+                for (path,size) in indexDir.prune(dryRun):
+                    core.log.send(("Would remove " if dryRun else "Removed ")+path)
+                    removed += size
+        if dryRun:
+            core.log.send("Would retire "+str(retired)+" bytes and reclaim "+str(removed)+" bytes")
+        else:
+            core.log.send("Retired "+str(retired)+" bytes and reclaimed "+str(removed)+" bytes")
+        return removed
+
+
+    def deduplicate(
+        self
+        ):
+        """
+        Matches local assemblies crawled from different sources that are the
+        same biological assembly, marking all but one of each match as aliases
+        of the remaining primary assembly. Assemblies match if they share a
+        taxonomy ID and either their GenBank accession or the checksum of their
+        sequences. Retired assemblies are never matched. The primary is chosen
+        by the alias preference setting. An alias is skipped when mirroring and
+        indexing, and a relative "primary" link in its working directory points
+        to the primary's directory whose data files and indexes it shares.
+
+        Returns
+        -------
+        ret0 : int
+               The number of assemblies that are aliases.
+        """
+        metas = {}
+        groups = {}
+        for (taxId,assemblyName) in self.__assemblies_():
+            dataDir = os.path.join(taxId,assemblyName)
+            workDir = os.path.join(settings.rootPath,dataDir)
+            meta = self.__loadMeta_(workDir)
+            metas[dataDir] = meta
+            if meta.get("retired"):
+                continue
+            keys = []
+            if meta.get("accession"):
+                keys.append((taxId,meta["accession"]))
+            checksum = self.__checksum_(workDir,meta)
+            if checksum:
+                keys.append((taxId,checksum))
+            for key in keys:
+                groups.setdefault(key,[]).append(dataDir)
+        parents = {dataDir: dataDir for dataDir in metas}
+        def find(d):
+            while parents[d] != d:
+                parents[d] = parents[parents[d]]
+                d = parents[d]
+            return d
+        for members in groups.values():
+            for d in members[1:]:
+                parents[find(d)] = find(members[0])
+        clusters = {}
+        for dataDir in metas:
+            clusters.setdefault(find(dataDir),[]).append(dataDir)
+        ret = 0
+        for members in clusters.values():
+            members.sort(key=self.__aliasRank_)
+            for dataDir in members:
+                meta = metas[dataDir]
+                primary = members[0] if dataDir != members[0] else None
+                workDir = os.path.join(settings.rootPath,dataDir)
+                link = os.path.join(workDir,"primary")
+                if primary:
+                    ret += 1
+                    target = os.path.relpath(os.path.join(settings.rootPath,primary),workDir)
+                    if not os.path.islink(link) or os.readlink(link) != target:
+                        if os.path.lexists(link):
+                            os.remove(link)
+                        os.symlink(target,link)
+                elif os.path.islink(link):
+                    os.remove(link)
+                if meta.get("alias_of") != primary:
+                    if primary:
+                        meta["alias_of"] = primary
+                        core.log.send(dataDir+" is an alias of "+primary)
+                    else:
+                        meta.pop("alias_of",None)
+                    self.__saveMeta_(workDir,meta)
+        return ret
+
+
+    def discover(
+        self
+        ,cached=False
+        ):
+        """
+        Discovers all crawler, process, and task implementations advertised
+        through this application's entry point groups or the builtin table
+        without importing them. Implementations already registered by name are
+        ignored.
+
+        Parameters
+        ----------
+        cached : bool
+                 True to use the entry points persisted by an earlier discovery
+                 if no directory of the module search path changed since, or
+                 false to always scan installed distributions. A scan always
+                 persists its entry points.
+        """
+        advertised = self.__advertised_(cached)
+        for (group,builtins) in self.BUILTINS.items():
+            entries = dict(builtins)
+            entries.update(advertised.get(group,{}))
+            for (name,target) in entries.items():
+                if name not in self.__registry_(group):
+                    self.__entries[group].setdefault(name,target)
+
+
+    def estimateWork(
+        self
+        ,taxId
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        taxId : string
+                The taxonomy ID of an assembly.
+        name : string
+               The name of an assembly.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The estimated CPU hours of every index task of the given assembly
+               that has work and is not backing off from a failure, keyed by
+               task name. Estimates scale the size of each task's input files by
+               its task cost setting.
+        """
+        workDir = os.path.join(settings.rootPath,taxId,name)
+        return self.__estimate_(workDir,self.__loadMeta_(workDir))
+
+
+    def failures(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : list
+               Tuples of the data directory, task name, and failure record of
+               every failed task in the failure ledgers of all assemblies, sorted
+               by data directory and task name. A failure record holds the
+               number of consecutive failed "attempts", the "error", the exit
+               "returncode" and "stderr" tail of a failed external command, and
+               the "time" of the last attempt and the "retry" time before which
+               the task is not attempted again, in seconds since the epoch.
+        """
+        ret = []
+        for (taxId,name) in self.__assemblies_():
+            workDir = os.path.join(settings.rootPath,taxId,name)
+            if not os.path.isfile(os.path.join(workDir,"metadata.json")):
+                continue
+            for (taskName,record) in self.__loadMeta_(workDir).get("failures",{}).items():
+                ret.append((os.path.join(taxId,name),taskName,record))
+        return sorted(ret,key=lambda x: x[:2])
 
 
     def index(
         self
         ,taxId
         ,name
+        ,scheduler=None
         ):
         """
         Indexes the assembly with the given taxonomy ID and assembly name. If
-        the indexes are already up to date for that assembly then nothing is
-        done.
+        the indexes are already up to date for that assembly, or it is an alias
+        of another assembly or retired, then nothing is done. A failed task is
+        recorded in the failure ledger of the assembly's metadata and is not
+        attempted again until its backoff time passes.
 
         Parameters
         ----------
@@ -57,23 +388,63 @@ class Assembly():
                 The taxonomy ID of the assembly whose indexes are updated.
         name : string
                The name of the assembly whose indexes are updated.
+        scheduler : object
+                    The scheduler whose budgets the resource hints of every
+                    executed task are held from while it runs or None to run
+                    tasks without waiting.
         """
         dataDir = os.path.join(taxId,name)
         workDir = os.path.join(settings.rootPath,dataDir)
         if os.path.isdir(workDir):
             meta = self.__loadMeta_(workDir)
+            if meta.get("alias_of") or meta.get("retired"):
+                return
             rootName = self.__rootName_(meta)
-            process = self.__processes[meta["process_type"]]
+            process = self.__process_(meta["process_type"])
+            builds = meta.setdefault("builds",{})
             for taskName in process.indexTasks():
-                if process.hasWork(workDir,rootName,meta["processed"],taskName):
-                    task = self.__tasks[taskName](dataDir,rootName,meta["process_data"])
-                    try:
-                        if task():
-                            process.completeTask(taskName,meta["processed"])
-                            meta["processed"][taskName] = True
-                            self.__saveMeta_(workDir,meta)
-                    except:
-                        pass
+                if (
+                    not process.hasWork(
+                        workDir
+                        ,rootName
+                        ,meta["processed"]
+                        ,taskName
+                        ,builds
+                        ,meta["process_data"]
+                    )
+                    or self.__backingOff_(meta,taskName)
+                ):
+                    continue
+                task = self.__task_(taskName)(dataDir,rootName,meta["process_data"])
+                hold = scheduler.hold(task.resources()) if scheduler else contextlib.nullcontext()
+                try:
+                    with hold:
+                        task.setTimeout(
+                            self.__timeout_(process,workDir,rootName,taskName,meta["process_data"])
+                        )
+                        start = time.monotonic()
+                        done = task()
+                except Exception as error:
+                    self.__failed_(dataDir,meta,taskName,"index",error)
+                    continue
+                cleared = self.__succeeded_(meta,taskName)
+                if done:
+                    names = [n for n in task.provides() if n in process.indexTasks()]
+                    for n in names:
+                        process.completeTask(n,meta["processed"])
+                    for n in names:
+                        meta["processed"][n] = True
+                        builds[n] = process.buildRecord(
+                            workDir
+                            ,rootName
+                            ,n
+                            ,meta["process_data"]
+                            ,task.options() if n == taskName else None
+                        )
+                    self.__saveMeta_(workDir,meta)
+                    self.__finished_(dataDir,taskName,"index",start)
+                elif cleared:
+                    self.__saveMeta_(workDir,meta)
 
 
     def indexSpecies(
@@ -113,7 +484,10 @@ class Assembly():
         -------
         ret0 : list
                Tuples of taxonomy ID and assembly id of all assemblies whose
-               indexes require updating.
+               indexes require updating, excluding aliases, retired
+               assemblies, and tasks backing off from a failure. Assemblies are
+               ordered by descending priority and then by ascending estimated
+               CPU hours, so cheap assemblies are not starved behind large ones.
         """
         ret = []
         for taxId in os.listdir(settings.rootPath):
@@ -123,21 +497,26 @@ class Assembly():
                     for assemblyName in os.listdir(path):
                         workDir = os.path.join(settings.rootPath,taxId,assemblyName)
                         meta = self.__loadMeta_(workDir)
-                        process = self.__processes[meta["process_type"]]
-                        if process.hasWork(workDir,self.__rootName_(meta),meta["processed"]):
-                            ret.append((taxId,assemblyName))
-        return ret
+                        if meta.get("alias_of") or meta.get("retired"):
+                            continue
+                        estimate = self.__estimate_(workDir,meta)
+                        if estimate:
+                            rank = (-self.__priority_(taxId,assemblyName,meta),sum(estimate.values()))
+                            ret.append((rank,taxId,assemblyName))
+        return [(taxId,assemblyName) for (rank,taxId,assemblyName) in sorted(ret)]
 
 
     def mirror(
         self
         ,species
+        ,dataDirs=None
         ):
         """
         Iterates through all local database folders, inspecting their metadata
         file and downloading any new data files if new versions are present on
         the remote server. Any assembly whose data is updated is marked to
-        update its appropriate indexes.
+        update its appropriate indexes. Aliases of other assemblies and retired
+        assemblies are skipped.
 
         Parameters
         ----------
@@ -145,29 +524,162 @@ class Assembly():
                   The name of the species that is mirrored, ignoring any other
                   species on the local database. If this string is blank then
                   all species are mirrored.
+        dataDirs : list
+                   Data directories, excluding the root directory path, of the
+                   only assemblies that are mirrored, such as the new and
+                   changed assemblies of a crawl delta, or None to mirror all
+                   local assemblies.
+
+        Returns
+        -------
+        ret0 : list
+               Data directories of all mirrored assemblies where any mirror task
+               failed.
         """
-        for taxId in os.listdir(settings.rootPath):
-            if taxId.isdecimal():
-                path = os.path.join(settings.rootPath,taxId)
-                if os.path.isdir(path):
-                    for assemblyName in os.listdir(path):
-                        dataDir = os.path.join(taxId,assemblyName)
-                        workDir = os.path.join(settings.rootPath,dataDir)
-                        meta = self.__loadMeta_(workDir)
-                        if species:
-                            fullName = meta["genus"].lower()+" "+meta["species"].lower()
-                            if not species.lower() in fullName:
-                                continue
-                        rootName = self.__rootName_(meta)
-                        process = self.__processes[meta["process_type"]]
-                        for taskName in process.mirrorTasks():
-                            task = self.__tasks[taskName](dataDir,rootName,meta["process_data"])
-                            try:
-                                if task():
-                                    process.completeTask(taskName,meta["processed"])
-                                    self.__saveMeta_(workDir,meta)
-                            except:
-                                pass
+        ret = []
+        if dataDirs is None:
+            dataDirs = [os.path.join(t,a) for (t,a) in self.__assemblies_()]
+        dataDirs = [d for d in dataDirs if self.__matches_(d,species)]
+        core.metrics.add("pynome_assemblies_pending",len(dataDirs),phase="mirror")
+        for dataDir in dataDirs:
+            if not self.mirrorAssembly(dataDir):
+                ret.append(dataDir)
+            core.metrics.add("pynome_assemblies_pending",-1,phase="mirror")
+        return ret
+
+
+    def mirrorAssembly(
+        self
+        ,dataDir
+        ):
+        """
+        Downloads any new data files of the assembly with the given data
+        directory if new versions are present on the remote server, marking it
+        to update its appropriate indexes. If the assembly does not exist, or it
+        is an alias of another assembly or retired, then nothing is done. A
+        failed task is recorded in the failure ledger of the assembly's metadata
+        and is not attempted again until its backoff time passes.
+
+        Parameters
+        ----------
+        dataDir : string
+                  The data directory, excluding the root directory path, of the
+                  mirrored assembly.
+
+        Returns
+        -------
+        ret0 : bool
+               True if no mirror task of the assembly failed or is backing off
+               from a failure, or false otherwise.
+        """
+        workDir = os.path.join(settings.rootPath,dataDir)
+        if not os.path.isfile(os.path.join(workDir,"metadata.json")):
+            return True
+        meta = self.__loadMeta_(workDir)
+        if meta.get("alias_of") or meta.get("retired"):
+            return True
+        ret = True
+        rootName = self.__rootName_(meta)
+        process = self.__process_(meta["process_type"])
+        for taskName in process.mirrorTasks():
+            if self.__backingOff_(meta,taskName):
+                ret = False
+                continue
+            task = self.__task_(taskName)(dataDir,rootName,meta["process_data"])
+            task.setTimeout(self.__timeout_(process,workDir,rootName,taskName,meta["process_data"]))
+            start = time.monotonic()
+            try:
+                done = task()
+            except Exception as error:
+                self.__failed_(dataDir,meta,taskName,"mirror",error)
+                ret = False
+                continue
+            cleared = self.__succeeded_(meta,taskName)
+            if done:
+                process.completeTask(taskName,meta["processed"])
+                self.__saveMeta_(workDir,meta)
+                self.__finished_(dataDir,taskName,"mirror",start)
+            elif cleared:
+                self.__saveMeta_(workDir,meta)
+        return ret
+
+
+    def mirrorChanges(
+        self
+        ,species
+        ):
+        """
+        Mirrors only the assemblies listed in the change journal, whose remote
+        data file URLs were added or changed by a crawl since they were last
+        mirrored. Assemblies are removed from the journal once mirrored without
+        any failed mirror task, so failed ones are retried by the next call.
+
+        Parameters
+        ----------
+        species : string
+                  The name of the species that is mirrored, ignoring any other
+                  species on the local database. If this string is blank then
+                  all journaled species are mirrored.
+        """
+        dataDirs = [d for d in sorted(core.journal.load()) if self.__matches_(d,species)]
+        core.log.send("Mirroring "+str(len(dataDirs))+" journaled assemblies")
+        failed = self.mirror("",dataDirs)
+        core.journal.discard([d for d in dataDirs if d not in failed])
+
+
+    def pipeline(
+        self
+        ,species
+        ,sinceLastCrawl=False
+        ):
+        """
+        Mirrors and indexes all assemblies as a pipeline, queueing the index
+        tasks of each assembly as soon as its downloads complete instead of
+        after all assemblies are mirrored. The network workers and CPU workers
+        are bounded by the network jobs and CPU jobs settings. Index tasks run
+        alongside each other while their resource hints fit within all CPU
+        jobs' threads and the memory budget setting, or the physical memory if
+        it is 0. Aliases of other assemblies and retired assemblies are
+        skipped.
+
+        Parameters
+        ----------
+        species : string
+                  The name of the species that is mirrored and indexed,
+                  ignoring any other species on the local database. If this
+                  string is blank then all species are mirrored and indexed.
+        sinceLastCrawl : bool
+                         True to only mirror the assemblies listed in the
+                         change journal, removing them from the journal once
+                         mirrored without any failed mirror task, and only
+                         index the other assemblies whose indexes require
+                         updating.
+        """
+        if sinceLastCrawl:
+            mirrored = [d for d in sorted(core.journal.load()) if self.__matches_(d,species)]
+            skip = set(mirrored)
+            indexed = [
+                os.path.join(t,a) for (t,a) in self.listAllWork()
+                if os.path.join(t,a) not in skip and self.__matches_(os.path.join(t,a),species)
+            ]
+        else:
+            mirrored = [
+                os.path.join(t,a) for (t,a) in sorted(self.__assemblies_())
+                if self.__matches_(os.path.join(t,a),species)
+            ]
+            indexed = []
+        core.log.send(
+            "Pipelining "+str(len(mirrored))+" mirrored and "+str(len(indexed))+" indexed assemblies"
+        )
+        scheduler = core.Scheduler(
+            settings.networkJobs
+            ,settings.cpuJobs
+            ,settings.cpuCount*settings.cpuJobs
+            ,settings.memoryBudget or utility.physicalMemory()
+        )
+        results = scheduler.run(mirrored,indexed)
+        if sinceLastCrawl:
+            core.journal.discard([d for d in mirrored if results.get(d)])
 
 
     def crawl(
@@ -176,7 +688,8 @@ class Assembly():
         ):
         """
         Iterates through all registered crawler implementations and crawls their
-        remote database to update the local database metadata.
+        remote database to update the local database metadata. Assemblies found
+        by more than one crawler are then deduplicated.
 
         Parameters
         ----------
@@ -184,12 +697,101 @@ class Assembly():
                   The name of the species that is crawled, ignoring any other
                   species found on the remote server. If this string is blank
                   then all species are crawled.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The crawl delta of all crawlers, holding sorted lists of the
+               data directories of all "new", "changed", and "removed"
+               assemblies. Assemblies are only reported as removed if all
+               species were crawled. The new or changed URLs are also merged
+               into the change journal. Removed assemblies are marked as
+               retired, unless more than the retire limit setting's fraction of
+               a crawler's assemblies were removed at once, which is taken to
+               be a failed crawl.
         """
         self.__copyListScript_()
         self.__prepareDataDirs_()
-        for crawler in self.__crawlers.values():
+        ret = {"new": [], "changed": [], "removed": [], "urls": {}}
+        for crawler in self.__crawlers_().values():
             crawler.crawl(species)
-            crawler.assemble()
+            delta = crawler.assemble(not species)
+            for k in ("new","changed","removed"):
+                ret[k] += delta[k]
+                core.metrics.add(
+                    "pynome_crawled_assemblies_total"
+                    ,len(delta[k])
+                    ,crawler=crawler.name()
+                    ,change=k
+                )
+            ret["urls"].update(delta["urls"])
+            self.__retire_(crawler.name(),delta["removed"])
+        self.deduplicate()
+        for k in ("new","changed","removed"):
+            ret[k].sort()
+        core.journal.record(ret["urls"],ret["removed"])
+        return ret
+
+
+    def priority(
+        self
+        ,taxId
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        taxId : string
+                The taxonomy ID of an assembly.
+        name : string
+               The name of an assembly.
+
+        Returns
+        -------
+        ret0 : int
+               The priority of the given assembly from the priorities setting,
+               looked up by its data directory, assembly name, taxonomy ID,
+               species name, and then genus name, where the first one found is
+               used. Names are not case sensitive. This is 0 if none is found.
+        """
+        if not settings.priorities:
+            return 0
+        workDir = os.path.join(settings.rootPath,taxId,name)
+        meta = None
+        if os.path.isfile(os.path.join(workDir,"metadata.json")):
+            meta = self.__loadMeta_(workDir)
+        return self.__priority_(taxId,name,meta)
+
+
+    def rank(
+        self
+        ,taxId
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        taxId : string
+                The taxonomy ID of an assembly.
+        name : string
+               The name of an assembly.
+
+        Returns
+        -------
+        ret0 : tuple
+               The sort key of the given assembly in work queues, ordering
+               assemblies by descending priority and then by ascending total
+               estimated CPU hours of their index tasks.
+        """
+        workDir = os.path.join(settings.rootPath,taxId,name)
+        if not os.path.isfile(os.path.join(workDir,"metadata.json")):
+            return (-self.__priority_(taxId,name,None),0.0)
+        meta = self.__loadMeta_(workDir)
+        return (-self.__priority_(taxId,name,meta),sum(self.__estimate_(workDir,meta).values()))
 
 
     def registerCrawler(
@@ -207,8 +809,9 @@ class Assembly():
         if not isinstance(crawler,interfaces.AbstractCrawler):
             raise exceptions.RegisterError("Given object is not Crawler instance.")
         if crawler.name() in self.__crawlers:
-            raise exceptions.RegisterError("Crawler '"+name+"' already exists.")
+            raise exceptions.RegisterError("Crawler '"+crawler.name()+"' already exists.")
         self.__crawlers[crawler.name()] = crawler
+        self.__entries["pynome.crawlers"].pop(crawler.name(),None)
 
 
     def registerProcess(
@@ -226,13 +829,15 @@ class Assembly():
         if not isinstance(process,interfaces.AbstractProcess):
             raise exceptions.RegisterError("Given object is not Process instance.")
         if process.name() in self.__processes:
-            raise exceptions.RegisterError("Process '"+name+"' already exists.")
+            raise exceptions.RegisterError("Process '"+process.name()+"' already exists.")
         self.__processes[process.name()] = process
+        self.__entries["pynome.processes"].pop(process.name(),None)
 
 
     def registerTask(
         self
         ,taskClass
+        ,name=None
         ):
         """
         Registers a new task implementation with the given class.
@@ -240,15 +845,233 @@ class Assembly():
         Parameters
         ----------
         taskClass : class
-                    The abstract crawler implementation class that is
-                    registered.
+                    The abstract task implementation class that is registered.
+        name : string
+               The name of the registered task or None to get it from a
+               temporary instance of the given class.
         """
         if not issubclass(taskClass,interfaces.AbstractTask):
             raise exceptions.RegisterError("Given class is not Task subclass.")
-        t = taskClass(None,None,None)
-        if t.name() in self.__tasks:
+        if name is None:
+            name = taskClass(None,None,None).name()
+        if name in self.__tasks:
             raise exceptions.RegisterError("Task '"+name+"' already exists.")
-        self.__tasks[t.name()] = taskClass
+        self.__tasks[name] = taskClass
+        self.__entries["pynome.tasks"].pop(name,None)
+
+
+    def resources(
+        self
+        ,taxId
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        taxId : string
+                The taxonomy ID of an assembly.
+        name : string
+               The name of an assembly.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The peak number of "threads" and peak estimated gigabytes of
+               "memory" of the resource hints of all index tasks of the given
+               assembly that have work and are not backing off from a failure.
+               Both are 0 if no task has work.
+        """
+        dataDir = os.path.join(taxId,name)
+        workDir = os.path.join(settings.rootPath,dataDir)
+        meta = self.__loadMeta_(workDir)
+        rootName = self.__rootName_(meta)
+        process = self.__process_(meta["process_type"])
+        ret = {"threads": 0, "memory": 0.0}
+        for taskName in process.indexTasks():
+            if (
+                process.hasWork(
+                    workDir
+                    ,rootName
+                    ,meta["processed"]
+                    ,taskName
+                    ,meta.get("builds",{})
+                    ,meta["process_data"]
+                )
+                and not self.__backingOff_(meta,taskName)
+            ):
+                hints = self.__task_(taskName)(dataDir,rootName,meta["process_data"]).resources()
+                ret["threads"] = max(ret["threads"],hints["threads"])
+                ret["memory"] = max(ret["memory"],hints["memory"])
+        return ret
+
+
+    def __advertised_(
+        self
+        ,cached
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        cached : bool
+                 True to use the persisted entry points if they are still valid
+                 or false to scan installed distributions.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The entry points of this application's entry point groups as
+               returned by the entry points utility function. Scanned entry
+               points are atomically persisted to the plugin cache file of the
+               root path, stamped with the modification times of all
+               directories of the module search path except the first, which
+               is the script or current directory and not an install location.
+        """
+        path = os.path.join(settings.rootPath,self.PLUGIN_CACHE_NAME)
+        stamp = [[p,os.stat(p).st_mtime_ns] for p in sys.path[1:] if os.path.isdir(p)]
+        if cached:
+            try:
+                with open(path,"r") as ifile:
+                    cache = json.loads(ifile.read())
+                if cache.get("stamp") == stamp:
+                    return cache["entries"]
+            except (OSError,ValueError,KeyError):
+                pass
+        ret = utility.entryPoints(self.BUILTINS)
+        if os.path.isdir(settings.rootPath):
+            tmpPath = path+"."+str(os.getpid())
+            try:
+                with open(tmpPath,"w") as ofile:
+                    ofile.write(json.dumps({"stamp": stamp, "entries": ret},indent=4)+"\n")
+                os.replace(tmpPath,path)
+            except OSError:
+                pass
+        return ret
+
+
+    def __aliasRank_(
+        self
+        ,dataDir
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        dataDir : string
+                  The data directory of a local assembly, excluding the root
+                  directory path.
+
+        Returns
+        -------
+        ret0 : tuple
+               A sorting key of the given assembly among matching assemblies
+               of other sources, ordering the preferred primary first by the
+               alias preference of the crawler that added it.
+        """
+        crawler = os.path.basename(dataDir).rsplit("-",1)[-1]
+        if crawler in settings.aliasPreference:
+            return (settings.aliasPreference.index(crawler),dataDir)
+        return (len(settings.aliasPreference),dataDir)
+
+
+    def __assemblies_(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : generator
+               Tuples of taxonomy ID and assembly name of all assemblies in the
+               local database.
+        """
+        for taxId in os.listdir(settings.rootPath):
+            if taxId.isdecimal():
+                path = os.path.join(settings.rootPath,taxId)
+                if os.path.isdir(path):
+                    for assemblyName in os.listdir(path):
+                        yield (taxId,assemblyName)
+
+
+    def __backingOff_(
+        self
+        ,meta
+        ,taskName
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        meta : dictionary
+               The metadata of an assembly.
+        taskName : string
+                   The name of a task of the given assembly.
+
+        Returns
+        -------
+        ret0 : bool
+               True if the given task failed and its retry time has not passed
+               or false otherwise.
+        """
+        record = meta.get("failures",{}).get(taskName)
+        return record is not None and record.get("retry",0) > time.time()
+
+
+    def __checksum_(
+        self
+        ,workDir
+        ,meta
+        ):
+        """
+        Getter method. The checksum is cached in the given metadata along with
+        the size and modification time of the sequence dictionary it was
+        computed from.
+
+        Parameters
+        ----------
+        workDir : string
+                  The working directory of an assembly.
+        meta : dictionary
+               The metadata of the given assembly.
+
+        Returns
+        -------
+        ret0 : string
+               The checksum of the sorted MD5 checksums of all sequences of the
+               given assembly, read from its sequence dictionary, or None if it
+               has no sequence dictionary. It does not depend on the order or
+               names of sequences, so it matches across sources. The sequence
+               dictionary is only written by the index faidx task, so duplicates
+               from different sources that share no accession are each fully
+               downloaded and indexed by faidx before they can be matched. Only
+               their later index tasks are skipped.
+        """
+        path = os.path.join(workDir,self.__rootName_(meta)+".dict")
+        if not os.path.isfile(path):
+            return None
+        st = os.stat(path)
+        cached = meta.get("checksum")
+        if cached and cached[:2] == [st.st_size,st.st_mtime_ns]:
+            return cached[2]
+        digests = []
+        with open(path,"r") as ifile:
+            for line in ifile:
+                if line.startswith("@SQ"):
+                    for field in line.rstrip("\n").split("\t"):
+                        if field.startswith("M5:"):
+                            digests.append(field[3:])
+        if not digests:
+            return None
+        ret = hashlib.sha1("\n".join(sorted(digests)).encode()).hexdigest()
+        meta["checksum"] = [st.st_size,st.st_mtime_ns,ret]
+        self.__saveMeta_(workDir,meta)
+        return ret
 
 
     def __copyListScript_(
@@ -258,13 +1081,219 @@ class Assembly():
         Copies the list script to the root species directory if it does not
         already exist.
         """
-        scriptPath = os.path.dirname(inspect.getfile(core))
+        scriptPath = os.path.dirname(os.path.abspath(__file__))
         src = os.path.join(scriptPath,"list.py")
         dst = os.path.join(settings.rootPath,"list.py")
         if not os.path.isfile(dst):
             os.popen("cp "+src+" "+dst)
 
 
+    def __crawlers_(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : dictionary
+               All registered crawler implementations keyed by name, importing
+               any discovered ones that are not yet loaded.
+        """
+        for name in list(self.__entries["pynome.crawlers"]):
+            self.__load_("pynome.crawlers",name)
+        return self.__crawlers
+
+
+    def __estimate_(
+        self
+        ,workDir
+        ,meta
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        workDir : string
+                  The working directory of an assembly.
+        meta : dictionary
+               The loaded metadata of the given assembly.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The estimated CPU hours of every index task of the given assembly
+               that has work and is not backing off from a failure, keyed by
+               task name.
+        """
+        rootName = self.__rootName_(meta)
+        process = self.__process_(meta["process_type"])
+        ret = {}
+        for taskName in process.indexTasks():
+            if (
+                process.hasWork(
+                    workDir
+                    ,rootName
+                    ,meta["processed"]
+                    ,taskName
+                    ,meta.get("builds",{})
+                    ,meta["process_data"]
+                )
+                and not self.__backingOff_(meta,taskName)
+            ):
+                size = 0
+                for ext in process.dataInputs(taskName,meta["process_data"]):
+                    size += os.path.getsize(process.inputPath(workDir,rootName,ext))
+                ret[taskName] = settings.taskCost.get(taskName,0.0)*size/2**30
+        return ret
+
+
+    def __failed_(
+        self
+        ,dataDir
+        ,meta
+        ,taskName
+        ,phase
+        ,error
+        ):
+        """
+        Records the given error of the given task in the failure ledger of the
+        given assembly's metadata and saves it. The task is not attempted again
+        until a backoff time passes, which starts at the failure backoff setting
+        and doubles with every consecutive failure up to the maximum failure
+        backoff setting.
+
+        Parameters
+        ----------
+        dataDir : string
+                  The data directory of the assembly whose task failed.
+        meta : dictionary
+               The metadata of the assembly whose task failed.
+        taskName : string
+                   The name of the failed task.
+        phase : string
+                The phase of the failed task, "mirror" or "index".
+        error : object
+                The exception raised by the failed task.
+        """
+        now = int(time.time())
+        failures = meta.setdefault("failures",{})
+        attempts = failures.get(taskName,{}).get("attempts",0)+1
+        backoff = min(settings.failureBackoff*2**(attempts-1),settings.failureBackoffMax)
+        failures[taskName] = {
+            "attempts": attempts
+            ,"error": (type(error).__name__+": "+str(error)).strip()
+            ,"returncode": getattr(error,"returncode",None)
+            ,"stderr": getattr(error,"stderr","")
+            ,"time": now
+            ,"retry": now+int(backoff)
+        }
+        self.__saveMeta_(os.path.join(settings.rootPath,dataDir),meta)
+        core.log.send(
+            "Failed "+taskName+" after "+str(attempts)+" attempts, retrying in "
+            +str(int(backoff))+"s: "+failures[taskName]["error"]
+            ,core.Log.ERROR
+            ,assembly=dataDir
+            ,task=taskName
+            ,phase=phase
+        )
+        core.metrics.add("pynome_task_failures_total",phase=phase,task=taskName)
+
+
+    def __finished_(
+        self
+        ,dataDir
+        ,taskName
+        ,phase
+        ,start
+        ):
+        """
+        Logs the completion of the given task of the given assembly along with
+        its duration and adds it to the task metrics.
+
+        Parameters
+        ----------
+        dataDir : string
+                  The data directory of the assembly whose task completed.
+        taskName : string
+                   The name of the completed task.
+        phase : string
+                The phase of the completed task, "mirror" or "index".
+        start : float
+                The monotonic clock time when the task started.
+        """
+        duration = time.monotonic()-start
+        core.log.send(
+            "Finished "+taskName+" in %.1fs"%(duration,)
+            ,assembly=dataDir
+            ,task=taskName
+            ,phase=phase
+            ,duration=round(duration,3)
+        )
+        core.metrics.add("pynome_tasks_total",phase=phase,task=taskName)
+        core.metrics.observe("pynome_task_duration_seconds",duration,phase=phase,task=taskName)
+
+
+    def __indexPrefixes_(
+        self
+        ,workDir
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        workDir : string
+                  The working directory of an assembly.
+
+        Returns
+        -------
+        ret0 : set
+               Prefixes of all index types with a published or hidden index
+               directory within the given working directory.
+        """
+        ret = set()
+        for p in os.listdir(workDir):
+            m = re.match("^\\.?([A-Za-z0-9]+)-\\d",p)
+            if m and os.path.isdir(os.path.join(workDir,p)):
+                ret.add(m.group(1))
+        return ret
+
+
+    def __load_(
+        self
+        ,group
+        ,name
+        ):
+        """
+        Imports and registers the discovered implementation with the given name
+        in the given entry point group, unless another thread already did. This
+        is safe to call from concurrent threads.
+
+        Parameters
+        ----------
+        group : string
+                The entry point group of the loaded implementation.
+        name : string
+               The name of the loaded implementation.
+        """
+        with self.__lock:
+            if name not in self.__entries[group]:
+                return
+            target = self.__entries[group][name]
+            (module,_,attr) = target.partition(":")
+            obj = importlib.import_module(module)
+            for part in attr.split("."):
+                obj = getattr(obj,part)
+            if group == "pynome.crawlers":
+                self.registerCrawler(obj())
+            elif group == "pynome.processes":
+                self.registerProcess(obj())
+            else:
+                self.registerTask(obj,name)
+
+
     def __loadMeta_(
         self
         ,workDir
@@ -282,10 +1311,101 @@ class Assembly():
         ret0 : dictionary
                The metadata information for the given working directory. If the
                processed keys are not set then they are added and set to false.
+               Tasks providing the outputs of other tasks are migrated as
+               described by the migrate method, saving the migrated metadata.
         """
         with open(os.path.join(workDir,"metadata.json"),"r") as ifile:
             meta = json.loads(ifile.read())
-            return meta
+        if self.__migrate_(workDir,meta):
+            self.__saveMeta_(workDir,meta)
+        return meta
+
+
+    def __matches_(
+        self
+        ,dataDir
+        ,species
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        dataDir : string
+                  The data directory, excluding the root directory path, of the
+                  matched assembly.
+        species : string
+                  The species name matched with the assembly.
+
+        Returns
+        -------
+        ret0 : bool
+               True if the given species name is blank, the assembly does not
+               exist, or the assembly's species matches the given species name,
+               or false otherwise.
+        """
+        workDir = os.path.join(settings.rootPath,dataDir)
+        if not species or not os.path.isfile(os.path.join(workDir,"metadata.json")):
+            return True
+        meta = self.__loadMeta_(workDir)
+        return species.lower() in meta["genus"].lower()+" "+meta["species"].lower()
+
+
+    def __migrate_(
+        self
+        ,workDir
+        ,meta
+        ):
+        """
+        Marks every unprocessed index task of the given assembly that provides
+        the outputs of other index tasks as processed, with a new build record,
+        if all of those tasks are already processed and up to date. A task
+        fusing older tasks is therefore adopted by assemblies processed before
+        it existed instead of rebuilding them and every index depending on its
+        outputs.
+
+        Parameters
+        ----------
+        workDir : string
+                  The working directory of an assembly.
+        meta : dictionary
+               The loaded metadata of the given assembly, which is updated in
+               place.
+
+        Returns
+        -------
+        ret0 : bool
+               True if any task was marked processed or false otherwise.
+        """
+        name = meta.get("process_type")
+        if name not in self.__processes and name not in self.__entries["pynome.processes"]:
+            return False
+        processed = meta.get("processed",{})
+        process = self.__process_(name)
+        indexTasks = process.indexTasks()
+        if not any(processed.get(tn,False) for tn in indexTasks):
+            return False
+        dataDir = os.path.relpath(workDir,settings.rootPath)
+        rootName = self.__rootName_(meta)
+        builds = meta.get("builds",{})
+        ret = False
+        for taskName in indexTasks:
+            if processed.get(taskName,False):
+                continue
+            if taskName not in self.__tasks and taskName not in self.__entries["pynome.tasks"]:
+                continue
+            task = self.__task_(taskName)(dataDir,rootName,meta["process_data"])
+            names = [n for n in task.provides() if n in indexTasks and n != taskName]
+            if names and all(
+                processed.get(n,False)
+                and not process.hasWork(workDir,rootName,processed,n,builds,meta["process_data"])
+                for n in names
+            ):
+                processed[taskName] = True
+                builds[taskName] = process.buildRecord(workDir,rootName,taskName,meta["process_data"])
+                meta["builds"] = builds
+                ret = True
+        return ret
 
 
     def __prepareDataDirs_(
@@ -295,11 +1415,136 @@ class Assembly():
         Creates any of the special data directories for all implemented crawlers
         if they do not exist.
         """
-        for crawler in self.__crawlers.values():
+        for crawler in self.__crawlers_().values():
             d = os.path.join(settings.rootPath,"."+crawler.name())
             os.makedirs(d,exist_ok=True)
 
 
+    def __priority_(
+        self
+        ,taxId
+        ,name
+        ,meta
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        taxId : string
+                The taxonomy ID of an assembly.
+        name : string
+               The name of an assembly.
+        meta : dictionary
+               The loaded metadata of the given assembly or None if it has none.
+
+        Returns
+        -------
+        ret0 : int
+               The priority of the given assembly as described by the priority
+               method.
+        """
+        if not settings.priorities:
+            return 0
+        priorities = {k.lower(): v for (k,v) in settings.priorities.items()}
+        keys = [os.path.join(taxId,name),name,taxId]
+        if meta is not None:
+            keys += [meta["genus"].lower()+" "+meta["species"].lower(),meta["genus"].lower()]
+        for key in keys:
+            if key.lower() in priorities:
+                return int(priorities[key.lower()])
+        return 0
+
+
+    def __process_(
+        self
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        name : string
+               The name of a registered or discovered process implementation.
+
+        Returns
+        -------
+        ret0 : object
+               The process implementation with the given name, importing it if
+               it is not yet loaded.
+        """
+        if name not in self.__processes and name in self.__entries["pynome.processes"]:
+            self.__load_("pynome.processes",name)
+        return self.__processes[name]
+
+
+    def __registry_(
+        self
+        ,group
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        group : string
+                An entry point group of this application.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The loaded implementations of the given entry point group keyed
+               by name.
+        """
+        return {
+            "pynome.crawlers": self.__crawlers
+            ,"pynome.processes": self.__processes
+            ,"pynome.tasks": self.__tasks
+        }[group]
+
+
+    def __retire_(
+        self
+        ,crawlerName
+        ,removed
+        ):
+        """
+        Marks the given assemblies, which the given crawler no longer found
+        upstream, as retired with the current time. Nothing is marked if more
+        than the retire limit setting's fraction of the crawler's local
+        assemblies would be newly retired.
+
+        Parameters
+        ----------
+        crawlerName : string
+                      The name of the crawler that reported the given
+                      assemblies removed.
+        removed : list
+                  Data directories of the removed assemblies.
+        """
+        metas = {}
+        for dataDir in removed:
+            meta = self.__loadMeta_(os.path.join(settings.rootPath,dataDir))
+            if not meta.get("retired"):
+                metas[dataDir] = meta
+        if not metas:
+            return
+        total = sum(1 for (t,a) in self.__assemblies_() if a.endswith("-"+crawlerName))
+        if len(metas) > settings.retireLimit*total:
+            core.log.send(
+                "("+crawlerName+") Not retiring "+str(len(metas))+" of "+str(total)
+                +" assemblies missing upstream, the crawl may have failed"
+                ,core.Log.WARNING
+                ,phase="crawl"
+            )
+            return
+        for (dataDir,meta) in metas.items():
+            meta["retired"] = int(time.time())
+            self.__saveMeta_(os.path.join(settings.rootPath,dataDir),meta)
+            core.log.send("("+crawlerName+") Retired "+dataDir)
+
+
     def __rootName_(
         self
         ,meta
@@ -332,7 +1577,8 @@ class Assembly():
         ,meta
         ):
         """
-        Saves the given assembly metadata to the given working directory.
+        Saves the given assembly metadata to the given working directory,
+        atomically replacing any existing metadata file.
 
         Parameters
         ----------
@@ -343,5 +1589,108 @@ class Assembly():
                The given assembly metadata that is saved to the given working
                directory as JSON.
         """
-        with open(os.path.join(workDir,"metadata.json"),"w") as ofile:
-            return ofile.write(json.dumps(meta,indent=4) + "\n\n")
+        path = os.path.join(workDir,"metadata.json")
+        with open(path+".tmp","w") as ofile:
+            ofile.write(json.dumps(meta,indent=4) + "\n\n")
+        os.replace(path+".tmp",path)
+
+
+    def __succeeded_(
+        self
+        ,meta
+        ,taskName
+        ):
+        """
+        Removes the given task from the failure ledger of the given assembly's
+        metadata without saving it.
+
+        Parameters
+        ----------
+        meta : dictionary
+               The metadata of the assembly whose task succeeded.
+        taskName : string
+                   The name of the task that succeeded.
+
+        Returns
+        -------
+        ret0 : bool
+               True if the given task was removed from the failure ledger or
+               false otherwise.
+        """
+        failures = meta.get("failures",{})
+        if taskName not in failures:
+            return False
+        del failures[taskName]
+        if not failures:
+            del meta["failures"]
+        return True
+
+
+    def __task_(
+        self
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        name : string
+               The name of a registered or discovered task implementation.
+
+        Returns
+        -------
+        ret0 : class
+               The task implementation class with the given name, importing it
+               if it is not yet loaded.
+        """
+        if name not in self.__tasks and name in self.__entries["pynome.tasks"]:
+            self.__load_("pynome.tasks",name)
+        return self.__tasks[name]
+
+
+    def __timeout_(
+        self
+        ,process
+        ,workDir
+        ,rootName
+        ,taskName
+        ,data
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        process : object
+                  The process of the given assembly.
+        workDir : string
+                  The full path working directory of the given assembly.
+        rootName : string
+                   The root name used for all data files of the given assembly.
+        taskName : string
+                   The name of a task of the given assembly.
+        data : dictionary
+               The process data of the given assembly's metadata.
+
+        Returns
+        -------
+        ret0 : float
+               The number of seconds the given task may run before its external
+               commands are killed, or None for no limit. This is the task's
+               entry in the task timeout setting if it has one. Otherwise it is
+               the timeout base setting plus the timeout scale setting times the
+               estimated CPU seconds of the task, scaling with the size of its
+               input files. A timeout scale of 0 disables timeouts.
+        """
+        if taskName in settings.taskTimeout:
+            return settings.taskTimeout[taskName]
+        if not settings.timeoutScale:
+            return None
+        size = 0
+        for ext in process.dataInputs(taskName,data):
+            path = process.inputPath(workDir,rootName,ext)
+            if path is not None:
+                size += os.path.getsize(path)
+        hours = settings.taskCost.get(taskName,0.0)*size/2**30
+        return settings.timeoutBase+settings.timeoutScale*hours*3600
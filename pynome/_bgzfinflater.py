@@ -0,0 +1,180 @@
+"""
+Contains the BgzfInflater class.
+"""
+import collections
+import concurrent.futures
+import struct
+import zlib
+
+
+
+
+
+
+
+
+class BgzfInflater():
+    """
+    This is the BGZF inflater class. It decompresses BGZF files, the blocked
+    gzip format written by bgzip, using a pool of threads. A BGZF file is a
+    series of independent gzip members of at most 64 kilobytes each whose size
+    is stored in their headers, so blocks can be split off without inflating
+    them and inflated in parallel, since zlib releases the global interpreter
+    lock. Batches of blocks are inflated ahead of the writer by a bounded
+    number of batches and written in order. The CRC and size of every block are
+    verified.
+    """
+    __BATCH_BLOCKS = 64
+    __HEADER = struct.Struct("<4BI2BH")
+
+
+    def __init__(
+        self
+        ,threads
+        ):
+        """
+        Initializes a new BGZF inflater.
+
+        Parameters
+        ----------
+        threads : int
+                  The number of threads that inflate blocks.
+        """
+        super().__init__()
+        self.__threads = max(1,threads)
+
+
+    def inflate(
+        self
+        ,inPath
+        ,outPath
+        ):
+        """
+        Decompresses the given BGZF file to the given output path.
+
+        Parameters
+        ----------
+        inPath : string
+                 The full path of the decompressed BGZF file.
+        outPath : string
+                  The full path of the written decompressed file.
+        """
+        pending = collections.deque()
+        with open(inPath,"rb") as ifile, open(outPath,"wb") as ofile:
+            with concurrent.futures.ThreadPoolExecutor(self.__threads) as pool:
+                while True:
+                    batch = self.__read_(ifile)
+                    if batch:
+                        pending.append(pool.submit(self.__inflateBatch_,batch))
+                    while pending and (not batch or len(pending) > 2*self.__threads):
+                        ofile.write(pending.popleft().result())
+                    if not batch:
+                        break
+
+
+    def isBgzf(
+        self
+        ,path
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        path : string
+               The full path of a file.
+
+        Returns
+        -------
+        ret0 : bool
+               True if the given file starts with a BGZF block or false
+               otherwise.
+        """
+        with open(path,"rb") as ifile:
+            return self.__blockSize_(ifile.read(18)) is not None
+
+
+    def __blockSize_(
+        self
+        ,header
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        header : bytes
+                 The first 18 bytes of a block.
+
+        Returns
+        -------
+        ret0 : int
+               The total size in bytes of the block with the given header or
+               None if it is not a BGZF block header.
+        """
+        if len(header) < 18:
+            return None
+        (id1,id2,cm,flg,mtime,xfl,os_,xlen) = self.__HEADER.unpack_from(header)
+        if (id1,id2,cm) != (31,139,8) or not flg&4 or xlen != 6 or header[12:16] != b"BC\x02\x00":
+            return None
+        return struct.unpack_from("<H",header,16)[0]+1
+
+
+    def __inflateBatch_(
+        self
+        ,batch
+        ):
+        """
+        Inflates the given batch of blocks.
+
+        Parameters
+        ----------
+        batch : list
+                Complete BGZF blocks.
+
+        Returns
+        -------
+        ret0 : bytes
+               The concatenated decompressed data of the given blocks.
+        """
+        ret = []
+        for block in batch:
+            data = zlib.decompress(block[18:-8],-15)
+            (crc,size) = struct.unpack_from("<2I",block,len(block)-8)
+            if zlib.crc32(data) != crc or len(data) != size:
+                raise zlib.error("BGZF block failed its CRC or size check.")
+            ret.append(data)
+        return b"".join(ret)
+
+
+    def __read_(
+        self
+        ,ifile
+        ):
+        """
+        Reads the next batch of blocks from the given file.
+
+        Parameters
+        ----------
+        ifile : object
+                The BGZF file opened for binary reading.
+
+        Returns
+        -------
+        ret0 : list
+               The next complete BGZF blocks, which is empty at the end of the
+               file.
+        """
+        ret = []
+        while len(ret) < self.__BATCH_BLOCKS:
+            header = ifile.read(18)
+            if not header:
+                break
+            size = self.__blockSize_(header)
+            if size is None:
+                raise zlib.error("Invalid BGZF block header at offset "+str(ifile.tell()-len(header)))
+            block = header+ifile.read(size-18)
+            if len(block) != size:
+                raise zlib.error("Truncated BGZF block.")
+            ret.append(block)
+        return ret
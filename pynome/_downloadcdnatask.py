@@ -3,7 +3,7 @@ Contains the DownloadCDNATask class.
 """
 from . import interfaces
 import os
-import subprocess
+from . import settings
 from . import utility
 
 
@@ -16,7 +16,9 @@ from . import utility
 class DownloadCDNATask(interfaces.AbstractTask):
     """
     This is the download CDNA task. It implements the abstract task interface.
-    This synchronizes the remote CDNA Fasta file with the local assembly.
+    This synchronizes the remote CDNA Fasta file with the local assembly. If the
+    keep gzip setting is enabled then the downloaded file is kept compressed,
+    since its only readers, the Salmon and Kallisto indexers, read it directly.
     """
 
 
@@ -33,10 +35,16 @@ class DownloadCDNATask(interfaces.AbstractTask):
         """
         self._log_("Syncing CDNA")
         fullPath = os.path.join(self._workDir_(),self._rootName_()+".cdna.fa")
-        if utility.rSync(self._meta_()["cdna"],fullPath+".gz",compare=fullPath):
-            self._log_("Decompressing CDNA")
-            cmd = ["gunzip",fullPath+".gz"]
-            assert(subprocess.run(cmd).returncode==0)
+        compare = fullPath if os.path.isfile(fullPath) else fullPath+".gz"
+        url = self._meta_()["cdna"]
+        downloaded = utility.rSync(url,fullPath+".gz",compare=compare,timeout=self._timeout_())
+        if settings.keepGzip:
+            if downloaded and os.path.isfile(fullPath):
+                os.remove(fullPath)
+            return downloaded
+        if os.path.isfile(fullPath+".gz"):
+            self._log_("Decompressing CDNA",bytes=os.path.getsize(fullPath+".gz"))
+            utility.decompress(fullPath+".gz",self._timeout_())
             return True
         else:
             return False
@@ -3,7 +3,6 @@ Contains the DownloadFastaTask class.
 """
 from . import interfaces
 import os
-import subprocess
 from . import utility
 
 
@@ -33,10 +32,9 @@ class DownloadFastaTask(interfaces.AbstractTask):
         """
         self._log_("Syncing FASTA")
         fullPath = os.path.join(self._workDir_(),self._rootName_()+".fa")
-        if utility.rSync(self._meta_()["fasta"],fullPath+".gz",compare=fullPath):
-            self._log_("Decompressing FASTA")
-            cmd = ["gunzip",fullPath+".gz"]
-            assert(subprocess.run(cmd).returncode==0)
+        if utility.rSync(self._meta_()["fasta"],fullPath+".gz",compare=fullPath,timeout=self._timeout_()):
+            self._log_("Decompressing FASTA",bytes=os.path.getsize(fullPath+".gz"))
+            utility.decompress(fullPath+".gz",self._timeout_())
             return True
         else:
             return False
@@ -3,7 +3,6 @@ Contains the DownloadGtfTask class.
 """
 from . import interfaces
 import os
-import subprocess
 from . import utility
 
 
@@ -36,10 +35,9 @@ class DownloadGtfTask(interfaces.AbstractTask):
             return False
         self._log_("Syncing GTF")
         fullPath = os.path.join(self._workDir_(),self._rootName_()+".gtf")
-        if utility.rSync(self._meta_()["gtf"],fullPath+".gz",compare=fullPath):
-            self._log_("Decompressing GTF")
-            cmd = ["gunzip",fullPath+".gz"]
-            assert(subprocess.run(cmd).returncode==0)
+        if utility.rSync(self._meta_()["gtf"],fullPath+".gz",compare=fullPath,timeout=self._timeout_()):
+            self._log_("Decompressing GTF",bytes=os.path.getsize(fullPath+".gz"))
+            utility.decompress(fullPath+".gz",self._timeout_())
             return True
         else:
             return False
@@ -43,6 +43,7 @@ class EnsemblCrawler(interfaces.AbstractCrawler):
         self.__ftp = None
         self.__text = ""
         self.__taxIds = {}
+        self.__accessions = {}
 
 
     def crawl(
@@ -257,7 +258,7 @@ class EnsemblCrawler(interfaces.AbstractCrawler):
         ):
         """
         Downloads and parses the given taxonomy ID file, populating this
-        crawlers lookup dictionary of taxonomy IDs.
+        crawlers lookup dictionaries of taxonomy IDs and assembly accessions.
 
         Parameters
         ----------
@@ -267,11 +268,14 @@ class EnsemblCrawler(interfaces.AbstractCrawler):
         """
         self.__text = ""
         self.__taxIds = {}
+        self.__accessions = {}
         self.__ftp.retrlines("RETR "+directory+self._TAXONOMY_FILE,self.__write_)
         for line in self.__text.split("\n")[1:]:
             parts = line.split("\t")
             if len(parts)>=5:
                 self.__taxIds[parts[1]] = parts[3]
+            if len(parts)>=6 and parts[5].startswith("GCA_"):
+                self.__accessions[parts[1]] = parts[5]
 
 
     def _latestRelease_(
@@ -338,6 +342,7 @@ class EnsemblCrawler(interfaces.AbstractCrawler):
                             ,"cdna": "ftp://"+self._FTP_HOST+cdna[key]
                             ,"gff": "ftp://"+self._FTP_HOST+gff[key]
                         }
+                        ,self.__accessions.get(taxKey,"")
                     )
 
 
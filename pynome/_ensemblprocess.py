@@ -2,6 +2,7 @@
 Contains the EnsemblProcess class.
 """
 from . import interfaces
+from . import settings
 
 
 
@@ -17,19 +18,66 @@ class EnsemblProcess(interfaces.AbstractProcess):
     ensembl.
     """
     DEPS = {
-        "index_hisat": ["download_fasta"]
+        "index_faidx": ["download_fasta"]
+        ,"index_hisat": ["download_fasta"]
+        ,"index_bowtie2": ["download_fasta"]
+        ,"index_bwamem2": ["download_fasta"]
+        ,"index_minimap2": ["download_fasta"]
+        ,"write_annotation": ["download_gff"]
         ,"write_gtf": ["download_gff"]
+        ,"index_star": ["download_fasta","write_gtf"]
         ,"write_splice_sites": ["write_gtf"]
         ,"index_salmon": ["download_cdna"]
         ,"index_kallisto": ["download_cdna"]
     }
     INPUTS = {
-        "index_hisat": [".fa"]
+        "index_faidx": [".fa"]
+        ,"index_hisat": [".fa"]
+        ,"index_bowtie2": [".fa"]
+        ,"index_bwamem2": [".fa"]
+        ,"index_minimap2": [".fa"]
+        ,"write_annotation": [".gff"]
         ,"write_gtf": [".gff"]
+        ,"index_star": [".fa",".gtf"]
         ,"write_splice_sites": [".gtf"]
         ,"index_salmon": [".cdna.fa"]
         ,"index_kallisto": [".cdna.fa"]
     }
+    TOOLS = {
+        "index_hisat": "hisat2"
+        ,"index_bowtie2": "bowtie2"
+        ,"index_bwamem2": "bwa-mem2"
+        ,"index_minimap2": "minimap2"
+        ,"index_star": "STAR"
+        ,"index_salmon": "salmon"
+        ,"index_kallisto": "kallisto"
+    }
+
+
+    def dataInputs(
+        self
+        ,taskName
+        ,data
+        ):
+        """
+        Implements the pynome.interfaces.AbstractProcess interface. The index
+        star task only reads the Gtf file if the assembly has a Gff URL.
+
+        Parameters
+        ----------
+        taskName : object
+                   See interface docs.
+        data : object
+               See interface docs.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        if taskName == "index_star" and data is not None and not data.get("gff",""):
+            return [".fa"]
+        return self.taskInputs(taskName)
 
 
     def indexTasks(
@@ -43,7 +91,19 @@ class EnsemblProcess(interfaces.AbstractProcess):
         ret0 : object
                See interface docs.
         """
-        return ("index_hisat","write_gtf","write_splice_sites","index_salmon","index_kallisto")
+        return (
+            "index_faidx"
+            ,"index_hisat"
+            ,"write_annotation"
+            ,"write_gtf"
+            ,"write_splice_sites"
+            ,"index_star"
+            ,"index_bowtie2"
+            ,"index_bwamem2"
+            ,"index_minimap2"
+            ,"index_salmon"
+            ,"index_kallisto"
+        )
 
 
     def mirrorTasks(
@@ -75,6 +135,53 @@ class EnsemblProcess(interfaces.AbstractProcess):
 
 
     def taskInputs(
+        self
+        ,taskName
+        ):
+        """
+        Implements the pynome.interfaces.AbstractProcess interface. Salmon
+        indexes also read the genome Fasta file if salmon decoys are enabled.
+
+        Parameters
+        ----------
+        taskName : object
+                   See interface docs.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        ret = self.INPUTS.get(taskName,[])
+        if taskName == "index_salmon" and settings.salmonDecoys:
+            ret = ret+[".fa"]
+        return ret
+
+
+    def taskOptions(
+        self
+        ,taskName
+        ):
+        """
+        Implements the pynome.interfaces.AbstractProcess interface. Salmon
+        indexes depend on the salmon decoys setting.
+
+        Parameters
+        ----------
+        taskName : object
+                   See interface docs.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        if taskName == "index_salmon":
+            return {"decoys": settings.salmonDecoys}
+        return {}
+
+
+    def taskTool(
         self
         ,taskName
         ):
@@ -91,7 +198,7 @@ class EnsemblProcess(interfaces.AbstractProcess):
         ret0 : object
                See interface docs.
         """
-        return self.INPUTS.get(taskName,[])
+        return self.TOOLS.get(taskName)
 
 
     def taskSources(
@@ -99,7 +206,9 @@ class EnsemblProcess(interfaces.AbstractProcess):
         ,taskName
         ):
         """
-        Implements the pynome.interfaces.AbstractProcess interface.
+        Implements the pynome.interfaces.AbstractProcess interface. Salmon
+        indexes also depend on the genome Fasta download if salmon decoys are
+        enabled.
 
         Parameters
         ----------
@@ -111,4 +220,7 @@ class EnsemblProcess(interfaces.AbstractProcess):
         ret0 : object
                See interface docs.
         """
-        return self.DEPS.get(taskName,[])
+        ret = self.DEPS.get(taskName,[])
+        if taskName == "index_salmon" and settings.salmonDecoys:
+            ret = ret+["download_fasta"]
+        return ret
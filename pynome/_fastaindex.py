@@ -0,0 +1,281 @@
+"""
+Contains the FastaIndex class.
+"""
+import hashlib
+import mmap
+import os
+import uuid
+
+
+
+
+
+
+
+
+class FastaIndex():
+    """
+    This is the FASTA index class. It provides random access to the sequences of
+    a plain text FASTA file through a samtools compatible ".fai" index that is
+    persisted next to it. The index is loaded if it is at least as new as the
+    FASTA file or otherwise built in a single streaming pass. That same pass can
+    also write a Picard compatible ".dict" sequence dictionary, with the MD5
+    checksum of every sequence. Sequences are read from a memory map of the
+    FASTA file, so only the pages actually fetched are read from disk.
+    """
+
+
+    def __init__(
+        self
+        ,fastaPath
+        ,dictPath=None
+        ,rebuild=False
+        ):
+        """
+        Initializes a new FASTA index, loading or building its index file.
+
+        Parameters
+        ----------
+        fastaPath : string
+                    The full path of the indexed plain text FASTA file.
+        dictPath : string
+                   The full path of the sequence dictionary that must also exist
+                   and be up to date or None to ignore it.
+        rebuild : bool
+                  True to always build the index files or false to only build
+                  them if they are missing or older than the FASTA file.
+        """
+        super().__init__()
+        self.__fastaPath = fastaPath
+        self.__entries = {}
+        self.__file = None
+        self.__map = None
+        mtime = os.stat(fastaPath).st_mtime
+        for path in (fastaPath+".fai",dictPath):
+            if path and (rebuild or not os.path.isfile(path) or os.stat(path).st_mtime < mtime):
+                self.build(dictPath)
+                break
+        self.__load_()
+
+
+    def __enter__(
+        self
+        ):
+        """
+        Enters the context of this FASTA index.
+
+        Returns
+        -------
+        ret0 : object
+               This FASTA index.
+        """
+        return self
+
+
+    def __exit__(
+        self
+        ,*args
+        ):
+        """
+        Exits the context of this FASTA index, closing its memory map.
+        """
+        self.close()
+
+
+    def build(
+        self
+        ,dictPath=None
+        ):
+        """
+        Builds the ".fai" index of this index's FASTA file in a single streaming
+        pass, atomically replacing any existing index file. Outputs are written
+        to uniquely named temporary files first, so concurrent builds of the
+        same FASTA file never corrupt each other.
+
+        Parameters
+        ----------
+        dictPath : string
+                   The full path of a sequence dictionary that is also written
+                   in the same pass or None to not write one.
+        """
+        outPaths = [p for p in (self.__fastaPath+".fai",dictPath) if p]
+        suffix = "."+uuid.uuid4().hex+".tmp"
+        try:
+            with open(self.__fastaPath,"rb") as ifile, open(outPaths[0]+suffix,"w") as ofile:
+                dfile = open(dictPath+suffix,"w") if dictPath else None
+                try:
+                    if dfile:
+                        dfile.write("@HD\tVN:1.6\n")
+                    entry = None
+                    md5 = None
+                    offset = 0
+                    for line in ifile:
+                        if line.startswith(b">"):
+                            if entry:
+                                self.__writeEntry_(ofile,dfile,entry,md5)
+                            name = line[1:].split(None,1)[0].decode() if line[1:].strip() else ""
+                            entry = [name,0,offset+len(line),0,0,False]
+                            md5 = hashlib.md5() if dfile else None
+                        elif entry:
+                            bases = len(line.rstrip(b"\r\n"))
+                            if bases:
+                                if entry[5]:
+                                    raise ValueError(
+                                        "Different line length in sequence '"+entry[0]+"'."
+                                    )
+                                if not entry[3]:
+                                    (entry[3],entry[4]) = (bases,len(line))
+                                elif bases != entry[3] or len(line) != entry[4]:
+                                    entry[5] = True
+                                    if bases > entry[3]:
+                                        raise ValueError(
+                                            "Different line length in sequence '"+entry[0]+"'."
+                                        )
+                                entry[1] += bases
+                                if md5 is not None:
+                                    md5.update(line[:bases].upper())
+                        offset += len(line)
+                    if entry:
+                        self.__writeEntry_(ofile,dfile,entry,md5)
+                finally:
+                    if dfile:
+                        dfile.close()
+            for path in outPaths:
+                os.replace(path+suffix,path)
+        finally:
+            for path in outPaths:
+                if os.path.exists(path+suffix):
+                    os.remove(path+suffix)
+
+
+    def close(
+        self
+        ):
+        """
+        Closes the memory map of this index's FASTA file if it is open.
+        """
+        if self.__map is not None:
+            self.__map.close()
+            self.__file.close()
+            self.__map = None
+            self.__file = None
+
+
+    def fetch(
+        self
+        ,name
+        ,start
+        ,end
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        name : string
+               The name of a sequence in this index's FASTA file.
+        start : int
+                The one based inclusive start position of the fetched region.
+        end : int
+              The one based inclusive end position of the fetched region.
+
+        Returns
+        -------
+        ret0 : bytes
+               The bases of the given region, clipped to the sequence length.
+        """
+        (length,offset,lineBases,lineWidth) = self.__entries[name]
+        start = max(start,1)-1
+        end = min(end,length)
+        if end <= start:
+            return b""
+        if self.__map is None:
+            self.__file = open(self.__fastaPath,"rb")
+            self.__map = mmap.mmap(self.__file.fileno(),0,access=mmap.ACCESS_READ)
+        first = offset+(start//lineBases)*lineWidth+start%lineBases
+        last = offset+((end-1)//lineBases)*lineWidth+(end-1)%lineBases
+        ret = self.__map[first:last+1]
+        if lineWidth != lineBases:
+            ret = ret.replace(b"\n",b"").replace(b"\r",b"")
+        return ret
+
+
+    def length(
+        self
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        name : string
+               The name of a sequence in this index's FASTA file.
+
+        Returns
+        -------
+        ret0 : int
+               The length of the given sequence.
+        """
+        return self.__entries[name][0]
+
+
+    def names(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : list
+               The names of all sequences in this index's FASTA file in the order
+               they appear.
+        """
+        return list(self.__entries)
+
+
+    def __load_(
+        self
+        ):
+        """
+        Loads the ".fai" index file of this index's FASTA file.
+        """
+        self.__entries = {}
+        with open(self.__fastaPath+".fai","r") as ifile:
+            for line in ifile:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 5:
+                    self.__entries[parts[0]] = tuple(int(p) for p in parts[1:5])
+
+
+    def __writeEntry_(
+        self
+        ,ofile
+        ,dfile
+        ,entry
+        ,md5
+        ):
+        """
+        Writes the given sequence entry to the given index and dictionary files.
+
+        Parameters
+        ----------
+        ofile : object
+                The opened ".fai" index file the entry is written to.
+        dfile : object
+                The opened sequence dictionary file the entry is written to or
+                None to ignore.
+        entry : list
+                The name, length, offset, line bases, and line width of the
+                written sequence.
+        md5 : object
+              The MD5 hash of the upper case bases of the written sequence or
+              None if no dictionary is written.
+        """
+        ofile.write("%s\t%d\t%d\t%d\t%d\n"%tuple(entry[:5]))
+        if dfile:
+            dfile.write(
+                "@SQ\tSN:%s\tLN:%d\tM5:%s\tUR:file:%s\n"
+                %(entry[0],entry[1],md5.hexdigest(),os.path.abspath(self.__fastaPath))
+            )
@@ -0,0 +1,115 @@
+"""
+Contains the FifoFeeder class.
+"""
+import errno
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+
+
+
+
+
+
+
+class FifoFeeder(threading.Thread):
+    """
+    This is the FIFO feeder class. It creates a named pipe and streams the
+    concatenation of a list of source files into it from a background thread,
+    so an external tool can read them as one file without a copy ever being
+    written to disk. Sources ending in ".gz" are decompressed as they are
+    streamed. The sources are streamed again every time the pipe is
+    reopened for reading, supporting tools that read their input more than
+    once. After each pass the feeder waits a moment before reopening the pipe,
+    giving the reader time to close it after reaching the end of the stream.
+    This is used as a context manager, which removes the pipe on exit.
+    """
+    __BUFFER_SIZE = 1<<22
+    __SETTLE_TIME = 1.0
+
+
+    def __init__(
+        self
+        ,sources
+        ,directory=None
+        ):
+        """
+        Initializes a new FIFO feeder.
+
+        Parameters
+        ----------
+        sources : list
+                  Full paths of the files, in order, whose concatenation is
+                  streamed into the named pipe.
+        directory : string
+                    The directory where the named pipe is created or None to use
+                    the default temporary directory.
+        """
+        super().__init__(daemon=True)
+        self.__sources = list(sources)
+        self.__directory = directory
+        self.__tmpDir = None
+        self.__stopped = threading.Event()
+        self.path = None
+
+
+    def __enter__(
+        self
+        ):
+        """
+        Creates the named pipe and starts streaming into it.
+
+        Returns
+        -------
+        ret0 : object
+               This FIFO feeder, whose path attribute is the full path of its
+               named pipe.
+        """
+        self.__tmpDir = tempfile.mkdtemp(prefix=".fifo-",dir=self.__directory)
+        self.path = os.path.join(self.__tmpDir,"stream")
+        os.mkfifo(self.path)
+        self.start()
+        return self
+
+
+    def __exit__(
+        self
+        ,*args
+        ):
+        """
+        Stops streaming and removes the named pipe.
+        """
+        self.__stopped.set()
+        self.join()
+        shutil.rmtree(self.__tmpDir,ignore_errors=True)
+
+
+    def run(
+        self
+        ):
+        """
+        Streams the sources into the named pipe every time a reader opens it
+        until this feeder is stopped.
+        """
+        while not self.__stopped.is_set():
+            try:
+                fd = os.open(self.path,os.O_WRONLY|os.O_NONBLOCK)
+            except OSError as e:
+                if e.errno != errno.ENXIO:
+                    raise
+                time.sleep(0.1)
+                continue
+            os.set_blocking(fd,True)
+            try:
+                with open(fd,"wb",closefd=True) as ofile:
+                    for source in self.__sources:
+                        opener = gzip.open if source.endswith(".gz") else open
+                        with opener(source,"rb") as ifile:
+                            shutil.copyfileobj(ifile,ofile,self.__BUFFER_SIZE)
+            except BrokenPipeError:
+                pass
+            self.__stopped.wait(self.__SETTLE_TIME)
@@ -0,0 +1,278 @@
+"""
+Contains the GtfConverter class.
+"""
+import os
+import sys
+import urllib.parse
+
+
+
+
+
+
+
+
+class GtfConverter():
+    """
+    This is the GTF converter class. It converts a GFF3 file into a GTF file in
+    a single streaming pass. Any feature with exon or CDS children is written as
+    a transcript with its exons and coding segments. Features are only held in
+    memory until the next "###" directive or change of sequence ID, after which
+    they are written and released. If a feature turns out to reference one that
+    was already written, because the file is not grouped by sequence ID, the
+    conversion is restarted and only flushed at "###" directives.
+
+    The default output is compatible with "gffread -T": every transcript has a
+    transcript line followed by its exon and CDS lines, each carrying the
+    transcript_id, gene_id, and gene_name attributes. Disabling compatibility
+    adds the transcript_type and exon_number attributes.
+    """
+    __CHILD_TYPES = ("exon","CDS")
+
+
+    def __init__(
+        self
+        ,compatible=True
+        ):
+        """
+        Initializes a new GTF converter.
+
+        Parameters
+        ----------
+        compatible : bool
+                     True to write output compatible with "gffread -T" or false
+                     to also write the extended attributes.
+        """
+        super().__init__()
+        self.__compatible = compatible
+        self.__extractor = None
+        self.__features = {}
+        self.__children = {}
+        self.__seqids = {}
+        self.__flushed = set()
+
+
+    def convert(
+        self
+        ,gffPath
+        ,gtfPath
+        ,extractor=None
+        ):
+        """
+        Converts the given GFF3 file to the given GTF file. The GTF file is
+        written to a temporary path first and then moved into place, so a
+        failed conversion never leaves a partial GTF file behind.
+
+        Parameters
+        ----------
+        gffPath : string
+                  The full path of the GFF3 file that is converted.
+        gtfPath : string
+                  The full path of the GTF file that is written.
+        extractor : object
+                    An empty splice site extractor that is given every written
+                    transcript, as if it had read the written GTF file, or None
+                    to ignore. It is cleared if the conversion is restarted.
+
+        Returns
+        -------
+        ret0 : int
+               The number of transcripts written.
+        """
+        self.__extractor = extractor
+        tmpPath = gtfPath+".tmp"
+        try:
+            ret = self.__convert_(gffPath,tmpPath,True)
+            if ret is None:
+                if extractor is not None:
+                    extractor.clear()
+                ret = self.__convert_(gffPath,tmpPath,False)
+            os.replace(tmpPath,gtfPath)
+        finally:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+        return ret
+
+
+    def __attributes_(
+        self
+        ,text
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        text : string
+               The attributes column of a GFF3 line.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The decoded attribute values keyed by attribute name.
+        """
+        ret = {}
+        for part in text.split(";"):
+            (key,_,value) = part.partition("=")
+            if value:
+                if "%" in value:
+                    value = urllib.parse.unquote(value)
+                ret[key.strip()] = value
+        return ret
+
+
+    def __convert_(
+        self
+        ,gffPath
+        ,gtfPath
+        ,bySeqid
+        ):
+        """
+        Converts the given GFF3 file to the given GTF file.
+
+        Parameters
+        ----------
+        gffPath : string
+                  The full path of the GFF3 file that is converted.
+        gtfPath : string
+                  The full path of the GTF file that is written.
+        bySeqid : bool
+                  True to also write and release held features whenever the
+                  sequence ID changes or false to only do so at "###"
+                  directives.
+
+        Returns
+        -------
+        ret0 : int
+               The number of transcripts written or None if flushing by
+               sequence ID was enabled and a feature referenced one that was
+               already written.
+        """
+        self.__features = {}
+        self.__children = {}
+        self.__seqids = {}
+        self.__flushed = set()
+        ret = 0
+        last = None
+        with open(gffPath,"r") as ifile, open(gtfPath,"w",buffering=1<<20) as ofile:
+            for line in ifile:
+                if line[0] == "#":
+                    if line.startswith("###"):
+                        ret += self.__flush_(ofile)
+                    elif line.startswith("##FASTA"):
+                        break
+                    continue
+                parts = line.rstrip("\r\n").split("\t")
+                if len(parts) != 9:
+                    continue
+                (seqid,source,ftype,start,end,score,strand,phase,attrs) = parts
+                if seqid != last:
+                    if bySeqid and last is not None:
+                        ret += self.__flush_(ofile)
+                    last = sys.intern(seqid)
+                    self.__seqids.setdefault(last,len(self.__seqids))
+                attributes = self.__attributes_(attrs)
+                if ftype in self.__CHILD_TYPES:
+                    for parent in attributes.get("Parent","").split(","):
+                        if not parent:
+                            continue
+                        if bySeqid and parent in self.__flushed:
+                            return None
+                        children = self.__children.get(parent)
+                        if children is None:
+                            children = [last,sys.intern(source),strand,[],[]]
+                            self.__children[parent] = children
+                        if ftype == "exon":
+                            children[3].append((int(start),int(end)))
+                        else:
+                            children[4].append((int(start),int(end),phase))
+                    continue
+                fid = attributes.get("ID")
+                if not fid:
+                    continue
+                parent = attributes.get("Parent","").split(",")[0]
+                if bySeqid and (fid in self.__flushed or parent in self.__flushed):
+                    return None
+                if fid not in self.__features:
+                    self.__features[fid] = (
+                        ftype
+                        ,parent
+                        ,attributes.get("Name","")
+                        ,attributes.get("gene_name",attributes.get("gene",""))
+                        ,attributes.get("gene_id","")
+                    )
+            ret += self.__flush_(ofile)
+        return ret
+
+
+    def __flush_(
+        self
+        ,ofile
+        ):
+        """
+        Writes all held transcripts to the given file and releases all held
+        features.
+
+        Parameters
+        ----------
+        ofile : object
+                The opened GTF file the held transcripts are written to.
+
+        Returns
+        -------
+        ret0 : int
+               The number of transcripts written.
+        """
+        transcripts = []
+        for (tid,children) in self.__children.items():
+            (seqid,source,strand,exons,cds) = children
+            if not exons:
+                exons = [(s,e) for (s,e,p) in cds]
+                children[3] = exons
+            exons.sort()
+            cds.sort()
+            start = min(exons[0][0],cds[0][0]) if cds else exons[0][0]
+            end = max(max(e for (s,e) in exons),max((e for (s,e,p) in cds),default=0))
+            transcripts.append((self.__seqids[seqid],start,end,tid))
+        transcripts.sort()
+        for (order,start,end,tid) in transcripts:
+            (seqid,source,strand,exons,cds) = self.__children[tid]
+            (ftype,parent,name,geneName,geneId) = self.__features.get(tid,("transcript","","","",""))
+            if parent:
+                geneId = parent
+                gene = self.__features.get(parent)
+                if gene:
+                    geneName = gene[2] or gene[3]
+            elif not geneId:
+                geneId = tid
+            attrs = 'transcript_id "'+tid+'"; gene_id "'+geneId+'";'
+            if geneName:
+                attrs += ' gene_name "'+geneName+'";'
+            prefix = seqid+"\t"+source+"\t"
+            if self.__compatible:
+                ofile.write(prefix+"transcript\t%d\t%d\t.\t%s\t.\t%s\n"%(start,end,strand,attrs))
+            else:
+                ofile.write(
+                    prefix+"transcript\t%d\t%d\t.\t%s\t.\t%s transcript_type \"%s\";\n"
+                    %(start,end,strand,attrs,ftype)
+                )
+            for (i,(s,e)) in enumerate(exons):
+                if self.__compatible:
+                    ofile.write(prefix+"exon\t%d\t%d\t.\t%s\t.\t%s\n"%(s,e,strand,attrs))
+                else:
+                    n = i+1 if strand != "-" else len(exons)-i
+                    ofile.write(
+                        prefix+"exon\t%d\t%d\t.\t%s\t.\t%s exon_number \"%d\";\n"
+                        %(s,e,strand,attrs,n)
+                    )
+            for (s,e,p) in cds:
+                ofile.write(prefix+"CDS\t%d\t%d\t.\t%s\t%s\t%s\n"%(s,e,strand,p,attrs))
+            if self.__extractor is not None:
+                spliced = [[s,e] for (s,e) in exons if s < e]
+                if spliced:
+                    self.__extractor.addTranscript(seqid,strand,spliced)
+        self.__flushed.update(self.__features)
+        self.__flushed.update(self.__children)
+        self.__features = {}
+        self.__children = {}
+        return len(transcripts)
@@ -0,0 +1,90 @@
+"""
+Contains the IndexBowtie2Task class.
+"""
+from . import core
+from . import interfaces
+import os
+from . import settings
+import shutil
+
+
+
+
+
+
+
+
+class IndexBowtie2Task(interfaces.AbstractTask):
+    """
+    This is the index bowtie2 task. It implements the abstract task interface.
+    This indexes the local Fasta file with Bowtie2.
+    """
+    __MEMORY_PER_BASE = 4
+
+
+    def __call__(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        filePath = os.path.join(self._workDir_(),self._rootName_()+".fa")
+        if not os.path.isfile(filePath):
+            return False
+        version = core.tools.version("bowtie2")
+        if version is None:
+            return False
+        self._log_("Indexing with Bowtie2")
+        indexDir = core.IndexDir(self._workDir_(),"bowtie2")
+        stagePath = indexDir.stage(version)
+        try:
+            outBase = os.path.join(stagePath,self._rootName_())
+            cmd = ["bowtie2-build","--quiet","--threads",str(settings.cpuCount),"-f",filePath,outBase]
+            self._run_(cmd)
+            ext = ".bt2l" if os.path.isfile(outBase+".1.bt2l") else ".bt2"
+            indexDir.publish(
+                stagePath
+                ,version
+                ,[self._rootName_()+".1"+ext,self._rootName_()+".rev.1"+ext]
+            )
+        except BaseException:
+            shutil.rmtree(stagePath,ignore_errors=True)
+            raise
+        indexDir.retain(settings.indexRetain)
+        return True
+
+
+    def name(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return "index_bowtie2"
+
+
+    def resources(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return {
+            "threads": settings.cpuCount
+            ,"memory": max(1.0,self._fileSize_(".fa")*self.__MEMORY_PER_BASE/2**30)
+        }
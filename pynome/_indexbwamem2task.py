@@ -0,0 +1,89 @@
+"""
+Contains the IndexBwaMem2Task class.
+"""
+from . import core
+from . import interfaces
+import os
+from . import settings
+import shutil
+
+
+
+
+
+
+
+
+class IndexBwaMem2Task(interfaces.AbstractTask):
+    """
+    This is the index bwa-mem2 task. It implements the abstract task interface.
+    This indexes the local Fasta file with BWA-MEM2. Building the index is
+    single threaded but needs roughly 28 bytes of memory per base.
+    """
+    __MEMORY_PER_BASE = 28
+
+
+    def __call__(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        filePath = os.path.join(self._workDir_(),self._rootName_()+".fa")
+        if not os.path.isfile(filePath):
+            return False
+        version = core.tools.version("bwa-mem2")
+        if version is None:
+            return False
+        self._log_("Indexing with BWA-MEM2")
+        indexDir = core.IndexDir(self._workDir_(),"bwamem2")
+        stagePath = indexDir.stage(version)
+        try:
+            cmd = ["bwa-mem2","index","-p",os.path.join(stagePath,self._rootName_()),filePath]
+            self._run_(cmd)
+            indexDir.publish(
+                stagePath
+                ,version
+                ,[self._rootName_()+ext for ext in (".0123",".amb",".ann",".bwt.2bit.64",".pac")]
+            )
+        except BaseException:
+            shutil.rmtree(stagePath,ignore_errors=True)
+            raise
+        indexDir.retain(settings.indexRetain)
+        return True
+
+
+    def name(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return "index_bwamem2"
+
+
+    def resources(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return {
+            "threads": 1
+            ,"memory": max(1.0,self._fileSize_(".fa")*self.__MEMORY_PER_BASE/2**30)
+        }
@@ -0,0 +1,355 @@
+"""
+Contains the IndexDir class.
+"""
+from . import core
+import datetime
+from . import exceptions
+import os
+from . import settings
+import subprocess
+import time
+from . import utility
+
+
+
+
+
+
+
+
+class IndexDir():
+    """
+    This is the index directory class. It manages all versioned index
+    directories of a single index type, such as hisat, within the working
+    directory of an assembly. New indexes are built inside a hidden staging
+    directory. Once built and validated they are published by atomically
+    replacing the public "<prefix>-<version>" symbolic link with one pointing
+    to the new build, so readers never see a missing or partially written
+    index. Replaced builds are kept as hidden directories until the index grace
+    period has passed, giving readers that already opened them time to finish.
+    Older tool versions are kept published up to a retention count and for as
+    long as any reader manifest references them.
+    """
+    __STAGING = ".staging"
+
+
+    def __init__(
+        self
+        ,workDir
+        ,prefix
+        ):
+        """
+        Initializes a new index directory manager.
+
+        Parameters
+        ----------
+        workDir : string
+                  The full path of the working directory of the assembly whose
+                  index directories are managed.
+        prefix : string
+                 The prefix of the managed index type, such as "hisat", used to
+                 name all of its directories.
+        """
+        super().__init__()
+        self.__workDir = workDir
+        self.__prefix = prefix
+
+
+    def publish(
+        self
+        ,stagePath
+        ,version
+        ,required=()
+        ):
+        """
+        Validates the given staging directory and publishes it as the index of
+        the given version. The public link of the version is atomically swapped
+        to the new build. Any previous build of the same version is retired
+        instead of removed.
+
+        Parameters
+        ----------
+        stagePath : string
+                    The full path of the staging directory returned by this
+                    manager's stage method.
+        version : string
+                  The tool version of the built index.
+        required : list
+                   File names that must exist and be non-empty within the given
+                   staging directory for it to be considered valid.
+
+        Returns
+        -------
+        ret0 : string
+               The full path of the public link of the published index.
+        """
+        if not os.path.isdir(stagePath) or not os.listdir(stagePath):
+            raise exceptions.BuildError("Index staging directory '"+stagePath+"' is empty.")
+        for fileName in required:
+            path = os.path.join(stagePath,fileName)
+            if not os.path.isfile(path) or not os.path.getsize(path):
+                raise exceptions.BuildError("Index staging directory is missing '"+fileName+"'.")
+        buildPath = stagePath[:-len(self.__STAGING)]
+        os.rename(stagePath,buildPath)
+        linkPath = self.path(version)
+        tmpLink = os.path.join(self.__workDir,"."+self.__prefix+"-"+version+".link")
+        if os.path.lexists(tmpLink):
+            os.remove(tmpLink)
+        os.symlink(os.path.basename(buildPath),tmpLink)
+        previous = None
+        if os.path.islink(linkPath):
+            previous = os.path.join(self.__workDir,os.readlink(linkPath))
+        elif os.path.isdir(linkPath):
+            previous = self.__hidden_(version)
+            os.rename(linkPath,previous)
+        os.replace(tmpLink,linkPath)
+        if previous and os.path.isdir(previous):
+            os.utime(previous)
+        self.prune()
+        return linkPath
+
+
+    def path(
+        self
+        ,version
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        version : string
+                  The tool version of an index.
+
+        Returns
+        -------
+        ret0 : string
+               The full path of the public directory, or link, of the index
+               with the given version.
+        """
+        return os.path.join(self.__workDir,self.__prefix+"-"+version)
+
+
+    def prune(
+        self
+        ,dryRun=False
+        ):
+        """
+        Removes all hidden builds of this manager's index type that are not
+        referenced by any public link and have been retired for longer than the
+        index grace period. Staging directories of any version left behind by
+        failed or killed builds are removed once nothing within them has been
+        modified for longer than the index grace period.
+
+        Parameters
+        ----------
+        dryRun : bool
+                 True to only report the builds that would be removed without
+                 removing them or false to remove them.
+
+        Returns
+        -------
+        ret0 : list
+               Tuples of the full path and size in bytes of every hidden build
+               or staging directory that was, or would be, removed.
+        """
+        ret = []
+        live = set()
+        for version in self.versions():
+            path = self.path(version)
+            if os.path.islink(path):
+                live.add(os.readlink(path))
+        for (name,version,staging) in self.__builds_():
+            if name in live:
+                continue
+            path = os.path.join(self.__workDir,name)
+            modified = self.__modified_(path) if staging else os.stat(path).st_mtime
+            if modified+settings.indexGrace < time.time():
+                ret.append((path,utility.diskUsage(path)))
+                if not dryRun:
+                    cmd = ["rm","-fr",path]
+                    assert(subprocess.run(cmd).returncode==0)
+        return ret
+
+
+    def retain(
+        self
+        ,count
+        ,dryRun=False
+        ):
+        """
+        Retires all published versions of this manager's index type except for
+        the given number of newest versions. Versions referenced by any reader
+        manifest are never retired.
+
+        Parameters
+        ----------
+        count : int
+                The number of newest tool versions that are kept.
+        dryRun : bool
+                 True to only report the versions that would be retired without
+                 retiring them or false to retire them.
+
+        Returns
+        -------
+        ret0 : list
+               Tuples of the full path and size in bytes of every version that
+               was, or would be, retired.
+        """
+        ret = []
+        versions = sorted(self.versions(),key=utility.versionKey,reverse=True)
+        for version in versions[max(count,1):]:
+            path = self.path(version)
+            if core.readers.references(path):
+                continue
+            ret.append((path,utility.diskUsage(os.path.realpath(path))))
+            if not dryRun:
+                self.retire(version)
+        return ret
+
+
+    def retire(
+        self
+        ,version
+        ):
+        """
+        Removes the public link of the given version, keeping the build it
+        pointed to as a hidden directory until the index grace period has passed
+        so any reader still using it can finish.
+
+        Parameters
+        ----------
+        version : string
+                  The tool version of the index that is retired.
+        """
+        path = self.path(version)
+        if os.path.islink(path):
+            target = os.path.join(self.__workDir,os.readlink(path))
+            os.remove(path)
+            if os.path.isdir(target):
+                os.utime(target)
+        elif os.path.isdir(path):
+            hidden = self.__hidden_(version)
+            os.rename(path,hidden)
+            os.utime(hidden)
+
+
+    def stage(
+        self
+        ,version
+        ):
+        """
+        Creates a new empty hidden staging directory for building an index of
+        the given version, removing any staging directory of that version left
+        behind by an interrupted build.
+
+        Parameters
+        ----------
+        version : string
+                  The tool version of the index that is built.
+
+        Returns
+        -------
+        ret0 : string
+               The full path of the new staging directory.
+        """
+        for (name,v,staging) in self.__builds_():
+            if staging and v == version:
+                cmd = ["rm","-fr",os.path.join(self.__workDir,name)]
+                assert(subprocess.run(cmd).returncode==0)
+        ret = self.__hidden_(version)+self.__STAGING
+        os.makedirs(ret)
+        return ret
+
+
+    def versions(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : list
+               Tool versions of all published indexes of this manager's index
+               type, including plain directories written before staged builds
+               were used.
+        """
+        ret = []
+        for p in os.listdir(self.__workDir):
+            if p.startswith(self.__prefix+"-") and os.path.isdir(os.path.join(self.__workDir,p)):
+                ret.append(p[len(self.__prefix)+1:])
+        return sorted(ret)
+
+
+    def __builds_(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : list
+               Tuples of the directory name, tool version, and staging state of
+               every hidden build of this manager's index type.
+        """
+        ret = []
+        for p in os.listdir(self.__workDir):
+            if not p.startswith("."+self.__prefix+"-"):
+                continue
+            if not os.path.isdir(os.path.join(self.__workDir,p)):
+                continue
+            staging = p.endswith(self.__STAGING)
+            name = p[:-len(self.__STAGING)] if staging else p
+            (version,_,stamp) = name[len(self.__prefix)+2:].rpartition(".")
+            if version and stamp.isdigit():
+                ret.append((p,version,staging))
+        return ret
+
+
+    def __hidden_(
+        self
+        ,version
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        version : string
+                  The tool version of an index.
+
+        Returns
+        -------
+        ret0 : string
+               A new unique full path for a hidden build of the given version.
+        """
+        stamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+        return os.path.join(self.__workDir,"."+self.__prefix+"-"+version+"."+stamp)
+
+
+    def __modified_(
+        self
+        ,path
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        path : string
+               The full path of a directory.
+
+        Returns
+        -------
+        ret0 : float
+               The latest modification time of the given directory or of any
+               file or directory within it, so a build still writing to it is
+               never mistaken for an abandoned one.
+        """
+        ret = os.stat(path).st_mtime
+        for (root,dirs,files) in os.walk(path):
+            for name in dirs+files:
+                ret = max(ret,os.lstat(os.path.join(root,name)).st_mtime)
+        return ret
@@ -0,0 +1,54 @@
+"""
+Contains the IndexFaidxTask class.
+"""
+from . import interfaces
+import os
+from . import sequence
+
+
+
+
+
+
+
+
+class IndexFaidxTask(interfaces.AbstractTask):
+    """
+    This is the index faidx task. It implements the abstract task interface.
+    This writes the samtools ".fai" index and the Picard ".dict" sequence
+    dictionary of the local Fasta file in a single pass, so they are built once
+    for the local database instead of by every consumer.
+    """
+
+
+    def __call__(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        basePath = os.path.join(self._workDir_(),self._rootName_())
+        if not os.path.isfile(basePath+".fa"):
+            return False
+        self._log_("Indexing FASTA with faidx")
+        sequence.FastaIndex(basePath+".fa",basePath+".dict",True).close()
+        return True
+
+
+    def name(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return "index_faidx"
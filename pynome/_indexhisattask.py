@@ -1,11 +1,11 @@
 """
 Contains the IndexHisatTask class.
 """
+from . import core
 from . import interfaces
 import os
-import re
 from . import settings
-import subprocess
+import shutil
 
 
 
@@ -19,6 +19,7 @@ class IndexHisatTask(interfaces.AbstractTask):
     This is the index hisat task. It implements the abstract task interface.
     This indexes the local Fasta file with HiSat2.
     """
+    __MEMORY_PER_BASE = 3
 
 
     def __call__(
@@ -35,21 +36,22 @@ class IndexHisatTask(interfaces.AbstractTask):
         filePath = os.path.join(self._workDir_(),self._rootName_()+".fa")
         if not os.path.isfile(filePath):
             return False
+        version = core.tools.version("hisat2")
+        if version is None:
+            return False
         self._log_("Indexing with HiSat2")
-        version = subprocess.check_output(["hisat2","--version"])
-        version = version.decode().split("\n")[0].split()[-1]
-        assert(re.match("^\d+\.\d+\.\d+$",version))
-        for p in os.listdir(self._workDir_()):
-            if p.startswith("hisat-"):
-                path = os.path.join(self._workDir_(),p)
-                if os.path.isdir(path):
-                    cmd = ["rm","-fr",os.path.join(self._workDir_(),p)]
-                    assert(subprocess.run(cmd).returncode==0)
-        outDir = os.path.join(self._workDir_(),"hisat-"+version)
-        os.makedirs(outDir)
-        outBase = os.path.join(outDir,self._rootName_())
-        cmd = ["hisat2-build","--quiet","-p",str(settings.cpuCount),"-f",filePath,outBase]
-        assert(subprocess.run(cmd).returncode==0)
+        indexDir = core.IndexDir(self._workDir_(),"hisat")
+        stagePath = indexDir.stage(version)
+        try:
+            outBase = os.path.join(stagePath,self._rootName_())
+            cmd = ["hisat2-build","--quiet","-p",str(settings.cpuCount),"-f",filePath,outBase]
+            self._run_(cmd)
+            ext = ".ht2l" if os.path.isfile(outBase+".1.ht2l") else ".ht2"
+            indexDir.publish(stagePath,version,[self._rootName_()+".1"+ext,self._rootName_()+".2"+ext])
+        except BaseException:
+            shutil.rmtree(stagePath,ignore_errors=True)
+            raise
+        indexDir.retain(settings.indexRetain)
         return True
 
 
@@ -65,3 +67,20 @@ class IndexHisatTask(interfaces.AbstractTask):
                See interface docs.
         """
         return "index_hisat"
+
+
+    def resources(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return {
+            "threads": settings.cpuCount
+            ,"memory": max(1.0,self._fileSize_(".fa")*self.__MEMORY_PER_BASE/2**30)
+        }
@@ -1,10 +1,11 @@
 """
 Contains the IndexKallistoTask class.
 """
+from . import core
 from . import interfaces
 import os
-import re
-import subprocess
+from . import settings
+import shutil
 
 
 
@@ -18,6 +19,7 @@ class IndexKallistoTask(interfaces.AbstractTask):
     This is the index kallisto task. It implements the abstract task interface.
     This indexes the local CDNA Fasta file with Kallisto.
     """
+    __MEMORY_PER_BASE = 10
 
 
     def __call__(
@@ -31,30 +33,29 @@ class IndexKallistoTask(interfaces.AbstractTask):
         ret0 : object
                See interface docs.
         """
-        filePath = os.path.join(self._workDir_(),self._rootName_()+".cdna.fa")
-        if not os.path.isfile(filePath):
+        filePath = self._inputPath_(".cdna.fa")
+        if filePath is None:
+            return False
+        version = core.tools.version("kallisto")
+        if version is None:
             return False
         self._log_("Indexing with Kallisto")
-        version = subprocess.check_output(["kallisto","version"])
-        version = version.decode().split("\n")[0].split()[-1]
-        assert(re.match("^\d+\.\d+\.\d+$",version))
-        for p in os.listdir(self._workDir_()):
-            if p.startswith("kallisto-"):
-                path = os.path.join(self._workDir_(),p)
-                if os.path.isdir(path):
-                    cmd = ["rm","-fr",os.path.join(self._workDir_(),p)]
-                    assert(subprocess.run(cmd).returncode==0)
-        outBase = os.path.join(self._workDir_(),"kallisto-"+version)
-        os.makedirs(outBase,exist_ok=True)
-        outBase = os.path.join(outBase,self._rootName_()+".idx")
-        cmd = [
-            "kallisto"
-            ,"index"
-            ,"--index"
-            ,outBase
-            ,filePath
-        ]
-        assert(subprocess.run(cmd,capture_output=True).returncode==0)
+        indexDir = core.IndexDir(self._workDir_(),"kallisto")
+        stagePath = indexDir.stage(version)
+        try:
+            cmd = [
+                "kallisto"
+                ,"index"
+                ,"--index"
+                ,os.path.join(stagePath,self._rootName_()+".idx")
+                ,filePath
+            ]
+            self._run_(cmd)
+            indexDir.publish(stagePath,version,[self._rootName_()+".idx"])
+        except BaseException:
+            shutil.rmtree(stagePath,ignore_errors=True)
+            raise
+        indexDir.retain(settings.indexRetain)
         return True
 
 
@@ -70,3 +71,20 @@ class IndexKallistoTask(interfaces.AbstractTask):
                See interface docs.
         """
         return "index_kallisto"
+
+
+    def resources(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return {
+            "threads": 1
+            ,"memory": max(1.0,self._fileSize_(".cdna.fa")*self.__MEMORY_PER_BASE/2**30)
+        }
@@ -0,0 +1,86 @@
+"""
+Contains the IndexMinimap2Task class.
+"""
+from . import core
+from . import interfaces
+import os
+from . import settings
+import shutil
+
+
+
+
+
+
+
+
+class IndexMinimap2Task(interfaces.AbstractTask):
+    """
+    This is the index minimap2 task. It implements the abstract task interface.
+    This indexes the local Fasta file with Minimap2, writing a ".mmi" index
+    with the default k-mer and window sizes.
+    """
+    __MEMORY_PER_BASE = 4
+
+
+    def __call__(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        filePath = os.path.join(self._workDir_(),self._rootName_()+".fa")
+        if not os.path.isfile(filePath):
+            return False
+        version = core.tools.version("minimap2")
+        if version is None:
+            return False
+        self._log_("Indexing with Minimap2")
+        indexDir = core.IndexDir(self._workDir_(),"minimap2")
+        stagePath = indexDir.stage(version)
+        try:
+            outPath = os.path.join(stagePath,self._rootName_()+".mmi")
+            cmd = ["minimap2","-t",str(settings.cpuCount),"-d",outPath,filePath]
+            self._run_(cmd)
+            indexDir.publish(stagePath,version,[self._rootName_()+".mmi"])
+        except BaseException:
+            shutil.rmtree(stagePath,ignore_errors=True)
+            raise
+        indexDir.retain(settings.indexRetain)
+        return True
+
+
+    def name(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return "index_minimap2"
+
+
+    def resources(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return {
+            "threads": settings.cpuCount
+            ,"memory": max(1.0,self._fileSize_(".fa")*self.__MEMORY_PER_BASE/2**30)
+        }
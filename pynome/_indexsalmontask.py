@@ -1,11 +1,14 @@
 """
 Contains the IndexSalmonTask class.
 """
+from . import core
+from . import exceptions
 from . import interfaces
 import os
-import re
+from . import sequence
 from . import settings
-import subprocess
+import shutil
+from . import utility
 
 
 
@@ -17,8 +20,42 @@ import subprocess
 class IndexSalmonTask(interfaces.AbstractTask):
     """
     This is the index salmon task. It implements the abstract task interface.
-    This indexes the local CDNA Fasta file with Salmon.
+    This indexes the local CDNA Fasta file with Salmon. If salmon decoys are
+    enabled in settings then a selective alignment index is built with the
+    local genome Fasta file as decoys. The concatenated transcriptome and
+    genome is streamed to salmon through a named pipe instead of being written
+    to disk. A decoy-aware index holds the "decoys.txt" list of decoy names,
+    which tells readers which kind of index they have, and the decoy mode that
+    was actually used is reported in the task's build record. A gzip compressed
+    CDNA Fasta file is read directly. Salmon uses the job's CPU count as its thread
+    budget, and builds a sparse index if the estimated memory of a dense one
+    exceeds the memory budget and salmon supports sparse indexes.
     """
+    __DECOY_VERSION = (0,14,0)
+    __SPARSE_VERSION = (1,0,0)
+    __BYTES_PER_BASE = 8
+
+
+    def __init__(
+        self
+        ,dataDir
+        ,rootName
+        ,meta
+        ):
+        """
+        Initializes a new index salmon task.
+
+        Parameters
+        ----------
+        dataDir : string
+                  See pynome.interfaces.AbstractTask docs.
+        rootName : string
+                   See pynome.interfaces.AbstractTask docs.
+        meta : dictionary
+               See pynome.interfaces.AbstractTask docs.
+        """
+        super().__init__(dataDir,rootName,meta)
+        self.__decoys = False
 
 
     def __call__(
@@ -32,30 +69,56 @@ class IndexSalmonTask(interfaces.AbstractTask):
         ret0 : object
                See interface docs.
         """
-        filePath = os.path.join(self._workDir_(),self._rootName_()+".cdna.fa")
-        if not os.path.isfile(filePath):
+        filePath = self._inputPath_(".cdna.fa")
+        if filePath is None:
+            return False
+        version = core.tools.version("salmon")
+        if version is None:
+            return False
+        genomePath = os.path.join(self._workDir_(),self._rootName_()+".fa")
+        decoys = settings.salmonDecoys
+        if decoys and not os.path.isfile(genomePath):
             return False
-        self._log_("Indexing with Salmon")
-        version = subprocess.check_output(["salmon","--version"])
-        version = version.decode().split("\n")[0].split()[-1]
-        assert(re.match("^\d+\.\d+\.\d+$",version))
-        for p in os.listdir(self._workDir_()):
-            if p.startswith("salmon-"):
-                path = os.path.join(self._workDir_(),p)
-                if os.path.isdir(path):
-                    cmd = ["rm","-fr",os.path.join(self._workDir_(),p)]
-                    assert(subprocess.run(cmd).returncode==0)
-        cmd = [
-            "salmon"
-            ,"index"
-            ,"--index"
-            ,os.path.join(self._workDir_(),"salmon-"+version)
-            ,"--transcripts"
-            ,filePath
-            ,"--threads"
-            ,str(settings.cpuCount)
-        ]
-        assert(subprocess.run(cmd,capture_output=True).returncode==0)
+        if decoys and utility.versionKey(version) < self.__DECOY_VERSION:
+            raise exceptions.BuildError(
+                "Salmon "+version+" does not support genome decoys; upgrade it or disable salmon decoys."
+            )
+        sparse = utility.versionKey(version) >= self.__SPARSE_VERSION
+        self._log_("Indexing with Salmon"+(" using genome decoys" if decoys else ""))
+        indexDir = core.IndexDir(self._workDir_(),"salmon")
+        stagePath = indexDir.stage(version)
+        try:
+            cmd = [
+                "salmon"
+                ,"index"
+                ,"--index"
+                ,stagePath
+                ,"--threads"
+                ,str(settings.cpuCount)
+            ]
+            if not decoys:
+                cmd += ["--transcripts",filePath]
+                if sparse and self.__memory_([".cdna.fa"]) > settings.memoryBudget > 0:
+                    cmd.append("--sparse")
+                self._run_(cmd)
+            else:
+                with sequence.FastaIndex(genomePath) as index:
+                    names = index.names()
+                with sequence.FifoFeeder([filePath,genomePath],self._workDir_()) as feeder:
+                    decoyPath = os.path.join(os.path.dirname(feeder.path),"decoys.txt")
+                    with open(decoyPath,"w") as ofile:
+                        ofile.write("".join(n+"\n" for n in names))
+                    cmd += ["--transcripts",feeder.path,"--decoys",decoyPath]
+                    if sparse and self.__memory_([".cdna.fa",".fa"]) > settings.memoryBudget > 0:
+                        cmd.append("--sparse")
+                    self._run_(cmd)
+                    shutil.copy(decoyPath,stagePath)
+            indexDir.publish(stagePath,version,["versionInfo.json"]+(["decoys.txt"] if decoys else []))
+        except BaseException:
+            shutil.rmtree(stagePath,ignore_errors=True)
+            raise
+        indexDir.retain(settings.indexRetain)
+        self.__decoys = decoys
         return True
 
 
@@ -71,3 +134,58 @@ class IndexSalmonTask(interfaces.AbstractTask):
                See interface docs.
         """
         return "index_salmon"
+
+
+    def options(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return {"decoys": self.__decoys}
+
+
+    def resources(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        size = self._fileSize_(".cdna.fa")
+        if settings.salmonDecoys:
+            size += self._fileSize_(".fa")
+        return {
+            "threads": settings.cpuCount
+            ,"memory": max(1.0,size*self.__BYTES_PER_BASE/2**30)
+        }
+
+
+    def __memory_(
+        self
+        ,exts
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        exts : list
+               Extensions of the Fasta files that are indexed.
+
+        Returns
+        -------
+        ret0 : float
+               The rough estimate in gigabytes of the memory salmon needs to
+               build a dense index of the given files.
+        """
+        return sum(self._fileSize_(e) for e in exts)*self.__BYTES_PER_BASE/2**30
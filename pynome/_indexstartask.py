@@ -0,0 +1,111 @@
+"""
+Contains the IndexStarTask class.
+"""
+from . import core
+from . import interfaces
+import math
+import os
+from . import sequence
+from . import settings
+import shutil
+
+
+
+
+
+
+
+
+class IndexStarTask(interfaces.AbstractTask):
+    """
+    This is the index star task. It implements the abstract task interface.
+    This indexes the local Fasta file with STAR. If the local GTF file exists
+    then its splice junctions are inserted into the index. The suffix array
+    index length is scaled down for small genomes as recommended by STAR.
+    """
+    __DEFAULT_RAM = 31000000000
+    __OVERHANG = 100
+    __MEMORY_PER_BASE = 10
+
+
+    def __call__(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        filePath = os.path.join(self._workDir_(),self._rootName_()+".fa")
+        if not os.path.isfile(filePath):
+            return False
+        gtfPath = os.path.join(self._workDir_(),self._rootName_()+".gtf")
+        version = core.tools.version("STAR")
+        if version is None:
+            return False
+        self._log_("Indexing with STAR")
+        with sequence.FastaIndex(filePath) as index:
+            length = sum(index.length(n) for n in index.names())
+        indexDir = core.IndexDir(self._workDir_(),"star")
+        stagePath = indexDir.stage(version)
+        try:
+            cmd = [
+                "STAR"
+                ,"--runMode"
+                ,"genomeGenerate"
+                ,"--runThreadN"
+                ,str(settings.cpuCount)
+                ,"--genomeDir"
+                ,stagePath
+                ,"--genomeFastaFiles"
+                ,filePath
+                ,"--genomeSAindexNbases"
+                ,str(min(14,max(4,int(math.log2(max(length,2))/2-1))))
+                ,"--limitGenomeGenerateRAM"
+                ,str(max(self.__DEFAULT_RAM,int(self.resources()["memory"]*2**30)))
+                ,"--outFileNamePrefix"
+                ,os.path.join(stagePath,"")
+            ]
+            if os.path.isfile(gtfPath):
+                cmd += ["--sjdbGTFfile",gtfPath,"--sjdbOverhang",str(self.__OVERHANG)]
+            self._run_(cmd)
+            indexDir.publish(stagePath,version,["Genome","SA","SAindex"])
+        except BaseException:
+            shutil.rmtree(stagePath,ignore_errors=True)
+            raise
+        indexDir.retain(settings.indexRetain)
+        return True
+
+
+    def name(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return "index_star"
+
+
+    def resources(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return {
+            "threads": settings.cpuCount
+            ,"memory": max(1.0,self._fileSize_(".fa")*self.__MEMORY_PER_BASE/2**30)
+        }
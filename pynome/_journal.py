@@ -0,0 +1,110 @@
+"""
+Contains the Journal class.
+"""
+import json
+import os
+from . import settings
+
+
+
+
+
+
+
+
+class Journal():
+    """
+    This is the singleton journal class. It keeps the change journal of the
+    local database, a special hidden JSON file in the root path listing every
+    assembly whose remote data file URLs were added or changed by a crawl and
+    have not been mirrored since. Each journaled assembly maps the names of its
+    new or changed data files to their URLs. Crawls that run before the journal
+    is consumed are merged into it, so no change is lost.
+    """
+    FILE_NAME = ".journal.json"
+
+
+    def discard(
+        self
+        ,dataDirs
+        ):
+        """
+        Removes the given assemblies from the change journal.
+
+        Parameters
+        ----------
+        dataDirs : list
+                   Data directories, excluding the root directory path, of the
+                   assemblies that are removed.
+        """
+        journal = self.load()
+        count = len(journal)
+        for dataDir in dataDirs:
+            journal.pop(dataDir,None)
+        if len(journal) != count:
+            self.__save_(journal)
+
+
+    def load(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The new or changed data file URLs of every journaled assembly,
+               keyed by its data directory excluding the root directory path.
+               This is empty if no valid journal exists.
+        """
+        try:
+            with open(os.path.join(settings.rootPath,self.FILE_NAME),"r") as ifile:
+                return json.loads(ifile.read())
+        except (OSError,ValueError):
+            return {}
+
+
+    def record(
+        self
+        ,urls
+        ,removed=()
+        ):
+        """
+        Merges the given changes of a crawl into the change journal.
+
+        Parameters
+        ----------
+        urls : dictionary
+               The new or changed data file URLs of assemblies, keyed by data
+               directory and then data file name.
+        removed : list
+                  Data directories of assemblies that no longer exist upstream
+                  and are removed from the journal.
+        """
+        journal = self.load()
+        for (dataDir,files) in urls.items():
+            if files:
+                journal.setdefault(dataDir,{}).update(files)
+        for dataDir in removed:
+            journal.pop(dataDir,None)
+        self.__save_(journal)
+
+
+    def __save_(
+        self
+        ,journal
+        ):
+        """
+        Atomically replaces the change journal file with the given journal.
+
+        Parameters
+        ----------
+        journal : dictionary
+                  The new or changed data file URLs of every journaled assembly
+                  keyed by data directory.
+        """
+        path = os.path.join(settings.rootPath,self.FILE_NAME)
+        with open(path+".tmp","w") as ofile:
+            ofile.write(json.dumps(journal,indent=4,sort_keys=True)+"\n")
+        os.replace(path+".tmp",path)
@@ -1,6 +1,11 @@
 """
 Contains the Log class.
 """
+import atexit
+import json
+import queue
+import sys
+import threading
 import time
 
 
@@ -16,8 +21,18 @@ class Log():
     given to it from anywhere else in the application, putting a timestamp on
     the output of every message. This is designed to be the central location for
     any standard output. An echo state can be enabled or disabled, allowing the
-    program to be quiet by disabling it.
+    program to be quiet by disabling it. Every message has a level and optional
+    structured fields such as the assembly, task, phase, duration in seconds,
+    and bytes it concerns. Messages below the level setting are dropped and the
+    others can also be appended as JSON lines to a file. Sending a message only
+    queues it, and a single background thread writes all queued messages, so
+    concurrent tasks never block on output.
     """
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
 
 
     def __init__(
@@ -27,6 +42,57 @@ class Log():
         Initializes the singleton log instance.
         """
         self.__echo = True
+        self.__level = self.INFO
+        self.__jsonPath = ""
+        self.__queue = None
+        self.__thread = None
+        self.__lock = threading.Lock()
+        atexit.register(self.close)
+
+
+    def close(
+        self
+        ):
+        """
+        Writes all queued messages and stops the background writer thread. A
+        new one is started by the next sent message. This is called when the
+        application exits.
+        """
+        with self.__lock:
+            if self.__thread is not None:
+                self.__queue.put(None)
+                self.__thread.join()
+                self.__queue = None
+                self.__thread = None
+
+
+    def send(
+        self
+        ,message
+        ,level=INFO
+        ,**fields
+        ):
+        """
+        Sends a new log message with the given string as the message. The output
+        of the log has a timestamp added to the beginning of the output, and the
+        assembly in parenthesis if one is given.
+
+        Parameters
+        ----------
+        message : string
+                  The log message.
+        level : int
+                The level of the log message.
+        fields : dictionary
+                 Structured fields of the log message that are JSON
+                 serializable, such as "assembly", "task", "phase", "duration",
+                 and "bytes".
+        """
+        if level < self.__level or not (self.__echo or self.__jsonPath):
+            return
+        if self.__queue is None:
+            self.__start_()
+        self.__queue.put((time.time(),level,message,fields))
 
 
     def setEcho(
@@ -45,18 +111,100 @@ class Log():
         self.__echo = echo
 
 
-    def send(
+    def setJsonPath(
         self
-        ,message
+        ,path
         ):
         """
-        Sends a new log message with the given string as the message. The output
-        of the log has a timestamp added to the beginning of the output.
+        Sets the path of the file that all logged messages are appended to as
+        JSON lines, regardless of the echo state.
 
         Parameters
         ----------
-        message : string
-                  The log message.
+        path : string
+               The path of the JSON lines file or an empty string to disable it.
+        """
+        self.close()
+        self.__jsonPath = path
+
+
+    def setLevel(
+        self
+        ,level
+        ):
+        """
+        Sets the level of this singleton log class, below which sent messages
+        are dropped.
+
+        Parameters
+        ----------
+        level : int
+                The minimum level of logged messages.
+        """
+        self.__level = level
+
+
+    def __start_(
+        self
+        ):
+        """
+        Starts the background writer thread if it is not running.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                self.__queue = queue.SimpleQueue()
+                self.__thread = threading.Thread(
+                    target=self.__write_
+                    ,args=(self.__queue,self.__jsonPath)
+                    ,daemon=True
+                )
+                self.__thread.start()
+
+
+    def __write_(
+        self
+        ,messages
+        ,jsonPath
+        ):
+        """
+        Writes messages taken from the given queue until a stop marker is taken,
+        flushing output whenever the queue is empty.
+
+        Parameters
+        ----------
+        messages : object
+                   The queue of logged messages.
+        jsonPath : string
+                   The path of the JSON lines file or an empty string.
         """
-        if self.__echo:
-            print(time.strftime("[%D %H:%M:%S] ")+message)
+        jsonFile = open(jsonPath,"a") if jsonPath else None
+        try:
+            while True:
+                item = messages.get()
+                while item is not None:
+                    (t,level,message,fields) = item
+                    if self.__echo:
+                        prefix = time.strftime("[%D %H:%M:%S] ",time.localtime(t))
+                        if fields.get("assembly"):
+                            prefix += "("+fields["assembly"]+") "
+                        sys.stdout.write(prefix+message+"\n")
+                    if jsonFile is not None:
+                        record = {
+                            "time": round(t,3)
+                            ,"level": self.LEVEL_NAMES.get(level,str(level))
+                            ,"message": message
+                        }
+                        record.update(fields)
+                        jsonFile.write(json.dumps(record,default=str)+"\n")
+                    try:
+                        item = messages.get_nowait()
+                    except queue.Empty:
+                        break
+                sys.stdout.flush()
+                if jsonFile is not None:
+                    jsonFile.flush()
+                if item is None:
+                    break
+        finally:
+            if jsonFile is not None:
+                jsonFile.close()
@@ -0,0 +1,186 @@
+"""
+Contains the Metrics class.
+"""
+import atexit
+import os
+from . import settings
+import threading
+import time
+
+
+
+
+
+
+
+
+class Metrics():
+    """
+    This is the singleton metrics class. It keeps counters, gauges, and
+    summaries of crawl, mirror, and index progress and periodically writes them
+    in the Prometheus text format to the metrics path setting, where the
+    textfile collector of node_exporter can pick them up. The file is rewritten
+    at most once every metrics interval setting's seconds as metrics are updated
+    and once more when the application exits. If the metrics path setting is empty
+    then every update returns immediately. Parallel processes must be given
+    different metrics paths.
+    """
+    METRICS = {
+        "pynome_assemblies_pending": ("gauge","Assemblies queued for a phase and not yet done.")
+        ,"pynome_crawled_assemblies_total": ("counter","Assemblies found new, changed, or removed by crawls.")
+        ,"pynome_download_throughput_bytes_per_second": ("gauge","Average throughput of downloads.")
+        ,"pynome_downloaded_bytes_total": ("counter","Compressed bytes of downloaded data files.")
+        ,"pynome_download_seconds_total": ("counter","Seconds spent downloading data files.")
+        ,"pynome_task_duration_seconds": ("summary","Durations of completed tasks.")
+        ,"pynome_task_failures_total": ("counter","Failed tasks.")
+        ,"pynome_tasks_total": ("counter","Completed tasks.")
+    }
+
+
+    def __init__(
+        self
+        ):
+        """
+        Initializes the singleton metrics instance.
+        """
+        self.__values = {}
+        self.__written = 0.0
+        self.__lock = threading.Lock()
+        atexit.register(self.write)
+
+
+    def add(
+        self
+        ,name
+        ,value=1
+        ,**labels
+        ):
+        """
+        Adds the given value to the given counter or gauge metric.
+
+        Parameters
+        ----------
+        name : string
+               The name of the metric.
+        value : float
+                The value added to the metric.
+        labels : dictionary
+                 The label values of the metric's updated series.
+        """
+        if not settings.metricsPath:
+            return
+        key = (name,tuple(sorted(labels.items())))
+        with self.__lock:
+            self.__values[key] = self.__values.get(key,0)+value
+        self.__update_()
+
+
+    def download(
+        self
+        ,size
+        ,seconds
+        ):
+        """
+        Records a completed download of the given size and duration, updating
+        the download throughput.
+
+        Parameters
+        ----------
+        size : int
+               The number of downloaded bytes.
+        seconds : float
+                  The number of seconds the download took.
+        """
+        if not settings.metricsPath:
+            return
+        self.add("pynome_downloaded_bytes_total",size)
+        self.add("pynome_download_seconds_total",seconds)
+        with self.__lock:
+            total = self.__values.get(("pynome_download_seconds_total",()),0)
+            if total > 0:
+                self.__values[("pynome_download_throughput_bytes_per_second",())] = (
+                    self.__values.get(("pynome_downloaded_bytes_total",()),0)/total
+                )
+
+
+    def observe(
+        self
+        ,name
+        ,value
+        ,**labels
+        ):
+        """
+        Adds the given observed value to the given summary metric.
+
+        Parameters
+        ----------
+        name : string
+               The name of the metric.
+        value : float
+                The observed value.
+        labels : dictionary
+                 The label values of the metric's updated series.
+        """
+        if not settings.metricsPath:
+            return
+        key = (name,tuple(sorted(labels.items())))
+        with self.__lock:
+            (total,count) = self.__values.get(key,(0.0,0))
+            self.__values[key] = (total+value,count+1)
+        self.__update_()
+
+
+    def write(
+        self
+        ):
+        """
+        Atomically writes all metrics to the textfile at the metrics path
+        setting if it is not empty.
+        """
+        if not settings.metricsPath:
+            return
+        with self.__lock:
+            self.__write_()
+
+
+    def __write_(
+        self
+        ):
+        """
+        Atomically writes all metrics to the textfile at the metrics path
+        setting. The lock of this instance must be held.
+        """
+        self.__written = time.monotonic()
+        series = {}
+        for ((name,labels),value) in self.__values.items():
+            series.setdefault(name,[]).append((labels,value))
+        lines = []
+        for name in sorted(series):
+            (kind,text) = self.METRICS.get(name,("gauge",""))
+            if text:
+                lines.append("# HELP "+name+" "+text)
+            lines.append("# TYPE "+name+" "+kind)
+            for (labels,value) in sorted(series[name]):
+                tag = ""
+                if labels:
+                    tag = "{"+",".join(k+"=\""+str(v).replace("\"","'")+"\"" for (k,v) in labels)+"}"
+                if kind == "summary":
+                    lines.append(name+"_sum"+tag+" "+repr(float(value[0])))
+                    lines.append(name+"_count"+tag+" "+str(value[1]))
+                else:
+                    lines.append(name+tag+" "+repr(float(value)))
+        path = settings.metricsPath
+        with open(path+".tmp","w") as ofile:
+            ofile.write("\n".join(lines)+"\n")
+        os.replace(path+".tmp",path)
+
+
+    def __update_(
+        self
+        ):
+        """
+        Writes all metrics if the metrics interval setting's seconds passed
+        since they were last written.
+        """
+        if time.monotonic()-self.__written >= settings.metricsInterval:
+            self.write()
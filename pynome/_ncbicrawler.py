@@ -105,6 +105,7 @@ class NCBICrawler(interfaces.AbstractCrawler):
                         ,parts[6]
                         ,"ncbi"
                         ,{"fasta": fasta, "gff": gff, "gtf": gtf}
+                        ,parts[0]
                     )
 
 
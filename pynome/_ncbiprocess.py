@@ -2,6 +2,7 @@
 Contains the NCBIProcess class.
 """
 from . import interfaces
+from . import settings
 
 
 
@@ -17,21 +18,76 @@ class NCBIProcess(interfaces.AbstractProcess):
     NCBI.
     """
     DEPS = {
-        "index_hisat": ["download_fasta"]
+        "index_faidx": ["download_fasta"]
+        ,"index_hisat": ["download_fasta"]
+        ,"index_bowtie2": ["download_fasta"]
+        ,"index_bwamem2": ["download_fasta"]
+        ,"index_minimap2": ["download_fasta"]
+        ,"write_annotation": ["download_gff","download_gtf"]
         ,"write_gtf": ["download_gff"]
+        ,"index_star": ["download_fasta","write_gtf","download_gtf"]
         ,"write_splice_sites": ["write_gtf","download_gtf"]
         ,"write_cdna": ["write_gtf","download_gtf","download_fasta"]
         ,"index_salmon": ["write_cdna"]
         ,"index_kallisto": ["write_cdna"]
     }
     INPUTS = {
-        "index_hisat": [".fa"]
+        "index_faidx": [".fa"]
+        ,"index_hisat": [".fa"]
+        ,"index_bowtie2": [".fa"]
+        ,"index_bwamem2": [".fa"]
+        ,"index_minimap2": [".fa"]
+        ,"write_annotation": [".gff"]
         ,"write_gtf": [".gff"]
+        ,"index_star": [".fa",".gtf"]
         ,"write_splice_sites": [".gtf"]
         ,"write_cdna": [".fa",".gtf"]
         ,"index_salmon": [".cdna.fa"]
         ,"index_kallisto": [".cdna.fa"]
     }
+    TOOLS = {
+        "index_hisat": "hisat2"
+        ,"index_bowtie2": "bowtie2"
+        ,"index_bwamem2": "bwa-mem2"
+        ,"index_minimap2": "minimap2"
+        ,"index_star": "STAR"
+        ,"index_salmon": "salmon"
+        ,"index_kallisto": "kallisto"
+    }
+
+
+    def dataInputs(
+        self
+        ,taskName
+        ,data
+        ):
+        """
+        Implements the pynome.interfaces.AbstractProcess interface. The write
+        annotation task reads the downloaded Gtf file instead of the Gff file if
+        the assembly has a Gtf URL. The index star task only reads the Gtf file
+        if the assembly has a Gff or Gtf URL.
+
+        Parameters
+        ----------
+        taskName : object
+                   See interface docs.
+        data : object
+               See interface docs.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        if taskName == "write_annotation" and (data or {}).get("gtf",""):
+            return [".gtf"]
+        if (
+            taskName == "index_star"
+            and data is not None
+            and not (data.get("gff","") or data.get("gtf",""))
+        ):
+            return [".fa"]
+        return self.taskInputs(taskName)
 
 
     def indexTasks(
@@ -46,9 +102,15 @@ class NCBIProcess(interfaces.AbstractProcess):
                See interface docs.
         """
         return (
-            "index_hisat"
+            "index_faidx"
+            ,"index_hisat"
+            ,"write_annotation"
             ,"write_gtf"
             ,"write_splice_sites"
+            ,"index_star"
+            ,"index_bowtie2"
+            ,"index_bwamem2"
+            ,"index_minimap2"
             ,"write_cdna"
             ,"index_salmon"
             ,"index_kallisto"
@@ -84,6 +146,53 @@ class NCBIProcess(interfaces.AbstractProcess):
 
 
     def taskInputs(
+        self
+        ,taskName
+        ):
+        """
+        Implements the pynome.interfaces.AbstractProcess interface. Salmon
+        indexes also read the genome Fasta file if salmon decoys are enabled.
+
+        Parameters
+        ----------
+        taskName : object
+                   See interface docs.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        ret = self.INPUTS.get(taskName,[])
+        if taskName == "index_salmon" and settings.salmonDecoys:
+            ret = ret+[".fa"]
+        return ret
+
+
+    def taskOptions(
+        self
+        ,taskName
+        ):
+        """
+        Implements the pynome.interfaces.AbstractProcess interface. Salmon
+        indexes depend on the salmon decoys setting.
+
+        Parameters
+        ----------
+        taskName : object
+                   See interface docs.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        if taskName == "index_salmon":
+            return {"decoys": settings.salmonDecoys}
+        return {}
+
+
+    def taskTool(
         self
         ,taskName
         ):
@@ -100,7 +209,7 @@ class NCBIProcess(interfaces.AbstractProcess):
         ret0 : object
                See interface docs.
         """
-        return self.INPUTS.get(taskName,[])
+        return self.TOOLS.get(taskName)
 
 
     def taskSources(
@@ -108,7 +217,9 @@ class NCBIProcess(interfaces.AbstractProcess):
         ,taskName
         ):
         """
-        Implements the pynome.interfaces.AbstractProcess interface.
+        Implements the pynome.interfaces.AbstractProcess interface. Salmon
+        indexes also depend on the genome Fasta download if salmon decoys are
+        enabled.
 
         Parameters
         ----------
@@ -120,4 +231,7 @@ class NCBIProcess(interfaces.AbstractProcess):
         ret0 : object
                See interface docs.
         """
-        return self.DEPS.get(taskName,[])
+        ret = self.DEPS.get(taskName,[])
+        if taskName == "index_salmon" and settings.salmonDecoys:
+            ret = ret+["download_fasta"]
+        return ret
@@ -0,0 +1,85 @@
+"""
+Contains the Readers class.
+"""
+import fnmatch
+import json
+import os
+from . import settings
+
+
+
+
+
+
+
+
+class Readers():
+    """
+    This is the singleton readers class. It loads the reader manifests of the
+    local database and counts how many of them reference any given index
+    directory. A reader manifest is a JSON file within the special hidden
+    ".readers" directory of the root path, written by any pipeline that reads
+    indexes from the local database. Its "indexes" key is a list of index paths
+    relative to the root path, which may contain shell style wildcards such as
+    "*/*/hisat-2.1.0".
+    """
+    DIR_NAME = ".readers"
+
+
+    def __init__(
+        self
+        ):
+        """
+        Initializes the singleton readers instance.
+        """
+        self.__manifests = None
+
+
+    def references(
+        self
+        ,path
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        path : string
+               The full path of an index directory.
+
+        Returns
+        -------
+        ret0 : int
+               The number of reader manifests that reference the given index
+               directory.
+        """
+        if self.__manifests is None:
+            self.reload()
+        path = os.path.relpath(path,settings.rootPath)
+        ret = 0
+        for patterns in self.__manifests.values():
+            if any(fnmatch.fnmatchcase(path,p) for p in patterns):
+                ret += 1
+        return ret
+
+
+    def reload(
+        self
+        ):
+        """
+        Loads all reader manifests from the local database, replacing any
+        previously loaded ones. Manifests that cannot be parsed are ignored.
+        """
+        self.__manifests = {}
+        d = os.path.join(settings.rootPath,self.DIR_NAME)
+        if not os.path.isdir(d):
+            return
+        for p in os.listdir(d):
+            if not p.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(d,p),"r") as ifile:
+                    manifest = json.loads(ifile.read())
+            except (OSError,ValueError):
+                continue
+            self.__manifests[p] = [os.path.normpath(x) for x in manifest.get("indexes",[])]
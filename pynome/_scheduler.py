@@ -0,0 +1,274 @@
+"""
+Contains the Scheduler class.
+"""
+import contextlib
+from . import core
+import os
+import queue
+import threading
+import traceback
+
+
+
+
+
+
+
+
+class Scheduler():
+    """
+    This is the scheduler class. It mirrors and indexes local assemblies as a
+    pipeline instead of in separate global phases. Assemblies are mirrored by a
+    bounded pool of network workers and each one is queued for indexing by a
+    separate bounded pool of CPU workers the moment its downloads complete, so
+    downloads and index builds of different assemblies overlap. Both pools take
+    the queued assembly with the highest priority first and then the one with
+    the lowest estimated cost. A failure of one assembly is logged and never
+    stops the others. Index tasks of concurrently indexed assemblies only run
+    alongside each other while the sums of the threads and memory of their
+    resource hints fit within the scheduler's budgets, so a large STAR build
+    holds back other builds while small ones share the CPUs. A task whose
+    hints exceed a budget on their own runs once no other task is running.
+    """
+
+
+    def __init__(
+        self
+        ,networkJobs=4
+        ,cpuJobs=1
+        ,threads=0
+        ,memory=0.0
+        ):
+        """
+        Initializes a new scheduler.
+
+        Parameters
+        ----------
+        networkJobs : int
+                      The number of assemblies mirrored at the same time.
+        cpuJobs : int
+                  The number of assemblies indexed at the same time.
+        threads : int
+                  The budget of threads of concurrently running index tasks or
+                  0 for no limit.
+        memory : float
+                 The budget of gigabytes of memory of concurrently running index
+                 tasks or 0 for no limit.
+        """
+        super().__init__()
+        self.__networkJobs = max(1,networkJobs)
+        self.__cpuJobs = max(1,cpuJobs)
+        self.__threads = threads
+        self.__memory = memory
+        self.__held = [0,0,0.0]
+        self.__condition = threading.Condition()
+        self.__network = queue.PriorityQueue()
+        self.__cpu = queue.PriorityQueue()
+        self.__results = {}
+        self.__lock = threading.Lock()
+        self.__count = 0
+
+
+    @contextlib.contextmanager
+    def hold(
+        self
+        ,resources
+        ):
+        """
+        Waits until the given resources fit within this scheduler's budgets
+        alongside those of all other running index tasks and holds them until
+        the returned context exits.
+
+        Parameters
+        ----------
+        resources : dictionary
+                    The resource hints of an index task, holding its number of
+                    "threads" and estimated gigabytes of "memory".
+
+        Returns
+        -------
+        ret0 : object
+               The context manager holding the given resources.
+        """
+        threads = resources.get("threads",1)
+        memory = resources.get("memory",0.0)
+        with self.__condition:
+            while self.__held[0] and not self.__fits_(threads,memory):
+                self.__condition.wait()
+            self.__held = [self.__held[0]+1,self.__held[1]+threads,self.__held[2]+memory]
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__held = [self.__held[0]-1,self.__held[1]-threads,self.__held[2]-memory]
+                self.__condition.notify_all()
+
+
+    def run(
+        self
+        ,mirrored
+        ,indexed=()
+        ):
+        """
+        Mirrors and then indexes the given assemblies, and only indexes the
+        given other assemblies, returning once all of them are done.
+
+        Parameters
+        ----------
+        mirrored : list
+                   Data directories, excluding the root directory path, of the
+                   assemblies that are mirrored and then indexed.
+        indexed : list
+                  Data directories of the assemblies that are only indexed.
+
+        Returns
+        -------
+        ret0 : dictionary
+               True for every mirrored assembly whose mirror tasks all succeeded
+               or false otherwise, keyed by data directory.
+        """
+        self.__results = {}
+        for dataDir in mirrored:
+            self.__put_(self.__network,dataDir,"mirror")
+        for dataDir in indexed:
+            self.__put_(self.__cpu,dataDir,"index")
+        networkWorkers = [
+            threading.Thread(target=self.__work_,args=(self.__network,self.__mirror_,"mirror"))
+            for i in range(self.__networkJobs)
+        ]
+        cpuWorkers = [
+            threading.Thread(target=self.__work_,args=(self.__cpu,self.__index_,"index"))
+            for i in range(self.__cpuJobs)
+        ]
+        for worker in networkWorkers+cpuWorkers:
+            worker.start()
+        for worker in networkWorkers:
+            self.__network.put(((float("inf"),),0,None))
+        for worker in networkWorkers:
+            worker.join()
+        for worker in cpuWorkers:
+            self.__cpu.put(((float("inf"),),0,None))
+        for worker in cpuWorkers:
+            worker.join()
+        return self.__results
+
+
+    def __fits_(
+        self
+        ,threads
+        ,memory
+        ):
+        """
+        Getter method. The condition of this scheduler must be held.
+
+        Parameters
+        ----------
+        threads : int
+                  The number of threads of an index task.
+        memory : float
+                 The estimated gigabytes of memory of an index task.
+
+        Returns
+        -------
+        ret0 : bool
+               True if the given resources fit within this scheduler's budgets
+               alongside those of all running index tasks or false otherwise.
+        """
+        return (
+            (not self.__threads or self.__held[1]+threads <= self.__threads)
+            and (not self.__memory or self.__held[2]+memory <= self.__memory)
+        )
+
+
+    def __index_(
+        self
+        ,dataDir
+        ):
+        """
+        Indexes the assembly with the given data directory, holding the
+        resources of each of its index tasks while it runs.
+
+        Parameters
+        ----------
+        dataDir : string
+                  The data directory of the indexed assembly.
+        """
+        (taxId,name) = os.path.split(dataDir)
+        core.assembly.index(taxId,name,self)
+
+
+    def __mirror_(
+        self
+        ,dataDir
+        ):
+        """
+        Mirrors the assembly with the given data directory and then queues it
+        for indexing.
+
+        Parameters
+        ----------
+        dataDir : string
+                  The data directory of the mirrored assembly.
+        """
+        ok = False
+        try:
+            ok = core.assembly.mirrorAssembly(dataDir)
+        finally:
+            self.__results[dataDir] = ok
+            self.__put_(self.__cpu,dataDir,"index")
+
+
+    def __put_(
+        self
+        ,jobs
+        ,dataDir
+        ,phase
+        ):
+        """
+        Adds the given assembly to the given job queue, ranked by its priority
+        and estimated cost, and counts it as pending for the given phase.
+
+        Parameters
+        ----------
+        jobs : object
+               The priority queue of network or CPU jobs.
+        dataDir : string
+                  The data directory of the queued assembly.
+        phase : string
+                The phase of the job queue, "mirror" or "index".
+        """
+        core.metrics.add("pynome_assemblies_pending",phase=phase)
+        rank = core.assembly.rank(*os.path.split(dataDir))
+        with self.__lock:
+            self.__count += 1
+            jobs.put((rank,self.__count,dataDir))
+
+
+    def __work_(
+        self
+        ,jobs
+        ,function
+        ,phase
+        ):
+        """
+        Runs the given function on every assembly taken from the given job
+        queue until a stop marker is taken.
+
+        Parameters
+        ----------
+        jobs : object
+               The priority queue of network or CPU jobs.
+        function : object
+                   The function called with the data directory of each job.
+        phase : string
+                The phase of the job queue, "mirror" or "index".
+        """
+        while True:
+            (rank,count,dataDir) = jobs.get()
+            if dataDir is None:
+                break
+            try:
+                function(dataDir)
+            except Exception:
+                core.log.send(traceback.format_exc().strip(),core.Log.ERROR,assembly=dataDir)
+            core.metrics.add("pynome_assemblies_pending",-1,phase=phase)
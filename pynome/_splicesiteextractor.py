@@ -0,0 +1,197 @@
+"""
+Contains the SpliceSiteExtractor class.
+"""
+import os
+
+
+
+
+
+
+
+
+class SpliceSiteExtractor():
+    """
+    This is the splice site extractor class. It extracts the splice sites and
+    exons of a GTF file, producing output byte identical to the
+    "hisat2_extract_splice_sites.py" and "hisat2_extract_exons.py" scripts. The
+    GTF file is read in a single streaming pass, buffering the exons of only one
+    sequence at a time. If a transcript reappears after its sequence was
+    released, because the file is not grouped by sequence, the extraction is
+    restarted with every transcript buffered until the end of the file.
+    Transcripts can also be added directly, which lets another annotation pass
+    feed this extractor without writing and reparsing a GTF file.
+    """
+
+
+    def __init__(
+        self
+        ):
+        """
+        Initializes a new splice site extractor.
+        """
+        super().__init__()
+        self.__junctions = set()
+        self.__exons = set()
+
+
+    def addTranscript(
+        self
+        ,chrom
+        ,strand
+        ,exons
+        ):
+        """
+        Adds the splice sites and exons of the given transcript to this
+        extractor. Exons separated by introns of 5 bases or less are merged.
+
+        Parameters
+        ----------
+        chrom : string
+                The sequence name of the transcript.
+        strand : string
+                 The strand of the transcript.
+        exons : list
+                Lists of the one based inclusive start and end positions of
+                every exon of the transcript.
+        """
+        exons.sort()
+        merged = [exons[0]]
+        for i in range(1,len(exons)):
+            if exons[i][0]-merged[-1][1] <= 5:
+                merged[-1][1] = exons[i][1]
+            else:
+                merged.append(exons[i])
+        for i in range(len(merged)):
+            self.__exons.add((chrom,merged[i][0],merged[i][1],strand))
+            if i:
+                self.__junctions.add((chrom,merged[i-1][1],merged[i][0],strand))
+
+
+    def clear(
+        self
+        ):
+        """
+        Removes all splice sites and exons added to this extractor.
+        """
+        self.__junctions = set()
+        self.__exons = set()
+
+
+    def extract(
+        self
+        ,gtfPath
+        ):
+        """
+        Adds the splice sites and exons of all transcripts within the given GTF
+        file to this extractor.
+
+        Parameters
+        ----------
+        gtfPath : string
+                  The full path of the GTF file that is read.
+        """
+        junctions = set(self.__junctions)
+        exons = set(self.__exons)
+        if not self.__extract_(gtfPath,True):
+            self.__junctions = junctions
+            self.__exons = exons
+            self.__extract_(gtfPath,False)
+
+
+    def write(
+        self
+        ,splicePath
+        ,exonPath=None
+        ):
+        """
+        Writes the sorted splice sites, and optionally exons, of this extractor
+        with zero based positions. Each file is written to a temporary path
+        first and then moved into place.
+
+        Parameters
+        ----------
+        splicePath : string
+                     The full path of the splice sites file that is written.
+        exonPath : string
+                   The full path of the exons file that is written or None to
+                   not write exons.
+        """
+        for (path,rows) in ((splicePath,self.__junctions),(exonPath,self.__exons)):
+            if path is None:
+                continue
+            tmpPath = path+".tmp"
+            try:
+                with open(tmpPath,"w",buffering=1<<20) as ofile:
+                    for (chrom,left,right,strand) in sorted(rows):
+                        ofile.write("{}\t{}\t{}\t{}\n".format(chrom,left-1,right-1,strand))
+                os.replace(tmpPath,path)
+            finally:
+                if os.path.exists(tmpPath):
+                    os.remove(tmpPath)
+
+
+    def __extract_(
+        self
+        ,gtfPath
+        ,byChrom
+        ):
+        """
+        Adds the splice sites and exons of all transcripts within the given GTF
+        file to this extractor.
+
+        Parameters
+        ----------
+        gtfPath : string
+                  The full path of the GTF file that is read.
+        byChrom : bool
+                  True to release buffered transcripts whenever the sequence
+                  name changes or false to buffer all of them until the end of
+                  the file.
+
+        Returns
+        -------
+        ret0 : bool
+               True on success or false if releasing by sequence name was
+               enabled and a released transcript reappeared.
+        """
+        trans = {}
+        released = set()
+        last = None
+        with open(gtfPath,"r") as ifile:
+            for line in ifile:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if "#" in line:
+                    line = line.split("#")[0].strip()
+                try:
+                    (chrom,source,feature,left,right,score,strand,frame,values) = line.split("\t")
+                except ValueError:
+                    continue
+                (left,right) = (int(left),int(right))
+                if feature != "exon" or left >= right:
+                    continue
+                valuesDict = {}
+                for attr in values.split(";"):
+                    if attr:
+                        (attr,_,val) = attr.strip().partition(" ")
+                        valuesDict[attr] = val.strip('"')
+                if "gene_id" not in valuesDict or "transcript_id" not in valuesDict:
+                    continue
+                if byChrom and chrom != last:
+                    for (c,s,e) in trans.values():
+                        self.addTranscript(c,s,e)
+                    released.update(trans)
+                    trans = {}
+                    last = chrom
+                transcriptId = valuesDict["transcript_id"]
+                if transcriptId not in trans:
+                    if transcriptId in released:
+                        return False
+                    trans[transcriptId] = [chrom,strand,[[left,right]]]
+                else:
+                    trans[transcriptId][2].append([left,right])
+        for (c,s,e) in trans.values():
+            self.addTranscript(c,s,e)
+        return True
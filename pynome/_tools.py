@@ -0,0 +1,205 @@
+"""
+Contains the Tools class.
+"""
+from . import core
+import json
+import os
+import re
+from . import settings
+import shutil
+import subprocess
+
+
+
+
+
+
+
+
+class Tools():
+    """
+    This is the singleton tools class. It resolves the binaries and versions of
+    all external tools used by tasks, spawning each tool's version command at
+    most once per process. Resolved versions are optionally persisted to a
+    special hidden JSON file in the root path, where they stay valid for as long
+    as the resolved binary's path, size, and modification time do not change.
+    """
+    CACHE_NAME = ".tools.json"
+
+
+    def __init__(
+        self
+        ):
+        """
+        Initializes the singleton tools instance.
+        """
+        self.__specs = {}
+        self.__versions = {}
+        self.__cache = None
+        self.register("bowtie2",["--version"],binary="bowtie2-build")
+        self.register("bwa-mem2",["version"])
+        self.register("hisat2",["--version"])
+        self.register("kallisto",["version"])
+        self.register("minimap2",["--version"],"^\\d+\\.\\d+(-r\\d+)?$")
+        self.register("salmon",["--version"])
+        self.register("STAR",["--version"],"^\\d+\\.\\d+\\.\\d+[a-z]?$")
+
+
+    def path(
+        self
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        name : string
+               The name of a registered tool.
+
+        Returns
+        -------
+        ret0 : string
+               The full path of the given tool's binary or None if it is not
+               installed.
+        """
+        ret = shutil.which(self.__specs[name][0])
+        return os.path.realpath(ret) if ret else None
+
+
+    def register(
+        self
+        ,name
+        ,args
+        ,pattern="^\d+\.\d+\.\d+$"
+        ,binary=None
+        ):
+        """
+        Registers a new external tool whose version can be resolved.
+
+        Parameters
+        ----------
+        name : string
+               The unique name of the registered tool.
+        args : list
+               Arguments passed to the tool's binary that makes it print its
+               version as the last word of a line of its output. The first
+               line whose last word matches the given pattern is used.
+        pattern : string
+                  Regular expression a valid version of the tool must match.
+        binary : string
+                 The binary name of the tool or None to use its name.
+        """
+        self.__specs[name] = (binary or name,list(args),pattern)
+        self.__versions.pop(name,None)
+
+
+    def version(
+        self
+        ,name
+        ):
+        """
+        Getter method.
+
+        Parameters
+        ----------
+        name : string
+               The name of a registered tool.
+
+        Returns
+        -------
+        ret0 : string
+               The version of the given tool or None if it is not installed or
+               its version output cannot be parsed, in which case a warning is
+               logged and the tool is treated as unavailable.
+        """
+        if name in self.__versions:
+            return self.__versions[name]
+        path = self.path(name)
+        ret = None
+        if path:
+            st = os.stat(path)
+            stamp = [path,st.st_size,st.st_mtime_ns]
+            entry = self.__loadCache_().get(name,{})
+            if entry.get("stamp") == stamp:
+                ret = entry["version"]
+            else:
+                (binary,args,pattern) = self.__specs[name]
+                output = subprocess.run(
+                    [path]+args
+                    ,stdout=subprocess.PIPE
+                    ,stderr=subprocess.STDOUT
+                ).stdout.decode()
+                words = [l.split()[-1] for l in output.split("\n") if l.strip()]
+                ret = next((w for w in words if re.match(pattern,w)),None)
+                if ret is None:
+                    core.log.send(
+                        "Cannot parse the version of "+name+" at "+path+"; treating it as not installed."
+                        ,core.Log.WARNING
+                    )
+                else:
+                    self.__saveCache_(name,{"stamp": stamp, "version": ret})
+        self.__versions[name] = ret
+        return ret
+
+
+    def __loadCache_(
+        self
+        ):
+        """
+        Getter method.
+
+        Returns
+        -------
+        ret0 : dictionary
+               The persisted version cache of the root path, loaded once per
+               process, or an empty dictionary if persisting is disabled or no
+               valid cache exists.
+        """
+        if self.__cache is None:
+            self.__cache = {}
+            path = os.path.join(settings.rootPath,self.CACHE_NAME)
+            if settings.toolCache and os.path.isfile(path):
+                try:
+                    with open(path,"r") as ifile:
+                        self.__cache = json.loads(ifile.read())
+                except (OSError,ValueError):
+                    pass
+        return self.__cache
+
+
+    def __saveCache_(
+        self
+        ,name
+        ,entry
+        ):
+        """
+        Adds the given entry to the persisted version cache, merging it with
+        entries other jobs may have written since it was loaded and atomically
+        replacing the cache file so concurrent jobs never read a partial file.
+
+        Parameters
+        ----------
+        name : string
+               The tool name of the added entry.
+        entry : dictionary
+                The binary stamp and resolved version of the given tool.
+        """
+        self.__loadCache_()[name] = entry
+        if not settings.toolCache or not os.path.isdir(settings.rootPath):
+            return
+        path = os.path.join(settings.rootPath,self.CACHE_NAME)
+        tmpPath = path+"."+str(os.getpid())
+        cache = {}
+        try:
+            with open(path,"r") as ifile:
+                cache = json.loads(ifile.read())
+        except (OSError,ValueError):
+            pass
+        cache[name] = entry
+        try:
+            with open(tmpPath,"w") as ofile:
+                ofile.write(json.dumps(cache,indent=4)+"\n")
+            os.replace(tmpPath,path)
+        except OSError:
+            pass
@@ -0,0 +1,106 @@
+"""
+Contains the TranscriptExtractor class.
+"""
+from ._fastaindex import FastaIndex
+import os
+
+
+
+
+
+
+
+
+class TranscriptExtractor():
+    """
+    This is the transcript extractor class. It writes the spliced sequences of
+    all transcripts of a GTF file, like "gffread -w", from a genome FASTA file.
+    The genome is accessed through its persisted FASTA index. Transcripts are
+    grouped by sequence and visited in the order their sequences appear in the
+    genome, and by start position within each sequence, so the memory mapped
+    genome is read sequentially. Output is written in large buffered chunks.
+    """
+    __COMPLEMENT = bytes.maketrans(
+        b"ACGTUMRWSYKVHDBNacgtumrwsykvhdbn"
+        ,b"TGCAAKYWSRMBDHVNtgcaakywsrmbdhvn"
+    )
+    __LINE_WIDTH = 70
+
+
+    def __init__(
+        self
+        ,gtfPath
+        ):
+        """
+        Initializes a new transcript extractor, loading the exons of all
+        transcripts of the given GTF file.
+
+        Parameters
+        ----------
+        gtfPath : string
+                  The full path of the GTF file whose transcripts are extracted.
+        """
+        super().__init__()
+        self.__transcripts = {}
+        with open(gtfPath,"r") as ifile:
+            for line in ifile:
+                if line[0] == "#":
+                    continue
+                parts = line.rstrip("\r\n").split("\t")
+                if len(parts) != 9 or parts[2] != "exon":
+                    continue
+                i = parts[8].find("transcript_id")
+                if i == -1:
+                    continue
+                tid = parts[8][i+13:].split(";",1)[0].strip().strip('"')
+                transcript = self.__transcripts.get(tid)
+                if transcript is None:
+                    transcript = (parts[0],parts[6],[])
+                    self.__transcripts[tid] = transcript
+                transcript[2].append((int(parts[3]),int(parts[4])))
+
+
+    def write(
+        self
+        ,fastaPath
+        ,outPath
+        ):
+        """
+        Writes the sequences of all transcripts of this extractor to the given
+        FASTA file, atomically replacing it once complete. Transcripts on
+        sequences missing from the genome are skipped.
+
+        Parameters
+        ----------
+        fastaPath : string
+                    The full path of the genome FASTA file that is read.
+        outPath : string
+                  The full path of the transcript FASTA file that is written.
+
+        Returns
+        -------
+        ret0 : int
+               The number of transcripts written.
+        """
+        groups = {}
+        for (tid,(chrom,strand,exons)) in self.__transcripts.items():
+            exons.sort()
+            groups.setdefault(chrom,[]).append((exons[0][0],tid))
+        ret = 0
+        tmpPath = outPath+".tmp"
+        try:
+            with FastaIndex(fastaPath) as index, open(tmpPath,"wb",buffering=1<<22) as ofile:
+                for chrom in index.names():
+                    for (start,tid) in sorted(groups.get(chrom,[])):
+                        (_,strand,exons) = self.__transcripts[tid]
+                        seq = b"".join(index.fetch(chrom,s,e) for (s,e) in exons)
+                        if strand == "-":
+                            seq = seq.translate(self.__COMPLEMENT)[::-1]
+                        lines = [seq[i:i+self.__LINE_WIDTH] for i in range(0,len(seq),self.__LINE_WIDTH)]
+                        ofile.write(b">"+tid.encode()+b"\n"+b"\n".join(lines)+b"\n")
+                        ret += 1
+            os.replace(tmpPath,outPath)
+        finally:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+        return ret
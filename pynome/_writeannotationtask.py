@@ -0,0 +1,80 @@
+"""
+Contains the WriteAnnotationTask class.
+"""
+from . import annotation
+from . import interfaces
+import os
+from . import settings
+
+
+
+
+
+
+
+
+class WriteAnnotationTask(interfaces.AbstractTask):
+    """
+    This is the write annotation task. It implements the abstract task
+    interface. This writes the local Gtf, splice sites, and exons files with a
+    single read of the local annotation, providing the outputs of both the write
+    Gtf and write splice sites tasks. If the Gtf URL entry in the metadata is
+    not empty then the downloaded Gtf file is read instead of converting the
+    local Gff file.
+    """
+
+
+    def __call__(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        basePath = os.path.join(self._workDir_(),self._rootName_())
+        extractor = annotation.SpliceSiteExtractor()
+        if self._meta_().get("gtf",""):
+            if not os.path.isfile(basePath+".gtf"):
+                return False
+            self._log_("Writing Splice sites from GTF")
+            extractor.extract(basePath+".gtf")
+        else:
+            if not os.path.isfile(basePath+".gff"):
+                return False
+            self._log_("Writing GTF and Splice sites from GFF")
+            converter = annotation.GtfConverter(settings.gtfCompatible)
+            converter.convert(basePath+".gff",basePath+".gtf",extractor)
+        extractor.write(basePath+".Splice_sites",basePath+".exons")
+        return True
+
+
+    def name(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return "write_annotation"
+
+
+    def provides(
+        self
+        ):
+        """
+        Implements the pynome.interfaces.AbstractTask interface.
+
+        Returns
+        -------
+        ret0 : object
+               See interface docs.
+        """
+        return ["write_annotation","write_gtf","write_splice_sites"]
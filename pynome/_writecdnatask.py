@@ -3,7 +3,7 @@ Contains the WriteCDNATask class.
 """
 from . import interfaces
 import os
-import subprocess
+from . import sequence
 
 
 
@@ -15,7 +15,9 @@ import subprocess
 class WriteCDNATask(interfaces.AbstractTask):
     """
     This is the write CDNA task. It implements the abstract task interface. This
-    writes the local CDNA Fasta file with gffread.
+    writes the local CDNA Fasta file by extracting the transcripts of the local
+    Gtf file from the local Fasta file. The Fasta index built for this is kept
+    for other consumers.
     """
 
 
@@ -34,16 +36,8 @@ class WriteCDNATask(interfaces.AbstractTask):
         if not os.path.isfile(basePath+".fa") or not os.path.isfile(basePath+".gtf"):
             return False
         self._log_("Writing CDNA from GTF")
-        try:
-            cmd = ["gffread","-w",basePath+".cdna.fa","-g",basePath+".fa",basePath+".gtf"]
-            assert(subprocess.run(cmd,capture_output=True).returncode==0)
-        except BaseException as e:
-            cmd = ["rm","-fr",basePath+".cdna.fa"]
-            subprocess.run(cmd)
-            raise e
-        finally:
-            cmd = ["rm","-fr",basePath+".fa.fai"]
-            subprocess.run(cmd)
+        extractor = sequence.TranscriptExtractor(basePath+".gtf")
+        extractor.write(basePath+".fa",basePath+".cdna.fa")
         return True
 
 
@@ -1,9 +1,10 @@
 """
 Contains the WriteGtfTask class.
 """
+from . import annotation
 from . import interfaces
 import os
-import subprocess
+from . import settings
 
 
 
@@ -15,8 +16,9 @@ import subprocess
 class WriteGtfTask(interfaces.AbstractTask):
     """
     This is the write Gtf task. It implements the abstract task interface. This
-    writes the local Gtf file with gffread. If the Gtf URL entry in the metadata
-    is not empty then this does nothing.
+    writes the local Gtf file by streaming the local Gff file through the GTF
+    converter. If the Gtf URL entry in the metadata is not empty then this does
+    nothing.
     """
 
 
@@ -37,13 +39,7 @@ class WriteGtfTask(interfaces.AbstractTask):
         if self._meta_().get("gtf",""):
             return True
         self._log_("Writing GTF from GFF")
-        tPath = os.path.join(self._workDir_(),"temp.gff")
-        cmd = ["cp",basePath+".gff",tPath]
-        assert(subprocess.run(cmd).returncode==0)
-        cmd = ["gffread","-T",tPath,"-o",basePath+".gtf"]
-        assert(subprocess.run(cmd).returncode==0)
-        cmd = ["rm",tPath]
-        assert(subprocess.run(cmd).returncode==0)
+        annotation.GtfConverter(settings.gtfCompatible).convert(basePath+".gff",basePath+".gtf")
         return True
 
 
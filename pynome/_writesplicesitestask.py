@@ -1,9 +1,9 @@
 """
 Contains the WriteSpliceSitesTask class.
 """
+from . import annotation
 from . import interfaces
 import os
-import subprocess
 
 
 
@@ -15,7 +15,9 @@ import subprocess
 class WriteSpliceSitesTask(interfaces.AbstractTask):
     """
     This is the write splice sites task. It implements the abstract task
-    interface. This writes the local splice sites file with gffread.
+    interface. This writes the local splice sites and exons files from the local
+    Gtf file in a single pass, for use with the splice site and exon options of
+    hisat2-build.
     """
 
 
@@ -33,10 +35,10 @@ class WriteSpliceSitesTask(interfaces.AbstractTask):
         basePath = os.path.join(self._workDir_(),self._rootName_())
         if not os.path.isfile(basePath+".gtf"):
             return False
-        with open(basePath+".Splice_sites",'w') as ofile:
-            self._log_("Writing Spice sites from GTF")
-            cmd = ['hisat2_extract_splice_sites.py',basePath+".gtf"]
-            assert(subprocess.run(cmd,stdout=ofile).returncode==0)
+        self._log_("Writing Splice sites from GTF")
+        extractor = annotation.SpliceSiteExtractor()
+        extractor.extract(basePath+".gtf")
+        extractor.write(basePath+".Splice_sites",basePath+".exons")
         return True
 
 
@@ -0,0 +1,6 @@
+"""
+Contains all annotation conversion and extraction implementations.
+"""
+
+from ._gtfconverter import GtfConverter
+from ._splicesiteextractor import SpliceSiteExtractor
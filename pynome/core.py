@@ -1,9 +1,17 @@
 """
-Contains all core classes, functions, and objects of this application.
+Contains all core classes, functions, and objects of this application. The
+journal, metrics, and scheduler classes and singletons are only imported when
+first used, because the per-assembly index jobs launched by every sweep never
+use the journal or scheduler.
 """
 
 from ._assembly import Assembly
+from ._indexdir import IndexDir
 from ._log import Log
+from ._readers import Readers
+from ._tools import Tools
+import importlib
+import threading
 
 
 
@@ -14,3 +22,44 @@ from ._log import Log
 
 assembly = Assembly()
 log = Log()
+readers = Readers()
+tools = Tools()
+_LAZY = {
+    "Journal": ("._journal",None)
+    ,"Metrics": ("._metrics",None)
+    ,"Scheduler": ("._scheduler",None)
+    ,"journal": ("._journal","Journal")
+    ,"metrics": ("._metrics","Metrics")
+}
+_lock = threading.Lock()
+
+
+
+
+def __getattr__(
+    name
+    ):
+    """
+    Getter function called for any attribute of this module that is not yet
+    defined. It imports the journal, metrics, and scheduler classes and creates
+    the journal and metrics singletons the first time they are used. This is
+    safe to call from concurrent threads.
+
+    Parameters
+    ----------
+    name : string
+           The name of the module attribute.
+
+    Returns
+    -------
+    ret0 : object
+           The class or singleton with the given name.
+    """
+    if name not in _LAZY:
+        raise AttributeError("module '"+__name__+"' has no attribute '"+name+"'")
+    with _lock:
+        if name not in globals():
+            (module,cls) = _LAZY[name]
+            module = importlib.import_module(module,__package__)
+            globals()[name] = getattr(module,cls)() if cls else getattr(module,name)
+    return globals()[name]
@@ -9,9 +9,62 @@ Contains all custom exception classes for this application.
 
 
 
+class BuildError(Exception):
+    """
+    This is the build error exception. This represents a built index or data
+    file that failed validation and was therefore not published.
+    """
+    pass
+
+
+
+
 class RegisterError(Exception):
     """
     This is the register error exception. This represents an error in
     registering a new crawler or mirror implementation.
     """
     pass
+
+
+
+
+class TaskError(Exception):
+    """
+    This is the task error exception. This represents an external command run
+    by a task that exited with a non-zero status or was killed because it did
+    not finish in time. The exit code and the end of the command's standard
+    error output are kept for the failure ledger.
+    """
+
+
+    def __init__(
+        self
+        ,cmd
+        ,returncode
+        ,stderr=""
+        ,timeout=None
+        ):
+        """
+        Initializes a new task error.
+
+        Parameters
+        ----------
+        cmd : list
+              The failed command line.
+        returncode : int
+                     The exit code of the failed command.
+        stderr : string
+                 The end of the failed command's standard error output.
+        timeout : float
+                  The number of seconds after which the failed command was
+                  killed or None if it exited by itself.
+        """
+        if timeout is None:
+            message = "'"+" ".join(cmd)+"' exited with status "+str(returncode)
+        else:
+            message = "'"+" ".join(cmd)+"' timed out after %gs"%(timeout,)
+        super().__init__(message)
+        self.returncode = returncode
+        self.stderr = stderr
+        self.timeout = timeout
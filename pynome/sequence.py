@@ -0,0 +1,8 @@
+"""
+Contains all sequence file implementations.
+"""
+
+from ._bgzfinflater import BgzfInflater
+from ._fastaindex import FastaIndex
+from ._fifofeeder import FifoFeeder
+from ._transcriptextractor import TranscriptExtractor
@@ -13,3 +13,40 @@ import os
 JOB_NAME = "pynome_work_%05d.txt"
 cpuCount = os.cpu_count()
 rootPath = os.path.join(os.path.expanduser("~"),"species")
+indexGrace = 86400
+memoryBudget = 0
+networkJobs = 4
+cpuJobs = 1
+priorities = {}
+metricsPath = ""
+metricsInterval = 15
+failureBackoff = 3600
+failureBackoffMax = 7*86400
+stderrTail = 4096
+timeoutBase = 2*3600
+timeoutScale = 4.0
+taskTimeout = {}
+indexRetain = 2
+retireGrace = 30*86400
+retireLimit = 0.5
+retireArchive = ""
+toolCache = True
+taskCost = {
+    "index_bowtie2": 8.0
+    ,"index_bwamem2": 6.0
+    ,"index_faidx": 0.1
+    ,"index_hisat": 4.0
+    ,"index_kallisto": 0.5
+    ,"index_minimap2": 0.5
+    ,"index_salmon": 4.0
+    ,"index_star": 6.0
+    ,"write_annotation": 0.1
+    ,"write_cdna": 0.05
+    ,"write_gtf": 0.05
+    ,"write_splice_sites": 0.05
+}
+gtfCompatible = True
+aliasPreference = ["ensembl","ensembl2","ncbi"]
+salmonDecoys = False
+keepGzip = False
+decompressThreads = 0
@@ -6,9 +6,15 @@ from ._downloadcdnatask import DownloadCDNATask
 from ._downloadfastatask import DownloadFastaTask
 from ._downloadgfftask import DownloadGffTask
 from ._downloadgtftask import DownloadGtfTask
+from ._indexbowtie2task import IndexBowtie2Task
+from ._indexbwamem2task import IndexBwaMem2Task
+from ._indexfaidxtask import IndexFaidxTask
 from ._indexhisattask import IndexHisatTask
 from ._indexkallistotask import IndexKallistoTask
+from ._indexminimap2task import IndexMinimap2Task
 from ._indexsalmontask import IndexSalmonTask
+from ._indexstartask import IndexStarTask
+from ._writeannotationtask import WriteAnnotationTask
 from ._writecdnatask import WriteCDNATask
 from ._writegtftask import WriteGtfTask
 from ._writesplicesitestask import WriteSpliceSitesTask
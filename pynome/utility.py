@@ -2,10 +2,158 @@
 Contains utility functions used throughout this application.
 """
 import datetime
+from . import core
+from . import exceptions
 import os
-import ftplib
+import re
+from . import settings
+import shutil
+import signal
 import subprocess
-import traceback
+import time
+import zlib
+
+
+
+
+def decompress(
+    path
+    ,timeout=None
+    ):
+    """
+    Decompresses the given gzip compressed file, replacing it with the
+    decompressed file at the same path without the ".gz" extension like gunzip.
+    A BGZF file is inflated in process by a pool of threads, falling back to an
+    external decompressor if its data is corrupt. Any other file is decompressed
+    with pigz if it is installed or otherwise gunzip. The number of threads is
+    the decompress threads setting, or the CPU count if that is 0. A partially
+    inflated file is never left behind. The decompressed file keeps the
+    modification time of the compressed file. The sequence module is imported
+    here, because only download tasks need it and jobs indexing an assembly
+    should not pay for importing it.
+
+    Parameters
+    ----------
+    path : string
+           The full path of the decompressed file, ending in ".gz".
+    timeout : float
+              The number of seconds after which an external decompressor is
+              killed or None for no limit.
+    """
+    from . import sequence
+    outPath = path[:-3]
+    partPath = outPath+".part"
+    st = os.stat(path)
+    threads = settings.decompressThreads or settings.cpuCount
+    inflater = sequence.BgzfInflater(threads)
+    if threads > 1 and inflater.isBgzf(path):
+        try:
+            inflater.inflate(path,partPath)
+            os.replace(partPath,outPath)
+            os.remove(path)
+        except zlib.error:
+            pass
+        finally:
+            if os.path.exists(partPath):
+                os.remove(partPath)
+    if os.path.isfile(path):
+        if threads > 1 and shutil.which("pigz"):
+            run(["pigz","-d","-f","-p",str(threads),path],timeout)
+        else:
+            run(["gunzip","-f",path],timeout)
+    os.utime(outPath,ns=(st.st_atime_ns,st.st_mtime_ns))
+
+
+
+
+def diskUsage(
+    path
+    ):
+    """
+    Getter function.
+
+    Parameters
+    ----------
+    path : string
+           The full path to a local file or directory.
+
+    Returns
+    -------
+    ret0 : int
+           The total size in bytes of the given file or of all files within the
+           given directory, not following symbolic links.
+    """
+    if os.path.islink(path) or not os.path.isdir(path):
+        return os.lstat(path).st_size if os.path.lexists(path) else 0
+    ret = 0
+    for (root,dirs,files) in os.walk(path):
+        for name in files:
+            ret += os.lstat(os.path.join(root,name)).st_size
+    return ret
+
+
+
+
+def entryPoints(
+    groups
+    ):
+    """
+    Getter function. Entry points are found through importlib.metadata, so
+    every kind of installed distribution is covered, including editable
+    installs, eggs, and zip imports. It is imported here, because it is slow to
+    import and jobs usually use cached entry points instead.
+
+    Parameters
+    ----------
+    groups : list
+             The entry point groups that are looked up.
+
+    Returns
+    -------
+    ret0 : dictionary
+           The object references of all entry points of the given groups
+           advertised by installed distributions, keyed by entry point group and
+           then name. Entry points of other distributions take precedence over
+           those of pynome itself, and distributions earlier on the module
+           search path take precedence over later ones. This is empty if no
+           package metadata is available.
+    """
+    import importlib.metadata
+    advertised = importlib.metadata.entry_points()
+    ret = {}
+    for group in groups:
+        if hasattr(advertised,"select"):
+            found = advertised.select(group=group)
+        else:
+            found = advertised.get(group,[])
+        own = {}
+        entries = ret.setdefault(group,{})
+        for entryPoint in found:
+            module = entryPoint.value.split(":")[0].strip()
+            target = own if module.split(".")[0] == "pynome" else entries
+            target.setdefault(entryPoint.name,entryPoint.value.split("[")[0].strip())
+        for (name,value) in own.items():
+            entries.setdefault(name,value)
+    return ret
+
+
+
+
+def physicalMemory(
+    ):
+    """
+    Getter function.
+
+    Returns
+    -------
+    ret0 : float
+           The physical memory of this machine in gigabytes or 0 if it cannot
+           be determined.
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE")*os.sysconf("SC_PHYS_PAGES")/2**30
+    except (AttributeError,OSError,ValueError):
+        return 0.0
 
 
 
@@ -14,11 +162,14 @@ def rSync(
     url
     ,path
     ,compare=""
+    ,timeout=None
     ):
     """
     Synchronizes the given remote URL file with the given local path. An
     optional comparison path is provided, which is used to compare the timestamp
-    with the remote URL if given instead of the regular path.
+    with the remote URL if given instead of the regular path. The remote file is
+    downloaded to a partial file first and then moved into place, so a failed
+    download never leaves a truncated file at the given path.
 
     Parameters
     ----------
@@ -34,6 +185,15 @@ def rSync(
               still used when downloading the remote file if it is newer that
               this compared local file. If this string is empty then it is
               ignored.
+    timeout : float
+              The number of seconds after which the synchronization is aborted
+              or None for no limit.
+
+    Returns
+    -------
+    ret0 : bool
+           True if the remote file was downloaded or false otherwise. If the
+           download fails then a task error is raised.
     """
     if not compare:
         compare = path
@@ -41,7 +201,7 @@ def rSync(
     if not os.path.isfile(compare):
         download = True
     else:
-        rts = timeStamp(url)
+        rts = timeStamp(url,timeout)
         lts = datetime.datetime.fromtimestamp(os.stat(compare).st_mtime+DAY)
         lts = lts.strftime("%Y%m%d%H%M%S")
         if rts > lts:
@@ -51,9 +211,17 @@ def rSync(
             "wget"
             ,url
             ,"-O"
-            ,path
+            ,path+".part"
         ]
-        assert(subprocess.run(cmd,capture_output=True).returncode==0)
+        start = time.monotonic()
+        try:
+            run(cmd,timeout)
+        except:
+            if os.path.isfile(path+".part"):
+                os.remove(path+".part")
+            raise
+        os.replace(path+".part",path)
+        core.metrics.download(os.path.getsize(path),time.monotonic()-start)
         return True
     else:
         return False
@@ -61,8 +229,64 @@ def rSync(
 
 
 
+def run(
+    cmd
+    ,timeout=None
+    ,**kwargs
+    ):
+    """
+    Runs the given external command in its own process group, discarding its
+    standard output unless redirected by the given keyword arguments. If the
+    command does not finish within the given timeout then its whole process
+    group is killed, as it is if waiting for the command is interrupted by any
+    other exception such as a keyboard interrupt, so no orphaned process keeps
+    running outside the terminal's process group. If the command exits with a
+    non-zero status or is killed then a task error is raised holding its exit
+    code and the end of its standard error output.
+
+    Parameters
+    ----------
+    cmd : list
+          The command line that is run.
+    timeout : float
+              The number of seconds after which the command is killed or None
+              for no limit.
+    kwargs : dictionary
+             Additional keyword arguments passed to subprocess.Popen.
+
+    Returns
+    -------
+    ret0 : object
+           The completed process of the command.
+    """
+    if timeout is not None and timeout <= 0:
+        raise exceptions.TaskError(cmd,-signal.SIGKILL,timeout=0)
+    kwargs.setdefault("stdout",subprocess.DEVNULL)
+    with subprocess.Popen(cmd,stderr=subprocess.PIPE,start_new_session=True,**kwargs) as proc:
+        try:
+            (stdout,stderr) = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid,signal.SIGKILL)
+            (stdout,stderr) = proc.communicate()
+            stderr = stderr.decode(errors="replace")[-settings.stderrTail:]
+            raise exceptions.TaskError(cmd,proc.returncode,stderr,timeout)
+        except BaseException:
+            try:
+                os.killpg(proc.pid,signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            raise
+    if proc.returncode != 0:
+        stderr = stderr.decode(errors="replace")[-settings.stderrTail:]
+        raise exceptions.TaskError(cmd,proc.returncode,stderr)
+    return subprocess.CompletedProcess(cmd,proc.returncode,stdout,stderr)
+
+
+
+
 def timeStamp(
     url
+    ,timeout=None
     ):
     """
     Getter function.
@@ -71,19 +295,24 @@ def timeStamp(
     ----------
     url : string
           The FTP URL of a remote file whose FTP timestamp is returned.
+    timeout : float
+              The number of seconds after which blocking FTP operations are
+              aborted or None for no limit.
 
     Returns
     -------
     ret0 : string
            The FTP timestamp of the remote file location at the given URL.
     """
+    import ftplib
+    import traceback
     d = url.find("://")
     if d != -1:
         url = url[d+3:]
     site = url[:url.find("/")]
     path = url[url.find("/"):]
     try:
-        ftp = ftplib.FTP(site)
+        ftp = ftplib.FTP(site,timeout=timeout)
         ftp.login()
         ts = ftp.voidcmd("MDTM "+path)
         return ts.split()[-1].strip()
@@ -94,6 +323,28 @@ def timeStamp(
 
 
 
+def versionKey(
+    version
+    ):
+    """
+    Getter function.
+
+    Parameters
+    ----------
+    version : string
+              A tool version string such as "2.1.0".
+
+    Returns
+    -------
+    ret0 : tuple
+           A sorting key of the given version that orders its numeric parts by
+           value instead of alphabetically.
+    """
+    return tuple(int(p) for p in re.findall("\\d+",version))
+
+
+
+
 
 
 
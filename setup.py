@@ -18,5 +18,32 @@ setup(
     ,packages=find_packages()
     ,entry_points = {
         'console_scripts': ['pynome = pynome.__main__:main']
+        ,'pynome.crawlers': [
+            'ensembl = pynome._ensemblcrawler:EnsemblCrawler'
+            ,'ensembl2 = pynome._ensembl2crawler:Ensembl2Crawler'
+            ,'ncbi = pynome._ncbicrawler:NCBICrawler'
+        ]
+        ,'pynome.processes': [
+            'ensembl = pynome._ensemblprocess:EnsemblProcess'
+            ,'ncbi = pynome._ncbiprocess:NCBIProcess'
+        ]
+        ,'pynome.tasks': [
+            'download_cdna = pynome._downloadcdnatask:DownloadCDNATask'
+            ,'download_fasta = pynome._downloadfastatask:DownloadFastaTask'
+            ,'download_gff = pynome._downloadgfftask:DownloadGffTask'
+            ,'download_gtf = pynome._downloadgtftask:DownloadGtfTask'
+            ,'index_bowtie2 = pynome._indexbowtie2task:IndexBowtie2Task'
+            ,'index_bwamem2 = pynome._indexbwamem2task:IndexBwaMem2Task'
+            ,'index_faidx = pynome._indexfaidxtask:IndexFaidxTask'
+            ,'index_hisat = pynome._indexhisattask:IndexHisatTask'
+            ,'index_kallisto = pynome._indexkallistotask:IndexKallistoTask'
+            ,'index_minimap2 = pynome._indexminimap2task:IndexMinimap2Task'
+            ,'index_salmon = pynome._indexsalmontask:IndexSalmonTask'
+            ,'index_star = pynome._indexstartask:IndexStarTask'
+            ,'write_annotation = pynome._writeannotationtask:WriteAnnotationTask'
+            ,'write_cdna = pynome._writecdnatask:WriteCDNATask'
+            ,'write_gtf = pynome._writegtftask:WriteGtfTask'
+            ,'write_splice_sites = pynome._writesplicesitestask:WriteSpliceSitesTask'
+        ]
     }
 )